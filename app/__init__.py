@@ -1,7 +1,33 @@
-from flask import Flask, g, redirect, session, url_for
+from flask import Flask, g, redirect, request, session, url_for
+from flask.ctx import _AppCtxGlobals
 
 from app.settings import BASE_DIR, DATABASE_URL, SECRET_KEY
-from app.db import SessionLocal, init_db
+from app.db import SessionLocal, init_db, mark_write
+from app.controllers import route_reads_for
+
+
+class RequestGlobals(_AppCtxGlobals):
+    """``g`` com sessão do banco e usuário carregados sob demanda.
+
+    Requisições que não usam o banco (estáticos, API de exemplo) não abrem
+    sessão, e o usuário logado vem do cache de identidade.
+    """
+
+    def __getattr__(self, name):
+        if name == "db":
+            self.db = SessionLocal()
+            self.db.info["read_only"] = self.__dict__.get("read_only", False)
+            return self.db
+        if name == "user":
+            user_id = self.__dict__.get("user_id")
+            if user_id:
+                from app.identity import get_identity
+
+                self.user = get_identity(self.db, user_id)
+            else:
+                self.user = None
+            return self.user
+        return super().__getattr__(name)
 
 
 def create_app():
@@ -11,6 +37,7 @@ def create_app():
         static_folder=str(BASE_DIR / "public"),
         static_url_path="",
     )
+    app.app_ctx_globals_class = RequestGlobals
     app.config["SECRET_KEY"] = SECRET_KEY
     app.config["DATABASE_URL"] = DATABASE_URL
 
@@ -18,14 +45,24 @@ def create_app():
 
     @app.before_request
     def setup_request_state():
-        g.db = SessionLocal()
-        user_id = session.get("user_id")
-        if user_id:
-            from app.models.user import User
+        view = app.view_functions.get(request.endpoint)
+        g.read_only = getattr(view, "read_only", False)
+        g.user_id = session.get("user_id")
+        route_reads_for(g.user_id)
+        if g.user_id and request.endpoint != "static":
+            # Conta excluída (ou sessão anterior ao nonce): a sessão deixa de valer
+            if g.user is None or g.user.session_nonce != session.get("nonce"):
+                session.clear()
+                g.user_id = None
+                g.user = None
 
-            g.user = g.db.get(User, user_id)
-        else:
-            g.user = None
+    @app.after_request
+    def stick_to_primary(response):
+        # Read-your-writes: quem acabou de gravar lê do primário por alguns segundos
+        db_session = g.get("db")
+        if db_session is not None and db_session.info.get("wrote"):
+            mark_write(session.get("user_id") or g.get("api_user_id"))
+        return response
 
     @app.teardown_request
     def teardown_request(exception=None):
@@ -36,7 +73,7 @@ def create_app():
 
     @app.context_processor
     def inject_user():
-        return {"current_user": getattr(g, "user", None)}
+        return {"current_user": g.user}
 
     @app.route("/")
     def index():
@@ -44,6 +81,15 @@ def create_app():
             return redirect(url_for("dashboard.home"))
         return redirect(url_for("auth.login"))
 
+    from app import fragment_cache, http_cache, jinja_cache, profiling
+
+    jinja_cache.init_app(app)
+
+    # Registrado antes da instrumentação: roda depois dela e comprime por último
+    http_cache.init_app(app)
+    profiling.init_app(app)
+    fragment_cache.init_app(app)
+
     from app.controllers.auth import auth_bp
     from app.controllers.dashboard import dashboard_bp
     from app.controllers.contracts import contracts_bp
@@ -54,4 +100,8 @@ def create_app():
     app.register_blueprint(contracts_bp)
     app.register_blueprint(api_bp)
 
+    from app.commands import register_commands
+
+    register_commands(app)
+
     return app
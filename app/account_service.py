@@ -0,0 +1,51 @@
+from sqlalchemy import delete
+
+from app import fragment_cache, identity, passwords, pdf_cache
+from app.models.contract import Contract
+from app.models.contract_event import ContractEvent
+from app.models.contract_stats import ContractStats
+from app.models.due_reminder import DueReminder
+from app.models.pdf_job import PdfJob
+from app.models.user import User
+
+
+def authenticate(db, email: str, password: str) -> User | None:
+    """Confere email/senha; refaz o hash se ``PASSWORD_HASH_METHOD`` mudou."""
+    user = db.query(User).filter_by(email=email).first()
+    if not user or not user.check_password(password):
+        return None
+    if passwords.needs_rehash(user.password_hash):
+        user.set_password(password)
+        db.commit()
+    return user
+
+
+def delete_account(db, user_id: int) -> int:
+    """Remove o usuário e tudo o que é dele com um DELETE por tabela.
+
+    Nenhuma linha é carregada no ORM. Os filhos são removidos antes do
+    usuário porque bancos SQLite criados antes do ON DELETE CASCADE não podem
+    ter a constraint alterada; em bancos novos o CASCADE apenas não encontra
+    mais nada. Devolve quantos contratos foram excluídos.
+    """
+    for model in (ContractEvent, DueReminder, PdfJob, ContractStats):
+        db.execute(
+            delete(model)
+            .where(model.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+    contract_ids = db.execute(
+        delete(Contract)
+        .where(Contract.user_id == user_id)
+        .returning(Contract.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.execute(
+        delete(User).where(User.id == user_id).execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    identity.invalidate(user_id)
+    pdf_cache.discard_many(contract_ids)
+    fragment_cache.discard_many(contract_ids)
+    return len(contract_ids)
@@ -0,0 +1,141 @@
+import click
+
+from app.db import engine
+
+
+def register_commands(app):
+    @app.cli.command("db-upgrade")
+    def db_upgrade():
+        """Aplica as migrações pendentes no banco configurado."""
+        from app.migrations import latest_version, run_migrations
+
+        applied = run_migrations(engine)
+        if applied:
+            click.echo(f"Migrações aplicadas: {', '.join(map(str, applied))}")
+        else:
+            click.echo(f"Banco já está na versão {latest_version()}.")
+
+    @app.cli.command("precompile-templates")
+    def precompile_templates():
+        """Compila os templates para o cache de bytecode (rodar no build)."""
+        from app.jinja_cache import precompile
+        from app.settings import JINJA_CACHE_DIR
+
+        total = precompile(app)
+        if total:
+            click.echo(f"{total} templates compilados em {JINJA_CACHE_DIR}")
+        else:
+            click.echo("Cache de bytecode desativado (JINJA_BYTECODE_CACHE=0).")
+
+    @app.cli.command("pdf-worker")
+    @click.option("--threads", default=1, show_default=True, help="Workers neste processo.")
+    @click.option("--drain", is_flag=True, help="Sai quando a fila estiver vazia.")
+    def pdf_worker(threads, drain):
+        """Processa a fila de geração de PDFs."""
+        from app.pdf_jobs import run_workers
+
+        processed = run_workers(threads, drain=drain)
+        click.echo(f"Jobs processados: {processed}")
+
+    @app.cli.command("pdf-queue-stats")
+    def pdf_queue_stats():
+        """Mostra profundidade e latência da fila de PDFs."""
+        from app.db import SessionLocal
+        from app.pdf_jobs import queue_metrics
+
+        db = SessionLocal()
+        try:
+            for key, value in queue_metrics(db).items():
+                click.echo(f"{key}: {value}")
+        finally:
+            db.close()
+
+    @app.cli.command("due-reminders")
+    @click.option(
+        "--data",
+        type=click.DateTime(formats=["%Y-%m-%d"]),
+        default=None,
+        help="Dia de referência (padrão: hoje).",
+    )
+    @click.option("--continuo", is_flag=True, help="Repete todo dia às DUE_REMINDER_HOUR.")
+    def due_reminders(data, continuo):
+        """Gera lembretes de vencimento (passada incremental, uma por noite)."""
+        import time
+
+        from app.due_dates import run_nightly, seconds_until
+        from app.settings import DUE_REMINDER_HOUR
+
+        today = data.date() if data else None
+        while True:
+            inicio = time.perf_counter()
+            created = run_nightly(today)
+            if created is None:
+                click.echo("Outra passada em andamento; nada a fazer.")
+            else:
+                click.echo(
+                    f"Lembretes: {created['upcoming']} a vencer, {created['overdue']} "
+                    f"vencidos em {time.perf_counter() - inicio:.1f} s"
+                )
+            if not continuo:
+                break
+            today = None
+            time.sleep(seconds_until(DUE_REMINDER_HOUR))
+
+    @app.cli.command("seed")
+    @click.option("--usuarios", default=10, show_default=True, help="Usuários a criar.")
+    @click.option("--contratos", default=1000, show_default=True, help="Contratos por usuário.")
+    @click.option("--semente", default=42, show_default=True, help="Semente do gerador.")
+    @click.option("--senha", default="senha123", show_default=True, help="Senha de todos.")
+    @click.option("--sem-historico", is_flag=True, help="Não grava eventos de criação.")
+    def seed(usuarios, contratos, semente, senha, sem_historico):
+        """Cria usuários e contratos sintéticos (desenvolvimento e benchmarks)."""
+        import time
+
+        from app.db import SessionLocal
+        from app.seed import populate
+
+        inicio = time.perf_counter()
+        db = SessionLocal()
+        try:
+            emails = populate(
+                db, usuarios, contratos, seed=semente, password=senha, history=not sem_historico
+            )
+        finally:
+            db.close()
+        click.echo(
+            f"{len(emails)} usuários x {contratos} contratos em "
+            f"{time.perf_counter() - inicio:.1f} s (senha: {senha})"
+        )
+        if emails:
+            click.echo(f"Emails: {emails[0]} ... {emails[-1]}")
+
+    @app.cli.command("import-contracts")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--email", required=True, help="Dono dos contratos importados.")
+    @click.option("--formato", type=click.Choice(["csv", "ndjson"]), default=None)
+    def import_contracts(path, email, formato):
+        """Importa contratos de um arquivo CSV ou NDJSON."""
+        from app import contract_import
+        from app.db import SessionLocal
+        from app.models.user import User
+
+        fmt = formato or contract_import.detect_format(path)
+        if fmt is None:
+            raise click.UsageError("Formato não reconhecido; use --formato.")
+
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter_by(email=email.strip().lower()).first()
+            if user is None:
+                raise click.UsageError(f"Usuário {email} não encontrado.")
+            with open(path, "rb") as stream:
+                report = contract_import.import_contracts(
+                    db, user.id, contract_import.iter_records(stream, fmt)
+                )
+        finally:
+            db.close()
+
+        click.echo(f"Importados: {report['imported']}")
+        click.echo(f"Linhas com erro: {report['error_count']}")
+        for item in report["errors"]:
+            click.echo(f"  linha {item['line']}: {' '.join(item['errors'])}")
@@ -0,0 +1,96 @@
+"""Histórico de contratos gravado na mesma transação da alteração.
+
+Cada escrita em ``contract_service`` acrescenta uma linha em
+``contract_events`` antes do commit: se a alteração for desfeita, o evento
+também é. Campos longos (descrição do serviço) aparecem só pelo nome, para
+manter as linhas pequenas mesmo com milhões de eventos.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from app.models.contract_event import ContractEvent
+from app.settings import CONTRACT_HISTORY
+
+# Campos com antes/depois no histórico; os demais são registrados como null
+TRACKED_FIELDS = ("title", "client_name", "provider_name", "value", "status", "due_date")
+
+
+def _plain(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _row(contract_id: int, user_id: int, kind: str, changes: dict, now) -> dict:
+    return {
+        "contract_id": contract_id,
+        "user_id": user_id,
+        "kind": kind,
+        "changes": json.dumps(changes, ensure_ascii=False, separators=(",", ":")),
+        "created_at": now,
+    }
+
+
+def describe(before: dict, after: dict) -> tuple[str, dict]:
+    """Tipo do evento e mudanças ``{campo: [antes, depois] | None}``."""
+    changes = {
+        name: [_plain(before.get(name)), _plain(value)]
+        if name in TRACKED_FIELDS
+        else None
+        for name, value in after.items()
+    }
+    if "status" in changes:
+        kind = "status"
+    elif "value" in changes:
+        kind = "value"
+    else:
+        kind = "updated"
+    return kind, changes
+
+
+def snapshot(contract) -> dict:
+    return {name: _plain(getattr(contract, name)) for name in TRACKED_FIELDS}
+
+
+def record(db, contract_id: int, user_id: int, kind: str, changes: dict) -> None:
+    if not CONTRACT_HISTORY:
+        return
+    db.execute(
+        insert(ContractEvent.__table__),
+        _row(contract_id, user_id, kind, changes, datetime.utcnow()),
+    )
+
+
+def record_many(db, user_id: int, events) -> None:
+    """Insere ``(contract_id, kind, changes)`` de uma operação em lote."""
+    if not CONTRACT_HISTORY:
+        return
+    now = datetime.utcnow()
+    rows = [
+        _row(contract_id, user_id, kind, changes, now)
+        for contract_id, kind, changes in events
+    ]
+    if rows:
+        db.execute(insert(ContractEvent.__table__), rows)
+
+
+def record_created_many(db, user_id: int, rows) -> None:
+    """Eventos de criação para ``(contract_id, values)`` inseridos em lote."""
+    record_many(
+        db,
+        user_id,
+        (
+            (
+                contract_id,
+                "created",
+                {name: [None, _plain(values.get(name))] for name in TRACKED_FIELDS},
+            )
+            for contract_id, values in rows
+        ),
+    )
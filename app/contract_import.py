@@ -0,0 +1,153 @@
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app import contract_events, stats
+from app.contract_service import validate_contract_data
+from app.models.contract import Contract
+from app.settings import IMPORT_BATCH_SIZE, IMPORT_MAX_REPORTED_ERRORS
+
+FORMATS = ("csv", "ndjson")
+
+
+def detect_format(filename: str | None, mimetype: str | None = None) -> str | None:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or mimetype == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or mimetype in (
+        "application/x-ndjson",
+        "application/jsonl",
+    ):
+        return "ndjson"
+    return None
+
+
+ENCODING_ERROR = "Linha fora do UTF-8 (salve o arquivo com codificação UTF-8)."
+
+
+class _DecodedLines:
+    """Linhas do arquivo já decodificadas, contando quantas foram lidas.
+
+    Linhas que não são UTF-8 (ex.: CSV do Excel em Latin-1) entram em
+    ``invalid`` e seguem com caracteres substituídos, para que o restante do
+    arquivo continue sendo lido.
+    """
+
+    def __init__(self, stream):
+        if isinstance(stream, io.RawIOBase):
+            # request.stream: sem buffer, readline leria byte a byte
+            stream = io.BufferedReader(stream)
+        self.stream = stream
+        self.line_no = 0
+        self.invalid = set()
+
+    def __iter__(self):
+        for raw in self.stream:
+            self.line_no += 1
+            if self.line_no == 1 and raw.startswith(codecs.BOM_UTF8):
+                raw = raw[len(codecs.BOM_UTF8) :]
+            try:
+                yield raw.decode("utf-8")
+            except UnicodeDecodeError:
+                self.invalid.add(self.line_no)
+                yield raw.decode("utf-8", errors="replace")
+
+
+def _csv_records(stream):
+    lines = _DecodedLines(stream)
+    reader = csv.DictReader(iter(lines))
+    while True:
+        start = lines.line_no
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            # O leitor descarta a linha com erro e segue na próxima
+            yield lines.line_no, None, f"CSV inválido: {exc}."
+            continue
+        # Um registro pode ocupar várias linhas (campos entre aspas)
+        if lines.invalid.intersection(range(start + 1, lines.line_no + 1)):
+            yield lines.line_no, None, ENCODING_ERROR
+            continue
+        yield lines.line_no, record, None
+
+
+def iter_records(stream, fmt: str):
+    """Lê o arquivo linha a linha, gerando ``(linha, registro | None, erro)``."""
+    if fmt == "csv":
+        yield from _csv_records(stream)
+        return
+
+    lines = _DecodedLines(stream)
+    for line in lines:
+        line_no = lines.line_no
+        if line_no in lines.invalid:
+            yield line_no, None, ENCODING_ERROR
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, None, "JSON inválido."
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "Cada linha deve ser um objeto JSON."
+            continue
+        yield line_no, record, None
+
+
+def import_contracts(db, user_id: int, records) -> dict:
+    imported = 0
+    error_count = 0
+    errors = []
+    batch = []
+    table = Contract.__table__
+
+    def flush():
+        nonlocal imported
+        if not batch:
+            return
+        now = datetime.utcnow()
+        for row in batch:
+            row["created_at"] = now
+            row["updated_at"] = now
+        # executemany em uma transação por lote; RETURNING traz os ids para o histórico
+        statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        ids = db.execute(statement, batch).scalars().all()
+        contract_events.record_created_many(db, user_id, zip(ids, batch))
+        db.commit()
+        imported += len(batch)
+        batch.clear()
+
+    try:
+        for line_no, record, parse_error in records:
+            if parse_error:
+                row_errors = [parse_error]
+            else:
+                values, row_errors = validate_contract_data(record)
+            if row_errors:
+                error_count += 1
+                if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                    errors.append({"line": line_no, "errors": row_errors})
+                continue
+            values["user_id"] = user_id
+            batch.append(values)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush()
+        flush()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        # Lotes já gravados continuam no banco mesmo se a importação parar no meio
+        if imported:
+            stats.rebuild(db, user_id)
+            db.commit()
+
+    return {"imported": imported, "error_count": error_count, "errors": errors}
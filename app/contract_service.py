@@ -0,0 +1,258 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm.exc import StaleDataError
+
+from app import contract_events, fragment_cache, pdf_cache, stats
+from app.models.contract import Contract
+
+TEXT_FIELDS = (
+    "title",
+    "provider_name",
+    "client_name",
+    "service_description",
+    "payment_terms",
+    "city",
+)
+# Ordem das mensagens igual à do formulário
+REQUIRED_MESSAGES = (
+    ("title", "Título é obrigatório."),
+    ("provider_name", "Contratado é obrigatório."),
+    ("client_name", "Contratante é obrigatório."),
+    ("service_description", "Serviço é obrigatório."),
+    ("value", "Valor é obrigatório."),
+    ("payment_terms", "Forma de pagamento é obrigatória."),
+    ("city", "Cidade é obrigatória."),
+)
+INVALID_DATE_MESSAGE = "Data inválida. Use o formato AAAA-MM-DD."
+CONFLICT_MESSAGE = (
+    "Este contrato foi alterado por outra pessoa ou em outra aba. "
+    "Revise os dados atuais e salve novamente."
+)
+
+
+class VersionConflict(Exception):
+    """O contrato mudou desde que o cliente leu a versão que está editando."""
+
+
+def parse_decimal(value: str) -> Decimal | None:
+    if not value:
+        return None
+    try:
+        cleaned = value.replace(",", ".")
+        return Decimal(cleaned)
+    except (InvalidOperation, AttributeError):
+        return None
+
+
+def parse_date(value: str):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def validate_contract_data(data, partial: bool = False) -> tuple[dict, list[str]]:
+    """Normaliza e valida campos vindos do formulário, JSON ou importação.
+
+    Com ``partial=True`` apenas as chaves presentes em ``data`` são
+    consideradas (PATCH).
+    """
+    values = {}
+    for name in TEXT_FIELDS:
+        if not partial or name in data:
+            values[name] = str(data.get(name) or "").strip()
+    if not partial or "value" in data:
+        raw_value = data.get("value")
+        values["value"] = parse_decimal("" if raw_value is None else str(raw_value))
+    if not partial or "status" in data:
+        values["status"] = str(data.get("status") or "rascunho").strip() or "rascunho"
+
+    errors = []
+    for name, message in REQUIRED_MESSAGES:
+        if name in values and not values[name]:
+            errors.append(message)
+
+    if not partial or "due_date" in data:
+        raw_date = str(data.get("due_date") or "")
+        values["due_date"] = parse_date(raw_date)
+        if raw_date and values["due_date"] is None:
+            errors.append(INVALID_DATE_MESSAGE)
+
+    return values, errors
+
+
+def list_filters(args) -> dict:
+    return {
+        "status": (args.get("status") or "").strip(),
+        "cliente": (args.get("cliente") or "").strip(),
+        "vencimento_de": parse_date(args.get("vencimento_de") or ""),
+        "vencimento_ate": parse_date(args.get("vencimento_ate") or ""),
+    }
+
+
+def filter_contracts(query, filters: dict):
+    if filters["status"]:
+        query = query.filter(Contract.status == filters["status"])
+    if filters["cliente"]:
+        query = query.filter(Contract.client_name.ilike(f"%{filters['cliente']}%"))
+    if filters["vencimento_de"]:
+        query = query.filter(Contract.due_date >= filters["vencimento_de"])
+    if filters["vencimento_ate"]:
+        query = query.filter(Contract.due_date <= filters["vencimento_ate"])
+    return query
+
+
+def create_contract(db, user_id: int, values: dict) -> Contract:
+    contract = Contract(user_id=user_id, **values)
+    db.add(contract)
+    stats.record_change(db, user_id, after=(contract.status, contract.value))
+    db.flush()
+    contract_events.record(
+        db, contract.id, user_id, "created", contract_events.describe({}, values)[1]
+    )
+    db.commit()
+    return contract
+
+
+def update_contract(
+    db, contract: Contract, values: dict, expected_version: int | None = None
+) -> bool:
+    """Grava só as colunas que mudaram; devolve False se nada mudou.
+
+    ``expected_version`` é a versão que o cliente editou. Se outra escrita
+    chegou antes (aqui ou entre a leitura e o commit), levanta
+    ``VersionConflict`` sem gravar nada.
+    """
+    if expected_version is not None and expected_version != contract.version:
+        raise VersionConflict()
+    changed = {
+        name: value for name, value in values.items() if getattr(contract, name) != value
+    }
+    if not changed:
+        return False
+
+    previous = {name: getattr(contract, name) for name in changed}
+    before = (contract.status, contract.value)
+    for name, value in changed.items():
+        setattr(contract, name, value)
+    stats.record_change(db, contract.user_id, before, (contract.status, contract.value))
+    kind, changes = contract_events.describe(previous, changed)
+    contract_events.record(db, contract.id, contract.user_id, kind, changes)
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise VersionConflict() from None
+    fragment_cache.discard(contract.id)
+    return True
+
+
+def delete_contract(db, contract: Contract) -> None:
+    contract_id = contract.id
+    contract_events.record(
+        db,
+        contract_id,
+        contract.user_id,
+        "deleted",
+        {name: [value, None] for name, value in contract_events.snapshot(contract).items()},
+    )
+    db.delete(contract)
+    stats.record_change(db, contract.user_id, before=(contract.status, contract.value))
+    db.commit()
+    pdf_cache.discard(contract_id)
+    fragment_cache.discard(contract_id)
+
+
+def bulk_delete(db, user_id: int, ids) -> int:
+    """Exclui os contratos do usuário em ``ids`` com um único DELETE.
+
+    ``RETURNING`` traz os dados para o histórico e para invalidar os caches
+    sem uma consulta prévia. Devolve quantos contratos foram excluídos.
+    """
+    ids = set(ids)
+    if not ids:
+        return 0
+    columns = [getattr(Contract, name) for name in contract_events.TRACKED_FIELDS]
+    rows = db.execute(
+        delete(Contract)
+        .where(Contract.user_id == user_id, Contract.id.in_(ids))
+        .returning(Contract.id, *columns)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not rows:
+        return 0
+
+    contract_events.record_many(
+        db,
+        user_id,
+        (
+            (
+                row.id,
+                "deleted",
+                {name: [value, None] for name, value in contract_events.snapshot(row).items()},
+            )
+            for row in rows
+        ),
+    )
+    stats.rebuild(db, user_id)
+    db.commit()
+    deleted = [row.id for row in rows]
+    pdf_cache.discard_many(deleted)
+    fragment_cache.discard_many(deleted)
+    return len(deleted)
+
+
+def bulk_set_status(db, user_id: int, ids, status: str) -> int:
+    """Muda o status dos contratos do usuário em ``ids`` com um único UPDATE.
+
+    Só contratos com status diferente são gravados; cada um ganha nova
+    ``version``, então edições abertas em outras abas recebem conflito.
+    Devolve quantos contratos mudaram.
+    """
+    ids = set(ids)
+    if not ids:
+        return 0
+    previous = dict(
+        db.execute(
+            select(Contract.id, Contract.status).where(
+                Contract.user_id == user_id,
+                Contract.id.in_(ids),
+                Contract.status != status,
+            )
+        ).all()
+    )
+    if not previous:
+        return 0
+
+    changed = db.execute(
+        update(Contract)
+        .where(
+            Contract.user_id == user_id,
+            Contract.id.in_(list(previous)),
+            Contract.status != status,
+        )
+        .values(status=status, updated_at=datetime.utcnow(), version=Contract.version + 1)
+        .returning(Contract.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    contract_events.record_many(
+        db,
+        user_id,
+        (
+            (
+                contract_id,
+                *contract_events.describe(
+                    {"status": previous[contract_id]}, {"status": status}
+                ),
+            )
+            for contract_id in changed
+        ),
+    )
+    stats.rebuild(db, user_id)
+    db.commit()
+    fragment_cache.discard_many(changed)
+    return len(changed)
@@ -1,13 +1,33 @@
 from functools import wraps
-from flask import flash, redirect, session, url_for
+from flask import flash, g, redirect, url_for
+
+from app.db import recently_wrote
 
 
 def login_required(view):
     @wraps(view)
     def wrapper(*args, **kwargs):
-        if not session.get("user_id"):
+        if not g.user_id:
             flash("Faça login para continuar.", "warning")
             return redirect(url_for("auth.login"))
         return view(*args, **kwargs)
 
     return wrapper
+
+
+def read_only(view):
+    """Marca a view como somente leitura: suas consultas podem ir à réplica."""
+    view.read_only = True
+    return view
+
+
+def route_reads_for(user_id: int | None) -> None:
+    """Tira a requisição da réplica se ``user_id`` gravou há pouco.
+
+    Chamado assim que o usuário é conhecido: pelo cookie no ``before_request``
+    ou pela autenticação da API (HTTP Basic, token do feed).
+    """
+    if g.get("read_only") and recently_wrote(user_id):
+        g.read_only = False
+        if "db" in g:
+            g.db.info["read_only"] = False
@@ -1,9 +1,58 @@
-from flask import Blueprint, flash, g, redirect, render_template, request, session, url_for
-
+import math
+
+from flask import (
+    Blueprint,
+    flash,
+    g,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
+
+from app import account_service, rate_limit
+from app.controllers import login_required
 from app.models.user import User
+from app.passwords import HashingBusy
 
 auth_bp = Blueprint("auth", __name__)
 
+TEMPLATES = {
+    "auth.login": "auth/login.html",
+    "auth.register": "auth/register.html",
+    "auth.delete_account": "auth/excluir_conta.html",
+}
+
+
+def _retry_later(message: str, status: int, seconds: float):
+    flash(message, "error")
+    response = make_response(render_template(TEMPLATES[request.endpoint]), status)
+    response.headers["Retry-After"] = str(max(1, math.ceil(seconds)))
+    return response
+
+
+def _throttled(email: str | None = None):
+    """Reserva uma tentativa; resposta 429 se o IP/email passou do limite."""
+    wait = rate_limit.take(request.remote_addr, email)
+    if wait:
+        return _retry_later(
+            f"Muitas tentativas. Tente novamente em {math.ceil(wait)} s.", 429, wait
+        )
+    return None
+
+
+def _start_session(user: User) -> None:
+    session["user_id"] = user.id
+    # Conferido a cada requisição: a sessão cai se a conta for excluída
+    session["nonce"] = user.session_nonce
+
+
+@auth_bp.errorhandler(HashingBusy)
+def hashing_busy(error):
+    return _retry_later("Servidor ocupado. Tente novamente em instantes.", 503, 1)
+
 
 @auth_bp.route("/login", methods=["GET", "POST"])
 def login():
@@ -21,11 +70,15 @@ def login():
             errors.append("Senha é obrigatória.")
 
         if not errors:
-            user = g.db.query(User).filter_by(email=email).first()
-            if not user or not user.check_password(password):
+            throttled = _throttled(email)
+            if throttled:
+                return throttled
+            user = account_service.authenticate(g.db, email, password)
+            if not user:
                 errors.append("Credenciais inválidas.")
             else:
-                session["user_id"] = user.id
+                rate_limit.give_back(request.remote_addr, email)
+                _start_session(user)
                 flash("Login realizado com sucesso!", "success")
                 return redirect(url_for("dashboard.home"))
 
@@ -54,6 +107,9 @@ def register():
             errors.append("Senha é obrigatória.")
 
         if not errors:
+            throttled = _throttled()
+            if throttled:
+                return throttled
             existing = g.db.query(User).filter_by(email=email).first()
             if existing:
                 errors.append("Email já cadastrado.")
@@ -66,7 +122,7 @@ def register():
             user.set_password(password)
             g.db.add(user)
             g.db.commit()
-            session["user_id"] = user.id
+            _start_session(user)
             flash("Cadastro realizado com sucesso!", "success")
             return redirect(url_for("dashboard.home"))
 
@@ -76,5 +132,29 @@ def register():
 @auth_bp.route("/logout")
 def logout():
     session.pop("user_id", None)
+    session.pop("nonce", None)
     flash("Você saiu do sistema.", "info")
     return redirect(url_for("auth.login"))
+
+
+@auth_bp.route("/conta/excluir", methods=["GET", "POST"])
+@login_required
+def delete_account():
+    if request.method == "POST":
+        user = g.db.get(User, g.user_id)
+        if user is None:
+            # Conta já excluída (ex.: em outra aba ou outro servidor)
+            session.clear()
+            return redirect(url_for("auth.login"))
+        throttled = _throttled(user.email)
+        if throttled:
+            return throttled
+        if not user.check_password(request.form.get("password") or ""):
+            flash("Senha incorreta.", "error")
+        else:
+            account_service.delete_account(g.db, user.id)
+            session.clear()
+            flash("Conta e contratos excluídos.", "info")
+            return redirect(url_for("auth.login"))
+
+    return render_template("auth/excluir_conta.html")
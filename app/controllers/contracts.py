@@ -1,12 +1,12 @@
 from datetime import datetime
-from decimal import Decimal, InvalidOperation
 
-from fpdf import FPDF
 from flask import (
     Blueprint,
+    Response,
     abort,
     flash,
     g,
+    jsonify,
     make_response,
     redirect,
     render_template,
@@ -15,80 +15,32 @@ from flask import (
     url_for,
 )
 
-from app.controllers import login_required
+from app import contract_import, contract_service, pdf_cache, pdf_jobs, search
+from app.contract_service import filter_contracts, list_filters, validate_contract_data
+from app.controllers import login_required, read_only
 from app.models.contract import Contract
+from app.models.pdf_job import PdfJob
+from app.pagination import decode_cursor, keyset_page
+from app.pdf import contract_fields
+from app.pdf_export import render_many, render_one, zip_stream
+from app.settings import (
+    BULK_MAX_CONTRACTS,
+    CONTRACTS_PAGE_SIZE,
+    PDF_ASYNC,
+    PDF_EXPORT_MAX_CONTRACTS,
+)
 
 contracts_bp = Blueprint("contracts", __name__, url_prefix="/contratos")
 
-UNITS = [
-    "zero",
-    "um",
-    "dois",
-    "três",
-    "quatro",
-    "cinco",
-    "seis",
-    "sete",
-    "oito",
-    "nove",
-]
-TEENS = {
-    10: "dez",
-    11: "onze",
-    12: "doze",
-    13: "treze",
-    14: "quatorze",
-    15: "quinze",
-    16: "dezesseis",
-    17: "dezessete",
-    18: "dezoito",
-    19: "dezenove",
-}
-TENS = {
-    20: "vinte",
-    30: "trinta",
-    40: "quarenta",
-    50: "cinquenta",
-    60: "sessenta",
-    70: "setenta",
-    80: "oitenta",
-    90: "noventa",
-}
-HUNDREDS = {
-    1: "cento",
-    2: "duzentos",
-    3: "trezentos",
-    4: "quatrocentos",
-    5: "quinhentos",
-    6: "seiscentos",
-    7: "setecentos",
-    8: "oitocentos",
-    9: "novecentos",
-}
-SCALES = [
-    (1, "mil", "mil"),
-    (2, "milhão", "milhões"),
-    (3, "bilhão", "bilhões"),
-]
-
-
-def _parse_decimal(value: str) -> Decimal | None:
-    if not value:
-        return None
-    try:
-        cleaned = value.replace(",", ".")
-        return Decimal(cleaned)
-    except (InvalidOperation, AttributeError):
-        return None
-
-
-def _parse_date(value: str):
-    if not value:
-        return None
-    try:
-        return datetime.strptime(value, "%Y-%m-%d").date()
-    except ValueError:
-        return None
+LIST_COLUMNS = (
+    Contract.id,
+    Contract.title,
+    Contract.client_name,
+    Contract.provider_name,
+    Contract.value,
+    Contract.status,
+    Contract.updated_at,
+)
 
 
 def _get_contract_or_404(contract_id: int) -> Contract:
@@ -103,211 +55,135 @@ def _get_contract_or_404(contract_id: int) -> Contract:
     return contract
 
 
-def _format_date_br(date_obj) -> str:
-    return date_obj.strftime("%d/%m/%Y") if date_obj else "—"
-
-
-def _format_currency_br(value: Decimal | None) -> str:
-    amount = (value or Decimal("0")).quantize(Decimal("0.01"))
-    formatted = f"{amount:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
-    return f"R$ {formatted}"
-
-
-def _tres_digitos_por_extenso(n: int) -> str:
-    if n == 0:
-        return ""
-    if n == 100:
-        return "cem"
-
-    centenas = n // 100
-    dezenas_unidades = n % 100
-    partes = []
-
-    if centenas:
-        partes.append(HUNDREDS[centenas])
-
-    if dezenas_unidades:
-        if dezenas_unidades < 10:
-            partes.append(UNITS[dezenas_unidades])
-        elif dezenas_unidades < 20:
-            partes.append(TEENS[dezenas_unidades])
-        else:
-            dezenas = (dezenas_unidades // 10) * 10
-            unidades = dezenas_unidades % 10
-            if dezenas:
-                partes.append(TENS[dezenas])
-            if unidades:
-                partes.append(UNITS[unidades])
-
-    return " e ".join(partes)
-
-
-def _numero_por_extenso(n: int) -> str:
-    if n == 0:
-        return "zero"
-
-    grupos = []
-    while n > 0:
-        grupos.append(n % 1000)
-        n //= 1000
-
-    partes = []
-    for idx, grupo in enumerate(grupos):
-        if grupo == 0:
-            continue
-        grupo_texto = _tres_digitos_por_extenso(grupo)
-        if idx == 0:
-            partes.append(grupo_texto)
-            continue
-
-        escala = SCALES[idx - 1]
-        singular, plural = escala[1], escala[2]
-
-        if idx == 1 and grupo == 1:
-            partes.append("mil")
-        else:
-            sufixo = singular if grupo == 1 else plural
-            partes.append(f"{grupo_texto} {sufixo}")
-
-    partes = partes[::-1]
-    texto = ""
-    for i, parte in enumerate(partes):
-        if i > 0:
-            sep = " e " if i == len(partes) - 1 else ", "
-            texto += sep
-        texto += parte
-    return texto
-
-
-def _valor_por_extenso(valor: Decimal | None) -> str:
-    quantized = (valor or Decimal("0")).quantize(Decimal("0.01"))
-    inteiro = int(quantized)
-    centavos = int((quantized * 100) % 100)
-
-    inteiro_ext = _numero_por_extenso(inteiro)
-    moeda = "real" if inteiro == 1 else "reais"
-
-    if centavos:
-        centavos_ext = _numero_por_extenso(centavos)
-        centavo_label = "centavo" if centavos == 1 else "centavos"
-        return f"{inteiro_ext} {moeda} e {centavos_ext} {centavo_label}"
-
-    return f"{inteiro_ext} {moeda}"
+def _selected_ids() -> list[int]:
+    return [int(raw) for raw in request.form.getlist("ids") if raw.isdigit()]
 
 
 @contracts_bp.route("/")
 @login_required
+@read_only
 def list_contracts():
     user_id = session["user_id"]
-    contracts = (
-        g.db.query(Contract)
-        .filter_by(user_id=user_id)
-        .order_by(Contract.updated_at.desc())
-        .all()
+    filters = list_filters(request.args)
+    filter_args = {
+        key: request.args.get(key)
+        for key in ("q", "status", "cliente", "vencimento_de", "vencimento_ate")
+        if request.args.get(key)
+    }
+    search_query = (request.args.get("q") or "").strip()
+
+    next_url = None
+    if search_query:
+        page = max(request.args.get("pagina", 1, type=int), 1)
+        contracts, has_next = search.search_contracts(
+            g.db,
+            user_id,
+            search_query,
+            lambda query: filter_contracts(query, filters),
+            page,
+            CONTRACTS_PAGE_SIZE,
+        )
+        if has_next:
+            next_url = url_for("contracts.list_contracts", pagina=page + 1, **filter_args)
+        is_first_page = page == 1
+    else:
+        query = filter_contracts(
+            g.db.query(*LIST_COLUMNS).filter(Contract.user_id == user_id), filters
+        )
+        contracts, next_cursor = keyset_page(
+            query,
+            Contract.updated_at,
+            Contract.id,
+            decode_cursor(request.args.get("cursor")),
+            CONTRACTS_PAGE_SIZE,
+        )
+        if next_cursor:
+            next_url = url_for(
+                "contracts.list_contracts", cursor=next_cursor, **filter_args
+            )
+        is_first_page = not request.args.get("cursor")
+
+    return render_template(
+        "contratos/lista.html",
+        contracts=contracts,
+        next_url=next_url,
+        filter_args=filter_args,
+        is_first_page=is_first_page,
     )
-    return render_template("contratos/lista.html", contracts=contracts)
 
 
 @contracts_bp.route("/novo", methods=["GET", "POST"])
 @login_required
 def create_contract():
     if request.method == "POST":
-        form = request.form
-        title = (form.get("title") or "").strip()
-        provider_name = (form.get("provider_name") or "").strip()
-        client_name = (form.get("client_name") or "").strip()
-        service_description = (form.get("service_description") or "").strip()
-        value = _parse_decimal(form.get("value") or "")
-        payment_terms = (form.get("payment_terms") or "").strip()
-        city = (form.get("city") or "").strip()
-        due_date = _parse_date(form.get("due_date") or "")
-        status = (form.get("status") or "rascunho").strip() or "rascunho"
-
-        errors = []
-        required_fields = [
-            (title, "Título é obrigatório."),
-            (provider_name, "Contratado é obrigatório."),
-            (client_name, "Contratante é obrigatório."),
-            (service_description, "Serviço é obrigatório."),
-            (value, "Valor é obrigatório."),
-            (payment_terms, "Forma de pagamento é obrigatória."),
-            (city, "Cidade é obrigatória."),
-        ]
-        for field_value, message in required_fields:
-            if not field_value:
-                errors.append(message)
-
-        if form.get("due_date") and not due_date:
-            errors.append("Data inválida. Use o formato AAAA-MM-DD.")
-
+        values, errors = validate_contract_data(request.form)
         if errors:
             for err in errors:
                 flash(err, "error")
         else:
-            contract = Contract(
-                title=title,
-                provider_name=provider_name,
-                client_name=client_name,
-                service_description=service_description,
-                value=value,
-                payment_terms=payment_terms,
-                city=city,
-                status=status,
-                due_date=due_date,
-                user_id=session["user_id"],
-            )
-            g.db.add(contract)
-            g.db.commit()
+            contract_service.create_contract(g.db, session["user_id"], values)
             flash("Contrato criado com sucesso.", "success")
             return redirect(url_for("contracts.list_contracts"))
 
     return render_template("contratos/form.html", contract=None)
 
 
+@contracts_bp.route("/importar", methods=["GET", "POST"])
+@login_required
+def import_contracts():
+    report = None
+    if request.method == "POST":
+        upload = request.files.get("arquivo")
+        fmt = request.form.get("formato") or (
+            contract_import.detect_format(upload.filename, upload.mimetype)
+            if upload
+            else None
+        )
+        if not upload or not upload.filename:
+            flash("Selecione um arquivo CSV ou NDJSON.", "error")
+        elif fmt not in contract_import.FORMATS:
+            flash("Formato não reconhecido. Use .csv ou .ndjson.", "error")
+        else:
+            report = contract_import.import_contracts(
+                g.db,
+                session["user_id"],
+                contract_import.iter_records(upload.stream, fmt),
+            )
+            flash(f"{report['imported']} contratos importados.", "success")
+            if report["error_count"]:
+                flash(f"{report['error_count']} linhas com erro.", "warning")
+
+    return render_template("contratos/importar.html", report=report)
+
+
 @contracts_bp.route("/<int:contract_id>/editar", methods=["GET", "POST"])
 @login_required
 def edit_contract(contract_id: int):
     contract = _get_contract_or_404(contract_id)
 
     if request.method == "POST":
-        form = request.form
-        contract.title = (form.get("title") or "").strip()
-        contract.provider_name = (form.get("provider_name") or "").strip()
-        contract.client_name = (form.get("client_name") or "").strip()
-        contract.service_description = (form.get("service_description") or "").strip()
-        value = _parse_decimal(form.get("value") or "")
-        contract.payment_terms = (form.get("payment_terms") or "").strip()
-        contract.city = (form.get("city") or "").strip()
-        contract.status = (form.get("status") or "rascunho").strip() or "rascunho"
-        contract.due_date = _parse_date(form.get("due_date") or "")
-
-        errors = []
-        if value is None:
-            errors.append("Valor é obrigatório.")
-        else:
-            contract.value = value
-
-        required_pairs = [
-            (contract.title, "Título é obrigatório."),
-            (contract.provider_name, "Contratado é obrigatório."),
-            (contract.client_name, "Contratante é obrigatório."),
-            (contract.service_description, "Serviço é obrigatório."),
-            (contract.payment_terms, "Forma de pagamento é obrigatória."),
-            (contract.city, "Cidade é obrigatória."),
-        ]
-        for val, message in required_pairs:
-            if not val:
-                errors.append(message)
-
-        if request.form.get("due_date") and contract.due_date is None:
-            errors.append("Data inválida. Use o formato AAAA-MM-DD.")
-
+        values, errors = validate_contract_data(request.form)
+        expected_version = request.form.get("version", type=int)
         if errors:
+            # Reexibe o formulário com o que foi digitado; a sessão é descartada
+            for name, value in values.items():
+                if name != "value" or value is not None:
+                    setattr(contract, name, value)
             for err in errors:
                 flash(err, "error")
         else:
-            g.db.commit()
-            flash("Contrato atualizado.", "success")
+            try:
+                changed = contract_service.update_contract(
+                    g.db, contract, values, expected_version
+                )
+            except contract_service.VersionConflict:
+                flash(contract_service.CONFLICT_MESSAGE, "error")
+                contract = _get_contract_or_404(contract_id)
+                return render_template("contratos/form.html", contract=contract), 409
+            if changed:
+                flash("Contrato atualizado.", "success")
+            else:
+                flash("Nenhuma alteração para salvar.", "info")
             return redirect(url_for("contracts.list_contracts"))
 
     return render_template("contratos/form.html", contract=contract)
@@ -317,128 +193,143 @@ def edit_contract(contract_id: int):
 @login_required
 def delete_contract(contract_id: int):
     contract = _get_contract_or_404(contract_id)
-    g.db.delete(contract)
-    g.db.commit()
+    contract_service.delete_contract(g.db, contract)
     flash("Contrato excluído.", "info")
     return redirect(url_for("contracts.list_contracts"))
 
 
+@contracts_bp.route("/excluir-selecionados", methods=["POST"])
+@login_required
+def bulk_delete():
+    ids = _selected_ids()
+    if not ids:
+        flash("Selecione ao menos um contrato para excluir.", "warning")
+    elif len(ids) > BULK_MAX_CONTRACTS:
+        flash(f"Limite de {BULK_MAX_CONTRACTS} contratos por operação.", "error")
+    else:
+        deleted = contract_service.bulk_delete(g.db, session["user_id"], ids)
+        flash(f"{deleted} contrato(s) excluído(s).", "info")
+    return redirect(url_for("contracts.list_contracts"))
+
+
+@contracts_bp.route("/status-selecionados", methods=["POST"])
+@login_required
+def bulk_status():
+    ids = _selected_ids()
+    status = (request.form.get("status") or "").strip()
+    if not ids:
+        flash("Selecione ao menos um contrato para alterar.", "warning")
+    elif not status:
+        flash("Escolha o novo status.", "warning")
+    elif len(ids) > BULK_MAX_CONTRACTS:
+        flash(f"Limite de {BULK_MAX_CONTRACTS} contratos por operação.", "error")
+    else:
+        changed = contract_service.bulk_set_status(g.db, session["user_id"], ids, status)
+        flash(f"Status alterado em {changed} contrato(s).", "success")
+    return redirect(url_for("contracts.list_contracts"))
+
+
+# Sem @read_only: com PDF_ASYNC a rota grava o job, e ele precisa sair dos
+# dados do primário
 @contracts_bp.route("/<int:contract_id>/pdf")
 @login_required
 def contract_pdf(contract_id: int):
     contract = _get_contract_or_404(contract_id)
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.cell(0, 10, "CONTRATO DE PRESTAÇÃO DE SERVIÇOS", ln=True, align="C")
-
-    pdf.set_font("Helvetica", size=11)
-    pdf.ln(8)
-    valor_formatado = _format_currency_br(contract.value)
-    valor_extenso = _valor_por_extenso(contract.value)
-    vencimento_formatado = _format_date_br(contract.due_date)
-    pdf.multi_cell(
-        0,
-        7,
-        "\n".join(
-            [
-                f"Título: {contract.title}",
-                f"Contratante: {contract.client_name}",
-                f"Contratado: {contract.provider_name}",
-                f"Cidade: {contract.city}",
-                f"Valor: {valor_formatado} ({valor_extenso})",
-                f"Pagamento: {contract.payment_terms}",
-                f"Vencimento: {vencimento_formatado}",
-                f"Serviço: {contract.service_description}",
-            ]
-        ),
-    )
-    pdf.ln(4)
-
-    def add_clause(title: str, body: str):
-        pdf.set_font("Helvetica", "B", 12)
-        pdf.cell(0, 8, title, ln=True)
-        pdf.set_font("Helvetica", size=11)
-        pdf.multi_cell(0, 7, body)
-        pdf.ln(2)
-
-    add_clause(
-        "1. Objeto",
-        "O presente contrato tem por objeto a prestação dos serviços acima descritos pelo CONTRATADO ao CONTRATANTE, conforme escopo, prazos e condições aqui estabelecidos.",
-    )
-    add_clause(
-        "2. Vigência e Prazo",
-        "Este contrato tem vigência a partir de sua assinatura. Quando aplicável, o vencimento indicado acima servirá como referência para conclusão, entrega ou renovação, salvo ajuste diferente entre as partes.",
-    )
-    add_clause(
-        "3. Obrigações do Contratado",
-        "Prestar os serviços com diligência e dentro do prazo; manter confidencialidade sobre informações do CONTRATANTE; informar eventuais impedimentos e solicitar materiais ou acessos necessários.",
-    )
-    add_clause(
-        "4. Obrigações do Contratante",
-        "Fornecer informações, materiais e acessos necessários; acompanhar entregas; efetuar os pagamentos nos prazos combinados; aprovar ou solicitar ajustes em tempo razoável.",
-    )
-    add_clause(
-        "5. Pagamento",
-        "O CONTRATANTE pagará ao CONTRATADO o valor ajustado, conforme a forma de pagamento indicada. Juros e correção poderão incidir em caso de atraso, conforme legislação aplicável.",
-    )
-    add_clause(
-        "6. Propriedade Intelectual",
-        "Salvo ajuste em contrário, entregas personalizadas pertencem ao CONTRATANTE após quitação. Ferramentas, métodos e know-how preexistentes permanecem de propriedade do CONTRATADO.",
-    )
-    add_clause(
-        "7. Confidencialidade",
-        "As partes manterão confidenciais quaisquer informações técnicas, comerciais ou estratégicas recebidas durante a execução deste contrato, pelo prazo de 5 anos após o término, salvo por obrigação legal.",
-    )
-    add_clause(
-        "8. Rescisão",
-        "O contrato pode ser rescindido por qualquer parte em caso de descumprimento material não sanado, ou por acordo mútuo. Valores devidos até a data da rescisão permanecem exigíveis.",
-    )
-    add_clause(
-        "9. Responsabilidade",
-        "O CONTRATADO responde pela execução dos serviços conforme boas práticas. Em nenhuma hipótese será responsável por danos indiretos, lucros cessantes ou perda de receita, salvo dolo.",
-    )
-    add_clause(
-        "10. Foro",
-        "As partes elegem o foro da cidade mencionada no cabeçalho para dirimir quaisquer dúvidas oriundas deste contrato, com renúncia a qualquer outro, por mais privilegiado que seja.",
-    )
-
-    pdf.ln(6)
-    pdf.set_font("Helvetica", "B", 11)
-    pdf.cell(0, 8, "Declaração e Assinaturas", ln=True)
-    pdf.set_font("Helvetica", size=11)
-    pdf.multi_cell(
-        0,
-        7,
-        "As partes declaram ter lido e concordado com as cláusulas acima. Este contrato pode ser assinado eletronicamente ou fisicamente em duas vias de igual teor.",
-    )
-
-    pdf.ln(14)
-    pdf.cell(0, 7, f"Cidade: {contract.city}", ln=True)
-    pdf.cell(
-        0,
-        7,
-        f"Data: {vencimento_formatado if contract.due_date else '___/___/____'}",
-        ln=True,
+    fields = contract_fields(contract)
+    digest = pdf_cache.fingerprint(fields)
+
+    if request.if_none_match.contains(digest):
+        response = make_response("", 304)
+    else:
+        pdf_bytes = pdf_cache.get(contract.id, digest)
+        # Job concluído sem arquivo no cache (grande demais, removido pelo LRU ou
+        # gerado em outro servidor): renderiza aqui em vez de voltar à fila
+        if (
+            pdf_bytes is None
+            and PDF_ASYNC
+            and not pdf_jobs.finished(g.db, contract.id, digest)
+        ):
+            job = pdf_jobs.enqueue(g.db, contract.user_id, fields, digest)
+            return redirect(url_for("contracts.pdf_job_status", job_id=job.id))
+        if pdf_bytes is None:
+            pdf_bytes = render_one(fields)
+            pdf_cache.put(contract.id, digest, pdf_bytes)
+        response = make_response(pdf_bytes)
+        response.headers["Content-Type"] = "application/pdf"
+        response.headers["Content-Disposition"] = (
+            f'inline; filename="contrato_{contract.id}.pdf"'
+        )
+
+    response.set_etag(digest)
+    response.last_modified = contract.updated_at
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@contracts_bp.route("/pdf/tarefas/<int:job_id>")
+@login_required
+@read_only
+def pdf_job_status(job_id: int):
+    job = (
+        g.db.query(PdfJob)
+        .filter(PdfJob.id == job_id, PdfJob.user_id == session["user_id"])
+        .first()
     )
+    if not job:
+        abort(404)
 
-    pdf.ln(18)
-    pdf.cell(80, 7, "______________________________", ln=0)
-    pdf.cell(30, 7, "", ln=0)
-    pdf.cell(80, 7, "______________________________", ln=1)
-    pdf.cell(80, 7, f"Contratante: {contract.client_name}", ln=0)
-    pdf.cell(30, 7, "", ln=0)
-    pdf.cell(80, 7, f"Contratado: {contract.provider_name}", ln=1)
-
+    pdf_url = url_for("contracts.contract_pdf", contract_id=job.contract_id)
+    if request.accept_mimetypes.best == "application/json":
+        return jsonify(
+            {
+                "id": job.id,
+                "contract_id": job.contract_id,
+                "status": job.status,
+                "error": job.error,
+                "pdf_url": pdf_url if job.status == "done" else None,
+            }
+        )
+    if job.status == "done":
+        return redirect(pdf_url)
+    return render_template("contratos/pdf_tarefa.html", job=job)
+
+
+@contracts_bp.route("/exportar", methods=["GET", "POST"])
+@login_required
+@read_only
+def export_contracts():
+    query = g.db.query(Contract).filter(Contract.user_id == session["user_id"])
+    if request.method == "POST":
+        ids = _selected_ids()
+        if not ids:
+            flash("Selecione ao menos um contrato para exportar.", "warning")
+            return redirect(url_for("contracts.list_contracts"))
+        query = query.filter(Contract.id.in_(ids))
+    else:
+        query = filter_contracts(query, list_filters(request.args))
 
-    pdf_output = pdf.output(dest="S")
-    pdf_bytes = pdf_output.encode("latin1") if isinstance(pdf_output, str) else bytes(
-        pdf_output
+    contracts = (
+        query.order_by(Contract.updated_at.desc(), Contract.id.desc())
+        .limit(PDF_EXPORT_MAX_CONTRACTS + 1)
+        .all()
     )
-    response = make_response(pdf_bytes)
-    response.headers["Content-Type"] = "application/pdf"
-    response.headers["Content-Disposition"] = (
-        f'inline; filename="contrato_{contract.id}.pdf"'
+    if not contracts:
+        flash("Nenhum contrato encontrado para exportar.", "warning")
+        return redirect(url_for("contracts.list_contracts"))
+    if len(contracts) > PDF_EXPORT_MAX_CONTRACTS:
+        flash(
+            f"Limite de {PDF_EXPORT_MAX_CONTRACTS} contratos por exportação. Refine os filtros.",
+            "error",
+        )
+        return redirect(url_for("contracts.list_contracts"))
+
+    fields_list = [contract_fields(contract) for contract in contracts]
+    entries = (
+        (f"contrato_{fields['id']}.pdf", pdf_bytes)
+        for fields, pdf_bytes in render_many(fields_list)
     )
+    response = Response(zip_stream(entries), mimetype="application/zip")
+    filename = f"contratos_{datetime.utcnow():%Y%m%d}.zip"
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
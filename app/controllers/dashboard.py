@@ -1,6 +1,7 @@
-from flask import Blueprint, g, render_template, session
+from flask import Blueprint, flash, g, redirect, render_template, session, url_for
 
-from app.controllers import login_required
+from app import due_dates, stats
+from app.controllers import login_required, read_only
 from app.models.contract import Contract
 
 dashboard_bp = Blueprint("dashboard", __name__)
@@ -8,16 +9,39 @@ dashboard_bp = Blueprint("dashboard", __name__)
 
 @dashboard_bp.route("/dashboard")
 @login_required
+@read_only
 def home():
     user_id = session["user_id"]
-    contracts = (
-        g.db.query(Contract)
-        .filter_by(user_id=user_id)
-        .order_by(Contract.updated_at.desc())
+    recent_contracts = (
+        g.db.query(
+            Contract.id,
+            Contract.title,
+            Contract.client_name,
+            Contract.provider_name,
+            Contract.status,
+            Contract.updated_at,
+        )
+        .filter(Contract.user_id == user_id)
+        .order_by(Contract.updated_at.desc(), Contract.id.desc())
+        .limit(5)
         .all()
     )
+    token = due_dates.feed_token(g.db, user_id)
     return render_template(
         "dashboard/index.html",
-        contracts=contracts,
-        total_contracts=len(contracts),
+        recent_contracts=recent_contracts,
+        due_feed_url=(
+            url_for("api.due_feed", formato="ics", token=token, _external=True)
+            if token
+            else None
+        ),
+        **stats.dashboard_stats(g.db, user_id),
     )
+
+
+@dashboard_bp.route("/dashboard/calendario/renovar", methods=["POST"])
+@login_required
+def regenerate_feed():
+    due_dates.regenerate_feed_secret(g.db, session["user_id"])
+    flash("Novo link do calendário gerado. O link anterior deixou de funcionar.", "success")
+    return redirect(url_for("dashboard.home"))
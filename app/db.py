@@ -1,16 +1,131 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker, declarative_base
+import os
+import time
 
-from app.settings import DATABASE_URL, ECHO_SQL
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, scoped_session, sessionmaker, declarative_base
 
-engine = create_engine(DATABASE_URL, echo=ECHO_SQL, future=True)
+from app import settings
+from app.settings import (
+    DATABASE_REPLICA_URL,
+    DATABASE_URL,
+    ECHO_SQL,
+    REPLICA_STICKY_DIR,
+    REPLICA_STICKY_SECONDS,
+)
+
+
+def _sqlite_pragmas(wal: bool):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if wal:
+            # Leitores não bloqueiam escritores (e vice-versa)
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+        if settings.SQLITE_FOREIGN_KEYS:
+            cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return on_connect
+
+
+def make_engine(url: str = DATABASE_URL, **overrides):
+    """Cria a engine com pool/pragmas definidos em ``app.settings``."""
+    options = {"echo": ECHO_SQL, "future": True}
+    parsed = make_url(url)
+
+    if parsed.get_backend_name() == "sqlite":
+        in_memory = parsed.database in (None, "", ":memory:")
+        options["connect_args"] = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+        options.update(overrides)
+        new_engine = create_engine(url, **options)
+        event.listen(
+            new_engine,
+            "connect",
+            _sqlite_pragmas(settings.SQLITE_WAL and not in_memory),
+        )
+        return new_engine
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    options.update(overrides)
+    return create_engine(url, **options)
+
+
+class RoutingSession(Session):
+    """Sessão que envia leituras para a réplica quando ``info["read_only"]``.
+
+    Flush e comandos DML sempre vão para o primário; depois da primeira
+    escrita a sessão fica presa ao primário (``info["wrote"]``) para enxergar
+    os próprios dados.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if replica_engine is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info["wrote"] = True
+        if self.info.get("read_only") and not self.info.get("wrote"):
+            return replica_engine
+        return engine
+
+
+def mark_write(user_id: int | None) -> None:
+    """Read-your-writes: ``user_id`` lê do primário por ``REPLICA_STICKY_SECONDS``.
+
+    A marca é por usuário (vale para cookie e HTTP Basic) e fica num arquivo
+    em ``REPLICA_STICKY_DIR`` cujo mtime é o fim da janela, visível para
+    todos os workers da máquina.
+    """
+    if replica_engine is None or not user_id:
+        return
+    until = time.time() + REPLICA_STICKY_SECONDS
+    path = REPLICA_STICKY_DIR / str(user_id)
+    try:
+        REPLICA_STICKY_DIR.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        os.utime(path, (until, until))
+    except OSError:
+        pass
+
+
+def recently_wrote(user_id: int | None) -> bool:
+    if replica_engine is None or not user_id:
+        return False
+    try:
+        return (REPLICA_STICKY_DIR / str(user_id)).stat().st_mtime > time.time()
+    except OSError:
+        return False
+
+
+engine = make_engine()
+replica_engine = make_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None
 SessionLocal = scoped_session(
-    sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    sessionmaker(
+        bind=engine,
+        class_=RoutingSession,
+        autoflush=False,
+        autocommit=False,
+        future=True,
+    )
 )
 Base = declarative_base()
 
 
 def init_db():
     from app import models  # noqa: F401
+    from app.migrations import run_migrations, schema_is_current
 
+    if settings.SCHEMA_FAST_STARTUP and schema_is_current(engine):
+        # Uma consulta em vez de inspecionar cada tabela a cada partida a frio
+        return
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
@@ -0,0 +1,354 @@
+"""Lembretes de vencimento e feed de vencimentos (iCalendar/JSON).
+
+A passada noturna (``flask due-reminders``) não relê a tabela inteira: cada
+tipo de lembrete guarda em ``scheduler_state`` a última data de vencimento
+já processada (marca d'água) e a execução seguinte lê só a faixa nova pelo
+índice ``ix_contracts_due_date``:
+
+- ``upcoming``: vencimentos em (marca, hoje + DUE_REMINDER_DAYS_AHEAD];
+- ``overdue``: vencimentos em (marca, ontem].
+
+Contratos criados ou alterados depois da última passada com vencimento numa
+faixa já coberta (ex.: vencimento antecipado para amanhã) são conferidos à
+parte, na mesma faixa do índice. Tudo é lido em lotes por keyset
+``(due_date, id)`` com commit a cada lote: a memória é a de um lote para
+qualquer volume, e os inserts ignoram lembretes já existentes, então
+interromper e rodar de novo é seguro.
+"""
+
+import hmac
+import secrets
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import and_, insert, or_, select, text
+
+from app.db import SessionLocal, engine
+from app.models.contract import Contract
+from app.models.due_reminder import DueReminder
+from app.models.scheduler_state import SchedulerState
+from app.models.user import User
+from app.settings import (
+    DUE_FEED_DAYS_AHEAD,
+    DUE_FEED_DAYS_BEHIND,
+    DUE_FEED_MAX_EVENTS,
+    DUE_REMINDER_BACKFILL_DAYS,
+    DUE_REMINDER_BATCH_SIZE,
+    DUE_REMINDER_DAYS_AHEAD,
+    SECRET_KEY,
+)
+
+UPCOMING = "upcoming"
+OVERDUE = "overdue"
+# Contratos cancelados não geram lembrete nem aparecem no feed
+INACTIVE_STATUSES = ("cancelado",)
+# pg_try_advisory_lock: uma passada por vez entre servidores
+LOCK_ID = 8124002
+
+
+def _state_name(kind: str) -> str:
+    return f"due_reminders:{kind}"
+
+
+def _windows(today: date) -> dict[str, tuple[date, date]]:
+    """Tipo -> (marca inicial na primeira execução, fim da faixa de hoje)."""
+    yesterday = today - timedelta(days=1)
+    return {
+        UPCOMING: (yesterday, today + timedelta(days=DUE_REMINDER_DAYS_AHEAD)),
+        OVERDUE: (yesterday - timedelta(days=DUE_REMINDER_BACKFILL_DAYS), yesterday),
+    }
+
+
+def _batches(db, start: date, end: date, changed_since: datetime | None = None):
+    """Lotes de ``(id, user_id, due_date)`` com ``start < due_date <= end``."""
+    query = select(Contract.id, Contract.user_id, Contract.due_date).where(
+        Contract.due_date > start,
+        Contract.due_date <= end,
+        Contract.status.notin_(INACTIVE_STATUSES),
+    )
+    if changed_since is not None:
+        query = query.where(Contract.updated_at >= changed_since)
+    last = None
+    while True:
+        page = query
+        if last is not None:
+            last_due, last_id = last
+            page = page.where(
+                Contract.due_date >= last_due,
+                or_(
+                    Contract.due_date > last_due,
+                    and_(Contract.due_date == last_due, Contract.id > last_id),
+                ),
+            )
+        rows = db.execute(
+            page.order_by(Contract.due_date, Contract.id).limit(DUE_REMINDER_BATCH_SIZE)
+        ).all()
+        if rows:
+            yield rows
+        if len(rows) < DUE_REMINDER_BATCH_SIZE:
+            return
+        last = rows[-1].due_date, rows[-1].id
+
+
+def _insert_ignoring_duplicates(db, rows: list[dict]) -> int:
+    table = DueReminder.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    if dialect_insert is None:
+        statement = insert(table).prefix_with("IGNORE")
+    else:
+        statement = dialect_insert(table).on_conflict_do_nothing()
+    # RETURNING devolve só as linhas realmente inseridas
+    return len(db.execute(statement.returning(table.c.id), rows).all())
+
+
+def _remind(db, kind: str, batches, now: datetime) -> int:
+    created = 0
+    for rows in batches:
+        created += _insert_ignoring_duplicates(
+            db,
+            [
+                {
+                    "contract_id": row.id,
+                    "user_id": row.user_id,
+                    "kind": kind,
+                    "due_date": row.due_date,
+                    "created_at": now,
+                }
+                for row in rows
+            ],
+        )
+        db.commit()
+    return created
+
+
+def run(db, today: date | None = None) -> dict[str, int]:
+    """Uma passada incremental; devolve lembretes criados por tipo."""
+    today = today or date.today()
+    started = datetime.utcnow()
+    created = {}
+    for kind, (first_mark, end) in _windows(today).items():
+        state = db.get(SchedulerState, _state_name(kind))
+        count = 0
+        if state is not None and kind == UPCOMING:
+            # Faixa já coberta por passadas anteriores: só o que mudou desde a última
+            count += _remind(
+                db,
+                kind,
+                _batches(
+                    db,
+                    today - timedelta(days=1),
+                    min(state.watermark, end),
+                    changed_since=state.updated_at,
+                ),
+                started,
+            )
+        mark = state.watermark if state is not None else first_mark
+        if end > mark:
+            count += _remind(db, kind, _batches(db, mark, end), started)
+
+        if state is None:
+            db.add(SchedulerState(name=_state_name(kind), watermark=end, updated_at=started))
+        else:
+            state.watermark = max(state.watermark, end)
+            state.updated_at = started
+        db.commit()
+        created[kind] = count
+    return created
+
+
+def run_nightly(today: date | None = None) -> dict[str, int] | None:
+    """``run`` numa sessão própria; ``None`` se outra passada estiver rodando."""
+    with engine.connect() as lock_conn:
+        postgres = lock_conn.dialect.name == "postgresql"
+        if postgres:
+            # Lock de sessão numa conexão dedicada: a passada faz vários commits
+            acquired = lock_conn.execute(
+                text("SELECT pg_try_advisory_lock(:id)"), {"id": LOCK_ID}
+            ).scalar()
+            if not acquired:
+                return None
+        db = SessionLocal()
+        try:
+            return run(db, today)
+        finally:
+            db.close()
+            SessionLocal.remove()
+            if postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": LOCK_ID})
+
+
+def seconds_until(hour: int, now: datetime | None = None) -> float:
+    """Segundos até a próxima ocorrência de ``hour``:00 (hora local)."""
+    now = now or datetime.now()
+    target = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+# Feed ---------------------------------------------------------------------
+
+FEED_COLUMNS = (
+    Contract.id,
+    Contract.title,
+    Contract.client_name,
+    Contract.provider_name,
+    Contract.value,
+    Contract.status,
+    Contract.due_date,
+    Contract.updated_at,
+)
+
+
+def _serializer() -> URLSafeSerializer:
+    return URLSafeSerializer(SECRET_KEY, salt="due-feed")
+
+
+def feed_token(db, user_id: int) -> str | None:
+    """Token do feed para apps de calendário, que não enviam cookie de sessão.
+
+    Assina o ``feed_secret`` do usuário junto com o id: o link vale só para
+    esta conta e deixa de valer quando o segredo é trocado.
+    """
+    secret = db.execute(select(User.feed_secret).where(User.id == user_id)).scalar()
+    if not secret:
+        return None
+    return _serializer().dumps({"u": user_id, "s": secret})
+
+
+def user_from_token(db, token: str | None) -> int | None:
+    if not token:
+        return None
+    try:
+        payload = _serializer().loads(token)
+    except BadSignature:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    user_id, secret = payload.get("u"), payload.get("s")
+    if not isinstance(user_id, int) or not isinstance(secret, str):
+        return None
+    current = db.execute(select(User.feed_secret).where(User.id == user_id)).scalar()
+    if not current or not hmac.compare_digest(current.encode(), secret.encode()):
+        return None
+    return user_id
+
+
+def regenerate_feed_secret(db, user_id: int) -> None:
+    """Troca o segredo do feed: links assinados antes deixam de funcionar."""
+    db.execute(
+        User.__table__.update()
+        .where(User.id == user_id)
+        .values(feed_secret=secrets.token_hex(16))
+    )
+    db.commit()
+
+
+def feed_contracts(db, user_id: int, today: date | None = None) -> list:
+    """Contratos com vencimento na janela do feed, pelo índice (user_id, due_date)."""
+    today = today or date.today()
+    return db.execute(
+        select(*FEED_COLUMNS)
+        .where(
+            Contract.user_id == user_id,
+            Contract.due_date >= today - timedelta(days=DUE_FEED_DAYS_BEHIND),
+            Contract.due_date <= today + timedelta(days=DUE_FEED_DAYS_AHEAD),
+            Contract.status.notin_(INACTIVE_STATUSES),
+        )
+        .order_by(Contract.due_date, Contract.id)
+        .limit(DUE_FEED_MAX_EVENTS)
+    ).all()
+
+
+def recent_reminders(db, user_id: int, limit: int) -> list:
+    return db.execute(
+        select(
+            DueReminder.id,
+            DueReminder.contract_id,
+            DueReminder.kind,
+            DueReminder.due_date,
+            DueReminder.created_at,
+        )
+        .where(DueReminder.user_id == user_id)
+        .order_by(DueReminder.id.desc())
+        .limit(limit)
+    ).all()
+
+
+def _ical_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Quebra linhas acima de 75 octetos (RFC 5545, seção 3.1)."""
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts, current, size, limit = [], [], 0, 75
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            parts.append("".join(current))
+            # A continuação começa com um espaço, que também conta
+            current, size, limit = [], 0, 74
+        current.append(char)
+        size += width
+    parts.append("".join(current))
+    return "\r\n ".join(parts)
+
+
+def _currency(value: Decimal | None) -> str:
+    amount = (value or Decimal("0")).quantize(Decimal("0.01"))
+    return "R$ " + f"{amount:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def to_ical(rows, contract_url) -> str:
+    """VCALENDAR com um evento de dia inteiro por vencimento.
+
+    O UID é estável por contrato: mudar o vencimento move o evento no
+    calendário em vez de criar outro. ``contract_url(id)`` monta o link.
+    """
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//SaaS Contratos//Vencimentos//PT-BR",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:Vencimentos de contratos",
+    ]
+    for row in rows:
+        description = (
+            f"Contratante: {row.client_name}\nContratado: {row.provider_name}\n"
+            f"Valor: {_currency(row.value)}\nStatus: {row.status}"
+        )
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:contrato-{row.id}@saas-contratos",
+            f"DTSTAMP:{row.updated_at:%Y%m%dT%H%M%SZ}",
+            f"DTSTART;VALUE=DATE:{row.due_date:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{row.due_date + timedelta(days=1):%Y%m%d}",
+            f"SUMMARY:{_ical_text('Vencimento: ' + row.title)}",
+            f"DESCRIPTION:{_ical_text(description)}",
+            f"URL:{contract_url(row.id)}",
+            "BEGIN:VALARM",
+            "ACTION:DISPLAY",
+            f"TRIGGER:-P{DUE_REMINDER_DAYS_AHEAD}D",
+            f"DESCRIPTION:{_ical_text('Vence em breve: ' + row.title)}",
+            "END:VALARM",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "".join(_fold(line) + "\r\n" for line in lines)
@@ -0,0 +1,147 @@
+"""Valores monetários por extenso em português (reais e centavos)."""
+
+from decimal import Decimal
+from functools import lru_cache
+from typing import Iterable
+
+UNITS = [
+    "zero",
+    "um",
+    "dois",
+    "três",
+    "quatro",
+    "cinco",
+    "seis",
+    "sete",
+    "oito",
+    "nove",
+]
+TEENS = {
+    10: "dez",
+    11: "onze",
+    12: "doze",
+    13: "treze",
+    14: "quatorze",
+    15: "quinze",
+    16: "dezesseis",
+    17: "dezessete",
+    18: "dezoito",
+    19: "dezenove",
+}
+TENS = {
+    20: "vinte",
+    30: "trinta",
+    40: "quarenta",
+    50: "cinquenta",
+    60: "sessenta",
+    70: "setenta",
+    80: "oitenta",
+    90: "noventa",
+}
+HUNDREDS = {
+    1: "cento",
+    2: "duzentos",
+    3: "trezentos",
+    4: "quatrocentos",
+    5: "quinhentos",
+    6: "seiscentos",
+    7: "setecentos",
+    8: "oitocentos",
+    9: "novecentos",
+}
+SCALES = [
+    (1, "mil", "mil"),
+    (2, "milhão", "milhões"),
+    (3, "bilhão", "bilhões"),
+]
+
+CENT = Decimal("0.01")
+
+
+@lru_cache(maxsize=1000)
+def _grupo_por_extenso(n: int) -> str:
+    """Texto de um grupo de três dígitos (0–999); há apenas 1000 entradas."""
+    if n == 0:
+        return ""
+    if n == 100:
+        return "cem"
+
+    centenas, dezenas_unidades = divmod(n, 100)
+    partes = []
+
+    if centenas:
+        partes.append(HUNDREDS[centenas])
+
+    if dezenas_unidades:
+        if dezenas_unidades < 10:
+            partes.append(UNITS[dezenas_unidades])
+        elif dezenas_unidades < 20:
+            partes.append(TEENS[dezenas_unidades])
+        else:
+            dezenas, unidades = divmod(dezenas_unidades, 10)
+            partes.append(TENS[dezenas * 10])
+            if unidades:
+                partes.append(UNITS[unidades])
+
+    return " e ".join(partes)
+
+
+def numero_por_extenso(n: int) -> str:
+    if n == 0:
+        return "zero"
+    if n < 0:
+        return f"menos {numero_por_extenso(-n)}"
+
+    partes = []
+    escala = 0
+    while n:
+        n, grupo = divmod(n, 1000)
+        if grupo:
+            if escala == 0:
+                partes.append(_grupo_por_extenso(grupo))
+            elif escala == 1 and grupo == 1:
+                partes.append("mil")
+            else:
+                _, singular, plural = SCALES[escala - 1]
+                sufixo = singular if grupo == 1 else plural
+                partes.append(f"{_grupo_por_extenso(grupo)} {sufixo}")
+        escala += 1
+
+    partes.reverse()
+    if len(partes) == 1:
+        return partes[0]
+    return ", ".join(partes[:-1]) + " e " + partes[-1]
+
+
+@lru_cache(maxsize=4096)
+def _centavos_por_extenso(valor: Decimal) -> str:
+    if valor < 0:
+        return f"menos {_centavos_por_extenso(-valor)}"
+    inteiro, centavos = divmod(int(valor.scaleb(2)), 100)
+
+    inteiro_ext = numero_por_extenso(inteiro)
+    moeda = "real" if inteiro == 1 else "reais"
+
+    if centavos:
+        centavos_ext = numero_por_extenso(centavos)
+        centavo_label = "centavo" if centavos == 1 else "centavos"
+        return f"{inteiro_ext} {moeda} e {centavos_ext} {centavo_label}"
+
+    return f"{inteiro_ext} {moeda}"
+
+
+def valor_por_extenso(valor: Decimal | None) -> str:
+    return _centavos_por_extenso((valor or Decimal("0")).quantize(CENT))
+
+
+def valores_por_extenso(valores: Iterable[Decimal | None]) -> list[str]:
+    """Versão em lote: valores repetidos são convertidos uma única vez."""
+    vistos: dict[Decimal, str] = {}
+    resultado = []
+    for valor in valores:
+        chave = (valor or Decimal("0")).quantize(CENT)
+        texto = vistos.get(chave)
+        if texto is None:
+            texto = vistos[chave] = _centavos_por_extenso(chave)
+        resultado.append(texto)
+    return resultado
@@ -0,0 +1,267 @@
+"""Cache do HTML renderizado de cada contrato nas listagens.
+
+Nos templates::
+
+    {% call cached_fragment("lista", contract.id, contract.updated_at) %}
+      <tr>...</tr>
+    {% endcall %}
+
+A chave combina o nome do fragmento, ``updated_at`` e um hash dos templates,
+então uma edição ou um deploy com templates novos nunca serve HTML antigo.
+``contract_service`` chama ``discard`` após editar/excluir para liberar as
+versões que deixaram de ser usadas.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from markupsafe import Markup
+
+from app.settings import (
+    FRAGMENT_CACHE,
+    FRAGMENT_CACHE_DIR,
+    FRAGMENT_CACHE_MAX_BYTES,
+    FRAGMENT_CACHE_MAX_ENTRIES,
+    FRAGMENT_CACHE_REDIS_URL,
+)
+
+
+class MemoryBackend:
+    """LRU em memória, por processo."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple[int, str], str]" = OrderedDict()
+        self._variants: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, contract_id: int, variant: str) -> str | None:
+        with self._lock:
+            html = self._entries.get((contract_id, variant))
+            if html is not None:
+                self._entries.move_to_end((contract_id, variant))
+            return html
+
+    def set(self, contract_id: int, variant: str, html: str) -> None:
+        with self._lock:
+            self._entries[(contract_id, variant)] = html
+            self._variants.setdefault(contract_id, set()).add(variant)
+            while len(self._entries) > self.max_entries:
+                (old_id, old_variant), _ = self._entries.popitem(last=False)
+                variants = self._variants.get(old_id)
+                if variants is not None:
+                    variants.discard(old_variant)
+                    if not variants:
+                        del self._variants[old_id]
+
+    def discard(self, contract_id: int) -> None:
+        self.discard_many((contract_id,))
+
+    def discard_many(self, contract_ids) -> None:
+        with self._lock:
+            for contract_id in contract_ids:
+                for variant in self._variants.pop(contract_id, ()):
+                    self._entries.pop((contract_id, variant), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._variants.clear()
+
+
+class FileBackend:
+    """Um diretório por contrato; compartilhado entre workers da mesma máquina.
+
+    Limitado a ``max_entries`` arquivos e ``max_bytes`` no total, como o cache
+    de PDFs: o mtime marca o último uso e os menos usados saem primeiro. Para
+    não listar o diretório a cada linha gravada, cada processo estima o
+    tamanho e só varre a cada ``max_entries // 10`` gravações (ou antes, se a
+    estimativa passar de um limite), removendo até ficar em 90% dos limites.
+    """
+
+    def __init__(self, directory: Path, max_entries: int, max_bytes: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._scan_every = max(1, max_entries // 10)
+        self._lock = threading.Lock()
+        # Estimativa desde a última varredura; None força a primeira
+        self._entries = None
+        self._bytes = 0
+        self._writes = 0
+
+    def _path(self, contract_id: int, variant: str) -> Path:
+        name = hashlib.sha1(variant.encode()).hexdigest()
+        return self.directory / str(contract_id) / f"{name}.html"
+
+    def get(self, contract_id: int, variant: str) -> str | None:
+        path = self._path(contract_id, variant)
+        try:
+            html = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            # Marcador de uso para o LRU
+            os.utime(path)
+        except OSError:
+            pass
+        return html
+
+    def set(self, contract_id: int, variant: str, html: str) -> None:
+        path = self._path(contract_id, variant)
+        data = html.encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            # Cache é apenas otimização: disco cheio não deve quebrar a listagem
+            return
+        with self._lock:
+            self._writes += 1
+            if self._entries is not None:
+                self._entries += 1
+                self._bytes += len(data)
+            scan = (
+                self._entries is None
+                or self._writes >= self._scan_every
+                or self._entries > self.max_entries
+                or self._bytes > self.max_bytes
+            )
+            if scan:
+                self._writes = 0
+        if scan:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.html"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        count = len(entries)
+        if count > self.max_entries or total > self.max_bytes:
+            entries.sort(key=lambda entry: entry[0])
+            target_entries = self.max_entries * 9 // 10
+            target_bytes = self.max_bytes * 9 // 10
+            for _, size, path in entries:
+                if count <= target_entries and total <= target_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                count -= 1
+                total -= size
+                try:
+                    path.parent.rmdir()  # só sai se ficou vazio
+                except OSError:
+                    pass
+        with self._lock:
+            self._entries = count
+            self._bytes = total
+
+    def discard(self, contract_id: int) -> None:
+        shutil.rmtree(self.directory / str(contract_id), ignore_errors=True)
+
+    def discard_many(self, contract_ids) -> None:
+        for contract_id in contract_ids:
+            self.discard(contract_id)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        with self._lock:
+            self._entries = None
+            self._bytes = 0
+
+
+class RedisBackend:
+    """Um hash ``fragment:<id>`` por contrato; requer o pacote ``redis``."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, contract_id: int, variant: str) -> str | None:
+        html = self._client.hget(f"fragment:{contract_id}", variant)
+        return html.decode("utf-8") if html is not None else None
+
+    def set(self, contract_id: int, variant: str, html: str) -> None:
+        self._client.hset(f"fragment:{contract_id}", variant, html)
+
+    def discard(self, contract_id: int) -> None:
+        self._client.delete(f"fragment:{contract_id}")
+
+    def discard_many(self, contract_ids) -> None:
+        keys = [f"fragment:{contract_id}" for contract_id in contract_ids]
+        for start in range(0, len(keys), 1000):
+            self._client.delete(*keys[start : start + 1000])
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter("fragment:*"):
+            self._client.delete(key)
+
+
+def make_backend(kind: str):
+    if kind == "memory":
+        return MemoryBackend(FRAGMENT_CACHE_MAX_ENTRIES)
+    if kind == "file":
+        return FileBackend(
+            FRAGMENT_CACHE_DIR, FRAGMENT_CACHE_MAX_ENTRIES, FRAGMENT_CACHE_MAX_BYTES
+        )
+    if kind == "redis":
+        return RedisBackend(FRAGMENT_CACHE_REDIS_URL)
+    return None
+
+
+backend = make_backend(FRAGMENT_CACHE)
+_templates_digest = ""
+
+
+def cached_fragment(name: str, contract_id: int, updated_at, skip=False, caller=None):
+    """Global do Jinja para ``{% call %}``; ``skip`` renderiza sem cache."""
+    if backend is None or skip:
+        return caller()
+    variant = f"{name}:{updated_at.isoformat()}:{_templates_digest}"
+    html = backend.get(contract_id, variant)
+    if html is None:
+        html = str(caller())
+        backend.set(contract_id, variant, html)
+    return Markup(html)
+
+
+def discard(contract_id: int) -> None:
+    if backend is not None:
+        backend.discard(contract_id)
+
+
+def discard_many(contract_ids) -> None:
+    if backend is not None:
+        backend.discard_many(contract_ids)
+
+
+def _digest_templates(app) -> str:
+    digest = hashlib.sha1()
+    for searchpath in app.jinja_loader.searchpath:
+        for path in sorted(Path(searchpath).rglob("*.html")):
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def init_app(app) -> None:
+    global _templates_digest
+    _templates_digest = _digest_templates(app)
+    app.jinja_env.globals["cached_fragment"] = cached_fragment
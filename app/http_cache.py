@@ -0,0 +1,116 @@
+"""Cabeçalhos de cache e compressão aplicados a todas as respostas.
+
+- HTML/JSON recebem ETag fraco calculado sobre o corpo e respondem 304 quando
+  o cliente já tem a mesma versão (``private, no-cache``: sempre revalida).
+- Corpos acima de ``COMPRESS_MIN_BYTES`` saem em brotli (se o pacote
+  ``brotli`` estiver instalado) ou gzip, conforme o ``Accept-Encoding``.
+- ``static_url`` gera URLs com o hash do arquivo (``?v=``); essas respostas
+  podem ficar em cache por um ano como ``immutable``.
+
+Respostas em streaming (ZIP, NDJSON, arquivos) e PDFs, que já têm ETag
+próprio e vêm comprimidos, passam intactas.
+"""
+
+import gzip
+import hashlib
+from pathlib import Path
+
+from flask import request, url_for
+
+from app.settings import COMPRESS_LEVEL, COMPRESS_MIN_BYTES, HTTP_CACHE, STATIC_MAX_AGE
+
+try:
+    import brotli
+except ImportError:  # dependência opcional
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/calendar",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+
+# (caminho, mtime) -> hash curto do conteúdo
+_static_hashes: dict[tuple[str, float], str] = {}
+
+
+def static_url(app, filename: str) -> str:
+    path = Path(app.static_folder) / filename
+    try:
+        key = (str(path), path.stat().st_mtime)
+    except FileNotFoundError:
+        return url_for("static", filename=filename)
+    digest = _static_hashes.get(key)
+    if digest is None:
+        digest = hashlib.sha1(path.read_bytes()).hexdigest()[:10]
+        _static_hashes[key] = digest
+    return url_for("static", filename=filename, v=digest)
+
+
+def _choose_encoding() -> str | None:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compress(response) -> None:
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return
+    if "Content-Encoding" in response.headers:
+        return
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return
+    encoding = _choose_encoding()
+    if encoding == "br":
+        # Qualidade 11 (padrão do brotli) é lenta demais para conteúdo dinâmico
+        body = brotli.compress(data, quality=min(COMPRESS_LEVEL, 11))
+    elif encoding == "gzip":
+        body = gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+    else:
+        return
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+
+
+def _finalize(response):
+    if request.endpoint == "static":
+        if request.args.get("v"):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+        return response
+    if response.is_streamed or response.direct_passthrough:
+        return response
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+
+    # Também no 304: caches precisam saber que a versão guardada depende dele
+    response.vary.add("Accept-Encoding")
+    if request.method in ("GET", "HEAD") and response.status_code == 200:
+        if not response.get_etag()[0]:
+            response.add_etag(weak=True)
+            if not response.cache_control.public:
+                response.cache_control.private = True
+                response.cache_control.no_cache = True
+        response.make_conditional(request)
+
+    if response.status_code == 200:
+        _compress(response)
+    return response
+
+
+def init_app(app) -> None:
+    app.jinja_env.globals["static_url"] = lambda filename: static_url(app, filename)
+    if not HTTP_CACHE:
+        return
+    app.after_request(_finalize)
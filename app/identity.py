@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.models.user import User
+from app.settings import USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS
+
+
+@dataclass(frozen=True)
+class Identity:
+    """Dados do usuário logado usados pelas views (sem sessão do ORM)."""
+
+    id: int
+    name: str
+    email: str
+    session_nonce: str | None
+
+
+_cache: "OrderedDict[int, tuple[float, Identity]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_identity(db, user_id: int) -> Identity | None:
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(user_id)
+        if entry and entry[0] > now:
+            _cache.move_to_end(user_id)
+            return entry[1]
+
+    row = (
+        db.query(User.id, User.name, User.email, User.session_nonce)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        invalidate(user_id)
+        return None
+
+    identity = Identity(
+        id=row.id, name=row.name, email=row.email, session_nonce=row.session_nonce
+    )
+    with _lock:
+        _cache[user_id] = (now + USER_CACHE_TTL_SECONDS, identity)
+        _cache.move_to_end(user_id)
+        while len(_cache) > USER_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return identity
+
+
+def invalidate(user_id: int) -> None:
+    with _lock:
+        _cache.pop(user_id, None)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    # Outros processos enxergam a mudança quando o TTL expira
+    invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        # Entre o flush e o commit outra requisição ainda lê (e guardaria) o
+        # valor antigo: invalida de novo quando a transação termina
+        session.info.setdefault("identity_changed", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _invalidate_after_transaction(session, *args):
+    for user_id in session.info.pop("identity_changed", ()):
+        invalidate(user_id)
@@ -0,0 +1,60 @@
+"""Cache de bytecode dos templates Jinja entre processos.
+
+Sem cache, cada processo novo compila para Python todo template que
+renderiza pela primeira vez. Com ``JINJA_BYTECODE_CACHE`` o código compilado
+fica em ``JINJA_CACHE_DIR`` e uma partida a frio só carrega o bytecode.
+``flask precompile-templates`` gera o cache no build; em disco somente
+leitura (ex.: Vercel) o cache é apenas lido.
+"""
+
+import hashlib
+
+from jinja2 import FileSystemBytecodeCache
+
+from app.settings import JINJA_BYTECODE_CACHE, JINJA_CACHE_DIR
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """``FileSystemBytecodeCache`` portável entre máquinas e tolerante a disco somente leitura.
+
+    A chave usa só o nome do template (o padrão inclui o caminho absoluto,
+    que muda entre o build e o deploy); o Jinja ainda confere o checksum do
+    fonte antes de usar o bytecode, então template editado é recompilado.
+    """
+
+    def get_cache_key(self, name, filename=None) -> str:
+        return hashlib.sha1(name.encode("utf-8")).hexdigest()
+
+    def dump_bytecode(self, bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+def init_app(app) -> None:
+    if not JINJA_BYTECODE_CACHE:
+        return
+    try:
+        JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        # Somente leitura: usa o que veio no deploy, se houver
+        if not JINJA_CACHE_DIR.is_dir():
+            return
+    app.jinja_env.bytecode_cache = TemplateBytecodeCache(str(JINJA_CACHE_DIR))
+
+
+def precompile(app) -> int:
+    """Compila todos os templates para o cache; devolve quantos."""
+    env = app.jinja_env
+    if env.bytecode_cache is None:
+        return 0
+    # O cache padrão fica dentro de app/views: ignora diretórios ocultos
+    names = [
+        name
+        for name in env.list_templates()
+        if not any(part.startswith(".") for part in name.split("/"))
+    ]
+    for name in names:
+        env.get_template(name)
+    return len(names)
@@ -0,0 +1,366 @@
+import secrets
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    String,
+    Table,
+    bindparam,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app import settings
+from app.db import Base
+
+schema_migrations = Table(
+    "schema_migrations",
+    Base.metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+MIGRATIONS = []
+
+
+def migration(version: int, description: str):
+    def decorator(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return func
+
+    return decorator
+
+
+# Migrações devem ser idempotentes: em bancos novos o create_all já cria a
+# estrutura final e a migração apenas registra a versão. Toda mudança de
+# schema (inclusive tabela nova) precisa de uma versão nova: com
+# SCHEMA_FAST_STARTUP o create_all só roda se houver migração pendente.
+
+
+@migration(1, "Índices compostos em contracts (user_id/updated_at, status, due_date)")
+def _contracts_indexes(conn):
+    from app.models.contract import Contract
+
+    for index in Contract.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+@migration(2, "Índice de busca textual em contracts (FTS5 / tsvector)")
+def _contracts_fulltext(conn):
+    from app.search import FTS_COLUMNS, PG_DOCUMENT
+
+    if conn.dialect.name == "sqlite":
+        columns = ", ".join(FTS_COLUMNS)
+        new_values = ", ".join(f"new.{name}" for name in FTS_COLUMNS)
+        old_values = ", ".join(f"old.{name}" for name in FTS_COLUMNS)
+        try:
+            conn.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5("
+                    f"{columns}, content='contracts', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                )
+            )
+        except OperationalError:
+            # SQLite compilado sem FTS5: a busca usa o fallback com LIKE
+            return
+        conn.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS contracts_fts_ai AFTER INSERT ON contracts BEGIN "
+                f"INSERT INTO contracts_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            )
+        )
+        conn.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS contracts_fts_ad AFTER DELETE ON contracts BEGIN "
+                f"INSERT INTO contracts_fts(contracts_fts, rowid, {columns}) "
+                f"VALUES ('delete', old.id, {old_values}); END"
+            )
+        )
+        # Só reindexa quando colunas pesquisáveis mudam (status/valor não)
+        conn.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS contracts_fts_au AFTER UPDATE OF {columns} "
+                f"ON contracts BEGIN "
+                f"INSERT INTO contracts_fts(contracts_fts, rowid, {columns}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO contracts_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            )
+        )
+        conn.execute(text("INSERT INTO contracts_fts(contracts_fts) VALUES ('rebuild')"))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS ix_contracts_fulltext ON contracts "
+                f"USING gin ({PG_DOCUMENT})"
+            )
+        )
+
+
+def applied_versions(conn) -> set[int]:
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def schema_is_current(engine) -> bool:
+    """O banco já tem todas as migrações? (uma consulta, sem inspecionar tabelas)"""
+    try:
+        with engine.connect() as conn:
+            current = conn.execute(select(func.max(schema_migrations.c.version))).scalar()
+    except (OperationalError, ProgrammingError):
+        # Sem schema_migrations: banco novo
+        return False
+    return current == latest_version()
+
+
+def run_migrations(engine) -> list[int]:
+    schema_migrations.create(engine, checkfirst=True)
+    applied = []
+    for version, description, func in MIGRATIONS:
+        try:
+            with engine.begin() as conn:
+                if conn.dialect.name == "postgresql":
+                    # Serializa workers subindo ao mesmo tempo
+                    conn.execute(text("SELECT pg_advisory_xact_lock(8124001)"))
+                if version in applied_versions(conn):
+                    continue
+                func(conn)
+                conn.execute(
+                    schema_migrations.insert().values(
+                        version=version,
+                        description=description,
+                        applied_at=datetime.utcnow(),
+                    )
+                )
+        except IntegrityError:
+            # Outro processo aplicou a mesma versão em paralelo
+            continue
+        applied.append(version)
+    return applied
+
+
+@migration(3, "Coluna version em contracts (concorrência otimista)")
+def _contracts_version(conn):
+    columns = {column["name"] for column in inspect(conn).get_columns("contracts")}
+    if "version" not in columns:
+        conn.execute(
+            text("ALTER TABLE contracts ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        )
+
+
+# Tabelas com chave estrangeira para users.id
+USER_FOREIGN_KEYS = ("contracts", "contract_stats", "contract_events")
+
+
+@migration(4, "ON DELETE CASCADE nas chaves para users e índice de contract_events.user_id")
+def _users_cascade(conn):
+    from app.models.contract_event import ContractEvent
+
+    for index in ContractEvent.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    if conn.dialect.name != "postgresql":
+        # O SQLite não altera constraints de tabelas existentes; bancos novos já
+        # nascem com CASCADE e a exclusão da conta remove os filhos explicitamente
+        return
+    inspector = inspect(conn)
+    for table in USER_FOREIGN_KEYS:
+        for fk in inspector.get_foreign_keys(table):
+            if fk["referred_table"] != "users":
+                continue
+            if (fk.get("options") or {}).get("ondelete", "").upper() == "CASCADE":
+                continue
+            name = fk["name"]
+            columns = ", ".join(fk["constrained_columns"])
+            conn.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"'))
+            conn.execute(
+                text(
+                    f'ALTER TABLE {table} ADD CONSTRAINT "{name}" FOREIGN KEY ({columns}) '
+                    f"REFERENCES users (id) ON DELETE CASCADE"
+                )
+            )
+
+
+@migration(5, "Índice global de vencimento em contracts (lembretes de vencimento)")
+def _contracts_due_date(conn):
+    from app.models.contract import Contract
+
+    for index in Contract.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+@migration(6, "Coluna not_before em pdf_jobs (espera entre tentativas)")
+def _pdf_jobs_not_before(conn):
+    columns = {column["name"] for column in inspect(conn).get_columns("pdf_jobs")}
+    if "not_before" not in columns:
+        conn.execute(text("ALTER TABLE pdf_jobs ADD COLUMN not_before TIMESTAMP"))
+
+
+def _sqlite_autoincrement(conn, table, references) -> bool:
+    """Recria ``table`` no SQLite com AUTOINCREMENT; devolve se recriou.
+
+    Sem AUTOINCREMENT o SQLite reaproveita o maior id depois que ele é
+    excluído. A tabela é refeita pelo procedimento da documentação do SQLite
+    (cria nova, copia, remove a antiga, renomeia) numa transação, com as
+    chaves estrangeiras desligadas. A sequência começa acima do maior id já
+    guardado em ``references`` (pares tabela/coluna), para que o id de uma
+    linha excluída antes da migração também não volte. No Postgres as
+    sequências já não reaproveitam ids.
+    """
+    if conn.dialect.name != "sqlite":
+        return False
+    sql = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": table.name},
+    ).scalar()
+    if sql is None or "AUTOINCREMENT" in sql.upper():
+        return False
+
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    # Colunas novas do modelo precisam aceitar NULL ou ter server_default
+    columns = ", ".join(column.name for column in table.columns if column.name in existing)
+    new_name = f"{table.name}_new"
+    create = str(CreateTable(table).compile(dialect=conn.dialect)).replace(
+        f"CREATE TABLE {table.name} ", f"CREATE TABLE {new_name} ", 1
+    )
+    indexes = ";\n".join(
+        str(CreateIndex(index).compile(dialect=conn.dialect)) for index in table.indexes
+    )
+    script = (
+        "PRAGMA foreign_keys=OFF;\n"
+        "BEGIN;\n"
+        f"{create};\n"
+        f"INSERT INTO {new_name} ({columns}) SELECT {columns} FROM {table.name};\n"
+        f"DROP TABLE {table.name};\n"
+        f"ALTER TABLE {new_name} RENAME TO {table.name};\n"
+        f"{indexes};\n"
+        "COMMIT;\n"
+    )
+    # PRAGMA foreign_keys só vale fora de transação: usa a conexão do driver
+    driver = conn.connection.driver_connection
+    try:
+        driver.executescript(script)
+    except Exception:
+        if driver.in_transaction:
+            driver.rollback()
+        raise
+    finally:
+        if settings.SQLITE_FOREIGN_KEYS:
+            driver.execute("PRAGMA foreign_keys=ON")
+
+    highest = max(
+        [conn.execute(text(f"SELECT max(id) FROM {table.name}")).scalar() or 0]
+        + [
+            conn.execute(text(f"SELECT max({column}) FROM {other}")).scalar() or 0
+            for other, column in references
+        ]
+    )
+    conn.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table.name})
+    conn.execute(
+        text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+        {"name": table.name, "seq": highest},
+    )
+    return True
+
+
+@migration(7, "AUTOINCREMENT em contracts (ids de contratos excluídos não voltam)")
+def _contracts_autoincrement(conn):
+    from app.models.contract import Contract
+
+    _sqlite_autoincrement(
+        conn,
+        Contract.__table__,
+        (
+            ("contract_events", "contract_id"),
+            ("due_reminders", "contract_id"),
+            ("pdf_jobs", "contract_id"),
+        ),
+    )
+    # Os gatilhos da busca textual saem junto com a tabela antiga. Sempre
+    # recriados (IF NOT EXISTS): o executescript da reconstrução faz o próprio
+    # COMMIT, e uma queda antes de registrar a versão deixaria a tabela nova
+    # sem gatilhos, que a nova tentativa não reconstruiria
+    _contracts_fulltext(conn)
+
+
+@migration(8, "AUTOINCREMENT em users e coluna session_nonce (sessões de contas excluídas)")
+def _users_session_nonce(conn):
+    from app.models.user import User
+
+    columns = {column["name"] for column in inspect(conn).get_columns("users")}
+    if "session_nonce" not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN session_nonce VARCHAR(32)"))
+    _sqlite_autoincrement(
+        conn,
+        User.__table__,
+        (
+            ("contracts", "user_id"),
+            ("contract_events", "user_id"),
+            ("contract_stats", "user_id"),
+            ("due_reminders", "user_id"),
+            ("pdf_jobs", "user_id"),
+        ),
+    )
+    table = User.__table__
+    ids = conn.execute(select(table.c.id).where(table.c.session_nonce.is_(None))).scalars().all()
+    if ids:
+        conn.execute(
+            table.update()
+            .where(table.c.id == bindparam("user_id"))
+            .values(session_nonce=bindparam("nonce")),
+            [{"user_id": user_id, "nonce": secrets.token_hex(16)} for user_id in ids],
+        )
+
+
+@migration(9, "Coluna feed_secret em users (links do feed de vencimentos revogáveis)")
+def _users_feed_secret(conn):
+    from app.models.user import User
+
+    columns = {column["name"] for column in inspect(conn).get_columns("users")}
+    if "feed_secret" not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN feed_secret VARCHAR(32)"))
+    table = User.__table__
+    ids = conn.execute(select(table.c.id).where(table.c.feed_secret.is_(None))).scalars().all()
+    if ids:
+        conn.execute(
+            table.update()
+            .where(table.c.id == bindparam("user_id"))
+            .values(feed_secret=bindparam("secret")),
+            [{"user_id": user_id, "secret": secrets.token_hex(16)} for user_id in ids],
+        )
+
+
+@migration(10, "Contadores de contract_stats para usuários que ainda não os têm")
+def _contract_stats_backfill(conn):
+    from app.models.contract import Contract
+    from app.models.contract_stats import ContractStats
+
+    if not settings.CONTRACT_STATS_CACHE:
+        # Sem cache as escritas não mantêm os contadores; a primeira escrita
+        # depois de ligá-lo reconstrói
+        return
+    contracts = Contract.__table__
+    stats = ContractStats.__table__
+    conn.execute(
+        stats.insert().from_select(
+            ["user_id", "status", "contracts_count", "value_total"],
+            select(
+                contracts.c.user_id,
+                contracts.c.status,
+                func.count(contracts.c.id),
+                func.coalesce(func.sum(contracts.c.value), 0),
+            )
+            .where(contracts.c.user_id.not_in(select(stats.c.user_id)))
+            .group_by(contracts.c.user_id, contracts.c.status),
+        )
+    )
@@ -1,2 +1,7 @@
 from app.models.user import User  # noqa: F401
 from app.models.contract import Contract  # noqa: F401
+from app.models.contract_stats import ContractStats  # noqa: F401
+from app.models.pdf_job import PdfJob  # noqa: F401
+from app.models.contract_event import ContractEvent  # noqa: F401
+from app.models.due_reminder import DueReminder  # noqa: F401
+from app.models.scheduler_state import SchedulerState  # noqa: F401
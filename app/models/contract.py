@@ -1,7 +1,17 @@
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
 from app.db import Base
@@ -24,6 +34,23 @@ class Contract(Base):
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    # Controle de concorrência otimista: o UPDATE inclui WHERE version = ?
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     owner = relationship("User", back_populates="contracts")
+
+    __table_args__ = (
+        # Listagem/keyset: WHERE user_id = ? ORDER BY updated_at DESC, id DESC
+        Index("ix_contracts_user_updated", user_id, updated_at.desc(), id.desc()),
+        # Filtro por status e agregados do dashboard
+        Index("ix_contracts_user_status", user_id, status),
+        # Filtros e contagens por faixa de vencimento
+        Index("ix_contracts_user_due", user_id, due_date),
+        # Passada noturna de lembretes: faixa de vencimento de todos os usuários
+        Index("ix_contracts_due_date", due_date, id),
+        # Ids nunca são reaproveitados: o histórico de um contrato excluído
+        # (contract_events) não pode aparecer num contrato novo
+        {"sqlite_autoincrement": True},
+    )
+    __mapper_args__ = {"version_id_col": version}
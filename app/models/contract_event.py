@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+
+from app.db import Base
+
+
+class ContractEvent(Base):
+    """Histórico append-only de um contrato (criação, status, valor, exclusão).
+
+    ``contract_id`` não é chave estrangeira: o histórico sobrevive à
+    exclusão do contrato. ``id`` crescente dá a ordem cronológica.
+    """
+
+    __tablename__ = "contract_events"
+
+    id = Column(Integer, primary_key=True)
+    contract_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(20), nullable=False)  # created/status/value/updated/deleted
+    changes = Column(Text, nullable=False)  # JSON {campo: [antes, depois]}
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Páginas do histórico: WHERE contract_id = ? AND id > ? ORDER BY id
+        Index("ix_contract_events_contract_id", contract_id, id),
+        # Exclusão da conta (e o CASCADE de users) sem varrer a tabela
+        Index("ix_contract_events_user_id", user_id),
+    )
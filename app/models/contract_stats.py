@@ -0,0 +1,16 @@
+from decimal import Decimal
+
+from sqlalchemy import Column, ForeignKey, Integer, Numeric, String
+
+from app.db import Base
+
+
+class ContractStats(Base):
+    """Contadores por usuário/status mantidos a cada escrita em contratos."""
+
+    __tablename__ = "contract_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    contracts_count = Column(Integer, nullable=False, default=0)
+    value_total = Column(Numeric(14, 2), nullable=False, default=Decimal("0.00"))
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+
+from app.db import Base
+
+
+class DueReminder(Base):
+    """Lembrete de vencimento gerado pela passada noturna (``app.due_dates``).
+
+    Um por contrato, tipo e data de vencimento: rodar a passada de novo não
+    duplica, e mudar o vencimento gera um lembrete para a nova data.
+    """
+
+    __tablename__ = "due_reminders"
+
+    id = Column(Integer, primary_key=True)
+    contract_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(20), nullable=False)  # upcoming/overdue
+    due_date = Column(Date, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(contract_id, kind, due_date, name="uq_due_reminders_contract"),
+        # Feed do usuário: WHERE user_id = ? ORDER BY id DESC
+        Index("ix_due_reminders_user_id", user_id, id),
+    )
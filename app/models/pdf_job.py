@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+
+from app.db import Base
+
+
+class PdfJob(Base):
+    __tablename__ = "pdf_jobs"
+
+    id = Column(Integer, primary_key=True)
+    contract_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    digest = Column(String(64), nullable=False)
+    payload = Column(Text, nullable=False)  # campos do contrato em JSON
+    status = Column(String(20), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Após uma falha o job volta à fila, mas só pode ser pego a partir daqui
+    not_before = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_pdf_jobs_status_id", status, id),
+        Index("ix_pdf_jobs_contract_digest", contract_id, digest),
+    )
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, String
+
+from app.db import Base
+
+
+class SchedulerState(Base):
+    """Marca d'água de tarefas periódicas: até onde a última execução chegou."""
+
+    __tablename__ = "scheduler_state"
+
+    name = Column(String(50), primary_key=True)
+    watermark = Column(Date, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,9 +1,9 @@
+import secrets
 from datetime import datetime
 
 from sqlalchemy import Column, DateTime, Integer, String
 from sqlalchemy.orm import relationship
-from werkzeug.security import check_password_hash, generate_password_hash
-
+from app import passwords
 from app.db import Base
 
 
@@ -15,11 +15,21 @@ class User(Base):
     email = Column(String(255), nullable=False, unique=True, index=True)
     password_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Copiado para a sessão no login; conferido a cada requisição
+    session_nonce = Column(String(32), nullable=True, default=lambda: secrets.token_hex(16))
+    # Assinado no link do feed de vencimentos; trocar revoga os links antigos
+    feed_secret = Column(String(32), nullable=True, default=lambda: secrets.token_hex(16))
+
+    # O banco remove os contratos (ON DELETE CASCADE); o ORM não os carrega
+    contracts = relationship(
+        "Contract", back_populates="owner", cascade="all, delete", passive_deletes=True
+    )
 
-    contracts = relationship("Contract", back_populates="owner", cascade="all, delete")
+    # Ids nunca são reaproveitados: uma sessão antiga não pode cair numa conta nova
+    __table_args__ = ({"sqlite_autoincrement": True},)
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return passwords.verify_password(self.password_hash, password)
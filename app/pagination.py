@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(updated_at: datetime, row_id: int) -> str:
+    payload = json.dumps([updated_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str | None) -> tuple[datetime, int] | None:
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        updated_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(updated_at), int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_page(query, updated_col, id_col, cursor, limit: int):
+    """Página ordenada por (updated_at, id) decrescente, sem OFFSET.
+
+    Junção adiada: os ids da página saem só do índice
+    ``(user_id, updated_at, id)`` (covering) e as colunas pedidas em ``query``
+    são lidas apenas para essas linhas, pela chave primária.
+    """
+    if cursor:
+        updated_at, row_id = cursor
+        query = query.filter(
+            or_(
+                updated_col < updated_at,
+                and_(updated_col == updated_at, id_col < row_id),
+            )
+        )
+    page_ids = (
+        query.with_entities(id_col.label("page_id"))
+        .order_by(updated_col.desc(), id_col.desc())
+        .limit(limit + 1)
+        .subquery()
+    )
+    columns = [description["expr"] for description in query.column_descriptions]
+    rows = (
+        query.session.query(*columns)
+        .join(page_ids, id_col == page_ids.c.page_id)
+        .order_by(updated_col.desc(), id_col.desc())
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.updated_at, last.id)
+    return rows, next_cursor
@@ -0,0 +1,76 @@
+"""Hash e verificação de senhas em um pool limitado de threads.
+
+scrypt e PBKDF2 são caros de propósito. Sem limite, uma rajada de logins
+ocupa todas as threads do worker (e, com scrypt, ~32 MB de memória cada).
+Aqui no máximo ``PASSWORD_HASH_WORKERS`` hashes rodam ao mesmo tempo (o
+hashlib libera o GIL) e até ``PASSWORD_HASH_QUEUE`` esperam; com tudo
+ocupado, a requisição falha na hora com ``HashingBusy`` em vez de enfileirar.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app import profiling
+from app.settings import PASSWORD_HASH_METHOD, PASSWORD_HASH_QUEUE, PASSWORD_HASH_WORKERS
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE)
+
+
+class HashingBusy(Exception):
+    """Pool de hash cheio: a requisição deve ser recusada (503)."""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, PASSWORD_HASH_WORKERS), thread_name_prefix="password-hash"
+            )
+    return _executor
+
+
+def _run(func, *args):
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        with profiling.timer("hash"):
+            return _get_executor().submit(func, *args).result()
+    finally:
+        _slots.release()
+
+
+def hash_password(password: str) -> str:
+    return _run(generate_password_hash, password, PASSWORD_HASH_METHOD)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    return _run(check_password_hash, password_hash, password)
+
+
+_prefix = None
+
+
+def _current_prefix() -> str | None:
+    """Prefixo dos hashes novos (``"scrypt"`` vira ``"scrypt:32768:8:1"``).
+
+    Exige um hash completo: roda no pool, uma vez por processo. Com o pool
+    cheio devolve None e a comparação fica para um próximo login.
+    """
+    global _prefix
+    if _prefix is None:
+        try:
+            _prefix = _run(generate_password_hash, "", PASSWORD_HASH_METHOD).split("$", 1)[0]
+        except HashingBusy:
+            return None
+    return _prefix
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True se o hash foi gerado com outro método/parâmetros."""
+    prefix = _current_prefix()
+    return prefix is not None and password_hash.split("$", 1)[0] != prefix
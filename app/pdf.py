@@ -0,0 +1,241 @@
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.extenso import valor_por_extenso
+
+if TYPE_CHECKING:
+    from fpdf import FPDF
+
+CLAUSES = (
+    (
+        "1. Objeto",
+        "O presente contrato tem por objeto a prestação dos serviços acima descritos pelo CONTRATADO ao CONTRATANTE, conforme escopo, prazos e condições aqui estabelecidos.",
+    ),
+    (
+        "2. Vigência e Prazo",
+        "Este contrato tem vigência a partir de sua assinatura. Quando aplicável, o vencimento indicado acima servirá como referência para conclusão, entrega ou renovação, salvo ajuste diferente entre as partes.",
+    ),
+    (
+        "3. Obrigações do Contratado",
+        "Prestar os serviços com diligência e dentro do prazo; manter confidencialidade sobre informações do CONTRATANTE; informar eventuais impedimentos e solicitar materiais ou acessos necessários.",
+    ),
+    (
+        "4. Obrigações do Contratante",
+        "Fornecer informações, materiais e acessos necessários; acompanhar entregas; efetuar os pagamentos nos prazos combinados; aprovar ou solicitar ajustes em tempo razoável.",
+    ),
+    (
+        "5. Pagamento",
+        "O CONTRATANTE pagará ao CONTRATADO o valor ajustado, conforme a forma de pagamento indicada. Juros e correção poderão incidir em caso de atraso, conforme legislação aplicável.",
+    ),
+    (
+        "6. Propriedade Intelectual",
+        "Salvo ajuste em contrário, entregas personalizadas pertencem ao CONTRATANTE após quitação. Ferramentas, métodos e know-how preexistentes permanecem de propriedade do CONTRATADO.",
+    ),
+    (
+        "7. Confidencialidade",
+        "As partes manterão confidenciais quaisquer informações técnicas, comerciais ou estratégicas recebidas durante a execução deste contrato, pelo prazo de 5 anos após o término, salvo por obrigação legal.",
+    ),
+    (
+        "8. Rescisão",
+        "O contrato pode ser rescindido por qualquer parte em caso de descumprimento material não sanado, ou por acordo mútuo. Valores devidos até a data da rescisão permanecem exigíveis.",
+    ),
+    (
+        "9. Responsabilidade",
+        "O CONTRATADO responde pela execução dos serviços conforme boas práticas. Em nenhuma hipótese será responsável por danos indiretos, lucros cessantes ou perda de receita, salvo dolo.",
+    ),
+    (
+        "10. Foro",
+        "As partes elegem o foro da cidade mencionada no cabeçalho para dirimir quaisquer dúvidas oriundas deste contrato, com renúncia a qualquer outro, por mais privilegiado que seja.",
+    ),
+)
+DECLARATION = (
+    "As partes declaram ter lido e concordado com as cláusulas acima. Este contrato pode ser assinado eletronicamente ou fisicamente em duas vias de igual teor."
+)
+
+
+# Equivalentes latin-1 da pontuação tipográfica que editores colam no texto
+_LATIN1_FALLBACK = str.maketrans(
+    {
+        "\u2018": "'",
+        "\u2019": "'",
+        "\u201c": '"',
+        "\u201d": '"',
+        "\u2013": "-",
+        "\u2014": "-",
+        "\u2026": "...",
+        "\u2022": "-",
+    }
+)
+_TEXT_FIELDS = (
+    "title",
+    "client_name",
+    "provider_name",
+    "city",
+    "payment_terms",
+    "service_description",
+)
+
+
+def _latin1(text: str) -> str:
+    """Texto que as fontes padrão do FPDF (latin-1) conseguem desenhar."""
+    return (
+        text.translate(_LATIN1_FALLBACK)
+        .encode("latin-1", errors="replace")
+        .decode("latin-1")
+    )
+
+
+def _format_date_br(date_obj) -> str:
+    # As fontes padrão do FPDF são latin-1: nada de travessão aqui
+    return date_obj.strftime("%d/%m/%Y") if date_obj else "-"
+
+
+def _format_currency_br(value: Decimal | None) -> str:
+    amount = (value or Decimal("0")).quantize(Decimal("0.01"))
+    formatted = f"{amount:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+    return f"R$ {formatted}"
+
+
+@lru_cache(maxsize=1)
+def _static_layout():
+    """Quebra de linhas das cláusulas fixas, calculada uma vez por processo.
+
+    A quebra justificada do ``multi_cell`` é o trecho mais caro da geração;
+    como o texto das cláusulas não muda entre contratos, guardamos a posição
+    de cada palavra e apenas a reemitimos com ``text``.
+    """
+    from fpdf import FPDF
+
+    scratch = FPDF()
+    scratch.add_page()
+    scratch.set_font("Helvetica", size=11)
+    clauses = tuple((title, _justified_lines(scratch, body)) for title, body in CLAUSES)
+    return clauses, _justified_lines(scratch, DECLARATION)
+
+
+def _justified_lines(pdf: "FPDF", text: str):
+    width = pdf.epw - 2 * pdf.c_margin
+    space = pdf.get_string_width(" ")
+    lines = pdf.multi_cell(0, 7, text, dry_run=True, output="LINES")
+    layout = []
+    for index, line in enumerate(lines):
+        words = line.split()
+        widths = [pdf.get_string_width(word) for word in words]
+        gap = space
+        if index < len(lines) - 1 and len(words) > 1:
+            gap = (width - sum(widths)) / (len(words) - 1)
+        offset = 0.0
+        placed = []
+        for word, word_width in zip(words, widths):
+            placed.append((offset, word))
+            offset += word_width + gap
+        layout.append(tuple(placed))
+    return tuple(layout)
+
+
+def _write_lines(pdf: "FPDF", lines, h: float) -> None:
+    for words in lines:
+        if pdf.y + h > pdf.page_break_trigger:
+            pdf.add_page()
+        baseline = pdf.y + 0.5 * h + 0.3 * pdf.font_size
+        left = pdf.l_margin + pdf.c_margin
+        for offset, word in words:
+            pdf.text(left + offset, baseline, word)
+        pdf.set_y(pdf.y + h)
+
+
+def contract_fields(contract) -> dict:
+    return {
+        "id": contract.id,
+        "title": contract.title,
+        "client_name": contract.client_name,
+        "provider_name": contract.provider_name,
+        "city": contract.city,
+        "value": str(contract.value),
+        "payment_terms": contract.payment_terms,
+        "due_date": contract.due_date.isoformat() if contract.due_date else None,
+        "service_description": contract.service_description,
+    }
+
+
+def render_contract_pdf(fields: dict) -> bytes:
+    value = Decimal(fields["value"])
+    due_date = (
+        datetime.strptime(fields["due_date"], "%Y-%m-%d").date()
+        if fields["due_date"]
+        else None
+    )
+    # Import tardio: o fpdf2 (e o fontTools) custam ~0,2 s e a maioria das
+    # requisições não gera PDF; o primeiro PDF do processo paga a conta
+    from fpdf import FPDF
+
+    fields = {
+        **fields,
+        **{name: _latin1(fields[name] or "") for name in _TEXT_FIELDS},
+    }
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, "CONTRATO DE PRESTAÇÃO DE SERVIÇOS", ln=True, align="C")
+
+    pdf.set_font("Helvetica", size=11)
+    pdf.ln(8)
+    valor_formatado = _format_currency_br(value)
+    valor_extenso = valor_por_extenso(value)
+    vencimento_formatado = _format_date_br(due_date)
+    pdf.multi_cell(
+        0,
+        7,
+        "\n".join(
+            [
+                f"Título: {fields['title']}",
+                f"Contratante: {fields['client_name']}",
+                f"Contratado: {fields['provider_name']}",
+                f"Cidade: {fields['city']}",
+                f"Valor: {valor_formatado} ({valor_extenso})",
+                f"Pagamento: {fields['payment_terms']}",
+                f"Vencimento: {vencimento_formatado}",
+                f"Serviço: {fields['service_description']}",
+            ]
+        ),
+    )
+    pdf.ln(4)
+
+    clauses, declaration = _static_layout()
+    for title, lines in clauses:
+        pdf.set_font("Helvetica", "B", 12)
+        pdf.cell(0, 8, title, ln=True)
+        pdf.set_font("Helvetica", size=11)
+        _write_lines(pdf, lines, 7)
+        pdf.ln(2)
+
+    pdf.ln(6)
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.cell(0, 8, "Declaração e Assinaturas", ln=True)
+    pdf.set_font("Helvetica", size=11)
+    _write_lines(pdf, declaration, 7)
+
+    pdf.ln(14)
+    pdf.cell(0, 7, f"Cidade: {fields['city']}", ln=True)
+    pdf.cell(
+        0,
+        7,
+        f"Data: {vencimento_formatado if due_date else '___/___/____'}",
+        ln=True,
+    )
+
+    pdf.ln(18)
+    pdf.cell(80, 7, "______________________________", ln=0)
+    pdf.cell(30, 7, "", ln=0)
+    pdf.cell(80, 7, "______________________________", ln=1)
+    pdf.cell(80, 7, f"Contratante: {fields['client_name']}", ln=0)
+    pdf.cell(30, 7, "", ln=0)
+    pdf.cell(80, 7, f"Contratado: {fields['provider_name']}", ln=1)
+
+    pdf_output = pdf.output(dest="S")
+    return pdf_output.encode("latin1") if isinstance(pdf_output, str) else bytes(
+        pdf_output
+    )
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+from app.settings import PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES
+
+# Incrementar quando o layout do PDF mudar, para invalidar o cache em disco
+LAYOUT_VERSION = "2"
+
+# Tamanho estimado do cache desde a última varredura; None força a primeira.
+# Como no FileBackend do cache de fragmentos, o diretório só é listado na
+# primeira gravação do processo ou quando a estimativa passa do limite.
+_lock = threading.Lock()
+_total_bytes = None
+
+
+def fingerprint(fields: dict) -> str:
+    payload = json.dumps(
+        {"layout": LAYOUT_VERSION, "fields": fields},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_dir() -> Path:
+    PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return PDF_CACHE_DIR
+
+
+def _entry_path(contract_id: int, digest: str) -> Path:
+    # Um diretório por contrato: descartar não precisa listar o cache inteiro
+    return PDF_CACHE_DIR / str(contract_id) / f"{digest}.pdf"
+
+
+def get(contract_id: int, digest: str) -> bytes | None:
+    path = _entry_path(contract_id, digest)
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        # Atualiza o mtime para servir de marcador de uso (LRU)
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+def put(contract_id: int, digest: str, data: bytes) -> None:
+    global _total_bytes
+    if len(data) > PDF_CACHE_MAX_BYTES:
+        return
+    path = _entry_path(contract_id, digest)
+    try:
+        discard(contract_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_name, path)
+    except OSError:
+        # Cache é apenas otimização: falhas de disco não devem quebrar o download
+        return
+    with _lock:
+        if _total_bytes is not None:
+            _total_bytes += len(data)
+        scan = _total_bytes is None or _total_bytes > PDF_CACHE_MAX_BYTES
+    if scan:
+        _evict(_cache_dir())
+
+
+def discard(contract_id: int) -> None:
+    global _total_bytes
+    directory = PDF_CACHE_DIR / str(contract_id)
+    removed = 0
+    try:
+        paths = list(directory.glob("*.pdf"))
+    except OSError:
+        return
+    for path in paths:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            continue
+        removed += size
+    shutil.rmtree(directory, ignore_errors=True)
+    if removed:
+        with _lock:
+            if _total_bytes is not None:
+                _total_bytes = max(0, _total_bytes - removed)
+
+
+def discard_many(contract_ids) -> None:
+    for contract_id in contract_ids:
+        discard(contract_id)
+
+
+def _evict(directory: Path) -> None:
+    """Varre o cache e remove os menos usados até ficar em 90% do limite."""
+    global _total_bytes
+    # Arquivos do formato antigo (``<id>-<digest>.pdf`` na raiz) nunca mais são lidos
+    for path in directory.glob("*.pdf"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    entries = []
+    total = 0
+    for path in directory.glob("*/*.pdf"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    if total > PDF_CACHE_MAX_BYTES:
+        entries.sort(key=lambda entry: entry[0])
+        target = PDF_CACHE_MAX_BYTES * 9 // 10
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            try:
+                path.parent.rmdir()  # só sai se ficou vazio
+            except OSError:
+                pass
+    with _lock:
+        _total_bytes = total
@@ -0,0 +1,102 @@
+import io
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from app import pdf_cache, profiling
+from app.pdf import render_contract_pdf
+from app.settings import PDF_EXPORT_WORKERS, PDF_RENDER_OFFLOAD
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None and PDF_EXPORT_WORKERS > 0:
+        try:
+            _executor = ProcessPoolExecutor(max_workers=PDF_EXPORT_WORKERS)
+        except (OSError, NotImplementedError):
+            # Ambientes sem multiprocessing (ex.: serverless) renderizam inline
+            return None
+    return _executor
+
+
+def shutdown() -> None:
+    """Encerra o pool de processos (ex.: no fim do lifespan ASGI)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def _render_batch(batch: list[dict]) -> list[bytes]:
+    executor = _get_executor()
+    if executor is None or len(batch) == 1:
+        return [render_contract_pdf(fields) for fields in batch]
+    return list(executor.map(render_contract_pdf, batch))
+
+
+def render_one(fields: dict) -> bytes:
+    """Renderiza um PDF, fora do processo quando ``PDF_RENDER_OFFLOAD`` está ativo.
+
+    Em servidores com várias threads por processo (ASGI, gunicorn gthread) a
+    renderização segura o GIL e atrasa as outras requisições do worker.
+    """
+    executor = _get_executor() if PDF_RENDER_OFFLOAD else None
+    with profiling.timer("pdf"):
+        if executor is None:
+            return render_contract_pdf(fields)
+        return executor.submit(render_contract_pdf, fields).result()
+
+
+def render_many(fields_list: list[dict]):
+    """Gera ``(fields, pdf_bytes)`` na ordem recebida, usando o cache em disco.
+
+    Os contratos são renderizados em lotes para que apenas alguns PDFs fiquem
+    em memória enquanto o ZIP é transmitido.
+    """
+    batch_size = max(1, PDF_EXPORT_WORKERS) * 4
+    for start in range(0, len(fields_list), batch_size):
+        batch = fields_list[start : start + batch_size]
+        digests = [pdf_cache.fingerprint(fields) for fields in batch]
+        results = [pdf_cache.get(f["id"], d) for f, d in zip(batch, digests)]
+
+        missing = [idx for idx, data in enumerate(results) if data is None]
+        with profiling.timer("pdf"):
+            rendered = _render_batch([batch[idx] for idx in missing])
+        for idx, data in zip(missing, rendered):
+            pdf_cache.put(batch[idx]["id"], digests[idx], data)
+            results[idx] = data
+
+        yield from zip(batch, results)
+
+
+class _ChunkWriter(io.RawIOBase):
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def zip_stream(entries):
+    """Transmite um ZIP a partir de pares ``(nome, bytes)`` sem montá-lo em memória."""
+    writer = _ChunkWriter()
+    # PDFs já saem comprimidos do FPDF; ZIP_STORED evita gastar CPU à toa
+    with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+            chunk = writer.drain()
+            if chunk:
+                yield chunk
+    chunk = writer.drain()
+    if chunk:
+        yield chunk
@@ -0,0 +1,256 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, or_, update
+
+from app import pdf_cache
+from app.db import SessionLocal
+from app.models.pdf_job import PdfJob
+from app.pdf import render_contract_pdf
+from app.settings import (
+    PDF_JOB_MAX_ATTEMPTS,
+    PDF_JOB_RETENTION_HOURS,
+    PDF_JOB_RETRY_SECONDS,
+    PDF_JOB_STALE_SECONDS,
+    PDF_WORKER_MAINTENANCE_SECONDS,
+    PDF_WORKER_POLL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+PENDING = ("queued", "running")
+INTERRUPTED = "Worker interrompido durante a geração do PDF."
+
+# Próxima rodada de manutenção (time.monotonic), compartilhada pelas threads
+_maintenance_lock = threading.Lock()
+_next_maintenance = 0.0
+
+
+def enqueue(db, user_id: int, fields: dict, digest: str) -> PdfJob:
+    job = (
+        db.query(PdfJob)
+        .filter(
+            PdfJob.contract_id == fields["id"],
+            PdfJob.digest == digest,
+            PdfJob.status.in_(PENDING),
+        )
+        .first()
+    )
+    if job is None:
+        job = PdfJob(
+            contract_id=fields["id"],
+            user_id=user_id,
+            digest=digest,
+            payload=json.dumps(fields, ensure_ascii=False),
+            status="queued",
+        )
+        db.add(job)
+        db.commit()
+    return job
+
+
+def finished(db, contract_id: int, digest: str) -> bool:
+    """Já existe job concluído para esta versão do contrato?"""
+    return (
+        db.query(PdfJob.id)
+        .filter(
+            PdfJob.contract_id == contract_id,
+            PdfJob.digest == digest,
+            PdfJob.status == "done",
+        )
+        .first()
+        is not None
+    )
+
+
+def claim_next(db) -> PdfJob | None:
+    while True:
+        now = datetime.utcnow()
+        candidate = (
+            db.query(PdfJob.id)
+            .filter(
+                PdfJob.status == "queued",
+                or_(PdfJob.not_before.is_(None), PdfJob.not_before <= now),
+            )
+            .order_by(PdfJob.id)
+            .limit(1)
+            .scalar()
+        )
+        if candidate is None:
+            db.commit()
+            return None
+        result = db.execute(
+            update(PdfJob)
+            .where(PdfJob.id == candidate, PdfJob.status == "queued")
+            .values(
+                status="running",
+                started_at=now,
+                attempts=PdfJob.attempts + 1,
+            )
+        )
+        db.commit()
+        # Outro worker pode ter pego o mesmo job entre o SELECT e o UPDATE
+        if result.rowcount == 1:
+            return db.get(PdfJob, candidate)
+
+
+def run_job(db, job: PdfJob) -> None:
+    try:
+        fields = json.loads(job.payload)
+        pdf_cache.put(job.contract_id, job.digest, render_contract_pdf(fields))
+    except Exception as exc:  # noqa: BLE001 - erro registrado no próprio job
+        logger.exception("Falha ao gerar PDF do job %s", job.id)
+        job.error = str(exc)
+        if job.attempts >= PDF_JOB_MAX_ATTEMPTS:
+            job.status = "failed"
+        else:
+            job.status = "queued"
+            job.not_before = datetime.utcnow() + timedelta(
+                seconds=PDF_JOB_RETRY_SECONDS * 2 ** max(job.attempts - 1, 0)
+            )
+    else:
+        job.status = "done"
+        job.error = None
+    job.finished_at = datetime.utcnow()
+    db.commit()
+
+
+def requeue_stale(db) -> int:
+    """Devolve à fila jobs ``running`` abandonados; devolve quantos voltaram.
+
+    Um job que derruba o worker (falta de memória, segfault) nunca chega ao
+    ``except`` de ``run_job``: aqui ele gasta a tentativa e, no limite de
+    ``PDF_JOB_MAX_ATTEMPTS``, termina como ``failed``.
+    """
+    now = datetime.utcnow()
+    stale = (
+        PdfJob.status == "running",
+        PdfJob.started_at < now - timedelta(seconds=PDF_JOB_STALE_SECONDS),
+    )
+    failed = db.execute(
+        update(PdfJob)
+        .where(*stale, PdfJob.attempts >= PDF_JOB_MAX_ATTEMPTS)
+        .values(
+            status="failed",
+            error=INTERRUPTED,
+            finished_at=now,
+        )
+    )
+    if failed.rowcount:
+        logger.error("%s job(s) de PDF abandonados marcados como failed", failed.rowcount)
+    result = db.execute(
+        update(PdfJob)
+        .where(*stale)
+        .values(
+            status="queued",
+            error=INTERRUPTED,
+            not_before=now + timedelta(seconds=PDF_JOB_RETRY_SECONDS),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def purge_finished(db) -> int:
+    cutoff = datetime.utcnow() - timedelta(hours=PDF_JOB_RETENTION_HOURS)
+    result = db.execute(
+        delete(PdfJob).where(
+            PdfJob.status.in_(("done", "failed")), PdfJob.finished_at < cutoff
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def maintain(db) -> bool:
+    """``requeue_stale`` e ``purge_finished``, no máximo uma vez por intervalo no processo."""
+    global _next_maintenance
+    with _maintenance_lock:
+        now = time.monotonic()
+        if now < _next_maintenance:
+            return False
+        _next_maintenance = now + PDF_WORKER_MAINTENANCE_SECONDS
+    requeue_stale(db)
+    purge_finished(db)
+    return True
+
+
+def work(stop: threading.Event, drain: bool = False) -> int:
+    processed = 0
+    db = SessionLocal()
+    try:
+        while not stop.is_set():
+            maintain(db)
+            job = claim_next(db)
+            if job is None:
+                if drain:
+                    break
+                stop.wait(PDF_WORKER_POLL_SECONDS)
+                continue
+            run_job(db, job)
+            processed += 1
+    finally:
+        db.close()
+        SessionLocal.remove()
+    return processed
+
+
+def run_workers(threads: int, drain: bool = False) -> int:
+    """Executa ``threads`` workers até ``drain`` esvaziar a fila ou Ctrl+C."""
+    stop = threading.Event()
+    totals = []
+
+    def target():
+        totals.append(work(stop, drain=drain))
+
+    pool = [threading.Thread(target=target, daemon=True) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    try:
+        for thread in pool:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in pool:
+            thread.join()
+    return sum(totals)
+
+
+def queue_metrics(db) -> dict:
+    now = datetime.utcnow()
+    counts = dict(
+        db.query(PdfJob.status, func.count(PdfJob.id)).group_by(PdfJob.status).all()
+    )
+    oldest_queued = (
+        db.query(func.min(PdfJob.created_at)).filter(PdfJob.status == "queued").scalar()
+    )
+    recent = (
+        db.query(PdfJob.created_at, PdfJob.started_at, PdfJob.finished_at)
+        .filter(PdfJob.status == "done")
+        .order_by(PdfJob.id.desc())
+        .limit(500)
+        .all()
+    )
+    waits = sorted((started - created).total_seconds() for created, started, _ in recent)
+    runs = sorted((finished - started).total_seconds() for _, started, finished in recent)
+
+    def percentile(values, pct):
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(len(values) * pct))]
+
+    return {
+        "depth": counts.get("queued", 0),
+        "by_status": counts,
+        "oldest_queued_seconds": (
+            (now - oldest_queued).total_seconds() if oldest_queued else None
+        ),
+        "wait_p50_seconds": percentile(waits, 0.5),
+        "wait_p95_seconds": percentile(waits, 0.95),
+        "render_p50_seconds": percentile(runs, 0.5),
+        "render_p95_seconds": percentile(runs, 0.95),
+    }
@@ -0,0 +1,237 @@
+"""Instrumentação opcional por requisição (``PROFILING=1``).
+
+Cada requisição acumula tempo total, consultas SQL (eventos da engine),
+renderização de templates (sinais do Flask) e geração de PDF (``timer``).
+Os números saem no cabeçalho ``Server-Timing`` e se somam às métricas do
+processo, expostas em ``/metrics`` no formato texto do Prometheus.
+
+Com ``PROFILE_SAMPLE_RATE`` > 0, uma fração das requisições roda sob
+cProfile; as que passam de ``PROFILE_SLOW_MS`` gravam um ``.prof`` em
+``PROFILE_DIR`` (abre com snakeviz, flameprof ou ``python -m pstats``).
+"""
+
+import cProfile
+import hmac
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import Response, abort, g, has_app_context, request
+from flask.signals import before_render_template, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.settings import (
+    METRICS_TOKEN,
+    PROFILE_DIR,
+    PROFILE_SAMPLE_RATE,
+    PROFILE_SLOW_MS,
+    PROFILING,
+)
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PARTS = ("db", "tpl", "pdf", "hash")
+
+_lock = threading.Lock()
+# Só um cProfile ativo por processo: enable() em paralelo falha no Python 3.12+
+_profiler_lock = threading.Lock()
+# endpoint -> {"count", "sum", "buckets", "db_queries", "db", "tpl", "pdf", "hash"}
+_metrics: dict[str, dict] = {}
+
+
+def _timings():
+    return g.get("_timings") if has_app_context() else None
+
+
+def add(part: str, seconds: float, queries: int = 0) -> None:
+    timings = _timings()
+    if timings is not None:
+        timings[part] += seconds
+        timings["db_queries"] += queries
+
+
+@contextmanager
+def timer(part: str):
+    """Soma a duração do bloco à parte ``part`` da requisição atual."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(part, time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    add("db", time.perf_counter() - start, queries=1)
+
+
+def _handle_error(context):
+    # Consulta que falhou não passa pelo after_cursor_execute
+    conn = context.connection
+    starts = conn.info.get("query_start") if conn is not None else None
+    if starts:
+        add("db", time.perf_counter() - starts.pop(), queries=1)
+
+
+def _before_render(sender, template, context, **extra):
+    if _timings() is not None:
+        g._template_starts.append(time.perf_counter())
+
+
+def _after_render(sender, template, context, **extra):
+    if _timings() is not None and g._template_starts:
+        add("tpl", time.perf_counter() - g._template_starts.pop())
+
+
+def _record(endpoint: str, timings: dict, elapsed: float) -> None:
+    with _lock:
+        entry = _metrics.setdefault(
+            endpoint,
+            {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS), "db_queries": 0}
+            | {part: 0.0 for part in PARTS},
+        )
+        entry["count"] += 1
+        entry["sum"] += elapsed
+        for index, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                entry["buckets"][index] += 1
+        entry["db_queries"] += timings["db_queries"]
+        for part in PARTS:
+            entry[part] += timings[part]
+
+
+def _stop_profiler(profiler) -> None:
+    profiler.disable()
+    _profiler_lock.release()
+
+
+def _dump_profile(profiler, elapsed: float) -> None:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    name = (request.endpoint or "none").replace(".", "_")
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    profiler.dump_stats(PROFILE_DIR / f"{stamp}-{name}-{elapsed * 1000:.0f}ms.prof")
+
+
+def render_metrics(db=None) -> str:
+    lines = [
+        "# HELP http_request_duration_seconds Duração das requisições por endpoint.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    with _lock:
+        snapshot = {endpoint: dict(entry) for endpoint, entry in _metrics.items()}
+    for endpoint, entry in sorted(snapshot.items()):
+        label = f'endpoint="{endpoint}"'
+        for bound, count in zip(BUCKETS, entry["buckets"]):
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{label},le="{bound}"}} {count}'
+            )
+        lines.append(
+            f'http_request_duration_seconds_bucket{{{label},le="+Inf"}} {entry["count"]}'
+        )
+        lines.append(f"http_request_duration_seconds_sum{{{label}}} {entry['sum']:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{label}}} {entry['count']}")
+
+    counters = (
+        ("db_queries_total", "Consultas SQL executadas.", "db_queries", "{}"),
+        ("db_query_seconds_total", "Tempo gasto em SQL.", "db", "{:.6f}"),
+        ("template_render_seconds_total", "Tempo em templates.", "tpl", "{:.6f}"),
+        ("pdf_render_seconds_total", "Tempo gerando PDFs.", "pdf", "{:.6f}"),
+        ("password_hash_seconds_total", "Tempo com hash de senhas.", "hash", "{:.6f}"),
+    )
+    for name, help_text, key, fmt in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for endpoint, entry in sorted(snapshot.items()):
+            lines.append(f'{name}{{endpoint="{endpoint}"}} {fmt.format(entry[key])}')
+
+    if db is not None:
+        from app import pdf_jobs
+
+        queue = pdf_jobs.queue_metrics(db)
+        lines.append("# HELP pdf_queue_jobs Tarefas de PDF por status.")
+        lines.append("# TYPE pdf_queue_jobs gauge")
+        for status, count in sorted(queue["by_status"].items()):
+            lines.append(f'pdf_queue_jobs{{status="{status}"}} {count}')
+        if queue["oldest_queued_seconds"] is not None:
+            lines.append("# TYPE pdf_queue_oldest_seconds gauge")
+            oldest = queue["oldest_queued_seconds"]
+            lines.append(f"pdf_queue_oldest_seconds {oldest:.3f}")
+    return "\n".join(lines) + "\n"
+
+
+def init_app(app) -> None:
+    if not PROFILING:
+        return
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    @app.before_request
+    def start_timing():
+        g._timings = {"db_queries": 0} | {part: 0.0 for part in PARTS}
+        g._template_starts = []
+        g._request_start = time.perf_counter()
+        if (
+            PROFILE_SAMPLE_RATE
+            and random.random() < PROFILE_SAMPLE_RATE
+            and _profiler_lock.acquire(blocking=False)
+        ):
+            # Sorteada com outra já sob perfil: segue sem cProfile
+            g._profiler = cProfile.Profile()
+            g._profiler.enable()
+
+    @app.after_request
+    def finish_timing(response):
+        timings = g.get("_timings")
+        if timings is None:
+            return response
+        elapsed = time.perf_counter() - g._request_start
+        profiler = g.pop("_profiler", None)
+        if profiler is not None:
+            _stop_profiler(profiler)
+            if elapsed * 1000 >= PROFILE_SLOW_MS:
+                _dump_profile(profiler, elapsed)
+
+        if request.endpoint != "metrics":
+            _record(request.endpoint or "none", timings, elapsed)
+        response.headers["Server-Timing"] = ", ".join(
+            [
+                f"app;dur={elapsed * 1000:.1f}",
+                f"db;dur={timings['db'] * 1000:.1f};"
+                f'desc="{timings["db_queries"]} queries"',
+                f"tpl;dur={timings['tpl'] * 1000:.1f}",
+                f"pdf;dur={timings['pdf'] * 1000:.1f}",
+                f"hash;dur={timings['hash'] * 1000:.1f}",
+            ]
+        )
+        return response
+
+    @app.teardown_request
+    def release_profiler(exception=None):
+        # Exceção propagada sem passar pelo after_request
+        profiler = g.pop("_profiler", None)
+        if profiler is not None:
+            _stop_profiler(profiler)
+
+    if not METRICS_TOKEN:
+        # Tempos por rota e contagem de consultas não ficam públicos
+        app.logger.warning("PROFILING=1 sem METRICS_TOKEN: /metrics não foi registrado")
+        return
+
+    @app.route("/metrics")
+    def metrics():
+        provided = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(
+            provided.encode("utf-8"), f"Bearer {METRICS_TOKEN}".encode("utf-8")
+        ):
+            abort(401)
+        return Response(render_metrics(g.db), mimetype="text/plain; version=0.0.4")
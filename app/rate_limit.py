@@ -0,0 +1,92 @@
+"""Limite de tentativas de login e cadastro (token bucket em memória).
+
+Cada chave (IP ou email) tem um balde com ``capacity`` fichas que volta a
+encher em ``period`` segundos; cada tentativa de login ou cadastro gasta uma
+ficha e logins corretos a devolvem.
+A checagem acontece antes de qualquer hash de senha, então tentativas
+recusadas custam quase nada. O estado é por
+processo: com vários workers, o limite efetivo é multiplicado por eles.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from app.settings import (
+    LOGIN_LIMIT_MAX_KEYS,
+    LOGIN_LIMIT_PER_EMAIL,
+    LOGIN_LIMIT_PER_IP,
+    LOGIN_RATE_LIMIT,
+)
+
+
+class TokenBucketLimiter:
+    def __init__(self, capacity: int, period: float, max_keys: int = LOGIN_LIMIT_MAX_KEYS):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.max_keys = max_keys
+        # chave -> (fichas, instante da última atualização)
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str) -> float:
+        """Consome uma ficha; devolve 0 ou os segundos até a próxima ficha."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / self.rate
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+            # Chaves antigas saem primeiro; um balde esquecido volta cheio
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return 0.0
+
+    def give_back(self, key: str) -> None:
+        with self._lock:
+            entry = self._buckets.get(key)
+            if entry is not None:
+                self._buckets[key] = (min(self.capacity, entry[0] + 1), entry[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+by_ip = TokenBucketLimiter(LOGIN_LIMIT_PER_IP, 60)
+by_email = TokenBucketLimiter(LOGIN_LIMIT_PER_EMAIL, 60)
+
+
+def take(ip: str | None, email: str | None = None) -> float:
+    """Reserva uma tentativa; devolve os segundos de espera (0 = liberada).
+
+    A ficha sai antes do hash, então tentativas simultâneas (ou recusadas
+    com pool cheio) também contam. O IP é checado primeiro: quem já estourou
+    o limite do IP não gasta as fichas do email.
+    """
+    if not LOGIN_RATE_LIMIT:
+        return 0.0
+    ip = ip or "-"
+    wait = by_ip.take(ip)
+    if wait or not email:
+        return wait
+    wait = by_email.take(email)
+    if wait:
+        by_ip.give_back(ip)
+    return wait
+
+
+def give_back(ip: str | None, email: str | None = None) -> None:
+    """Devolve a ficha de um login correto.
+
+    Assim integrações que mandam HTTP Basic em toda requisição não esbarram
+    no limite; só senhas erradas se acumulam.
+    """
+    if not LOGIN_RATE_LIMIT:
+        return
+    by_ip.give_back(ip or "-")
+    if email:
+        by_email.give_back(email)
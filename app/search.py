@@ -0,0 +1,152 @@
+from markupsafe import Markup, escape
+from sqlalchemy import Float, column, func, inspect, literal_column, or_, table
+
+from app.models.contract import Contract
+
+# user_id entra no índice para que o MATCH já restrinja ao dono (interseção
+# de listas no FTS) em vez de filtrar depois de casar contratos de todos
+FTS_COLUMNS = ("title", "service_description", "client_name", "provider_name", "user_id")
+FTS_WEIGHTS = (10.0, 1.0, 5.0, 5.0, 0.0)
+PG_DOCUMENT = (
+    "to_tsvector('portuguese', coalesce(title, '') || ' ' || "
+    "coalesce(service_description, '') || ' ' || coalesce(client_name, '') || ' ' || "
+    "coalesce(provider_name, ''))"
+)
+
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+contracts_fts = table("contracts_fts", column("rowid"))
+_fts_ready = {}
+
+RESULT_COLUMNS = (
+    Contract.id,
+    Contract.title,
+    Contract.client_name,
+    Contract.provider_name,
+    Contract.value,
+    Contract.status,
+    Contract.updated_at,
+)
+
+
+def _has_fts(db) -> bool:
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _fts_ready:
+        _fts_ready[key] = inspect(bind).has_table("contracts_fts")
+    return _fts_ready[key]
+
+
+def _fts5_query(terms: list[str], user_id: int) -> str:
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+    # Prefixo no último termo: busca enquanto o usuário digita
+    quoted[-1] += "*"
+    return f"user_id:{int(user_id)} AND ({' '.join(quoted)})"
+
+
+def _like_pattern(term: str) -> str:
+    """``%termo%`` com ``%``, ``_`` e a barra tratados como texto."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def highlight(value: str | None) -> Markup:
+    """Escapa o texto e troca os marcadores do banco por <mark>."""
+    escaped = str(escape(value or ""))
+    return Markup(
+        escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+    )
+
+
+def search_contracts(
+    db, user_id: int, q: str, filter_fn=None, page: int = 1, per_page: int = 50
+):
+    """Busca ranqueada. Retorna ``(resultados, tem_proxima_pagina)``.
+
+    Cada resultado é um dict com as colunas da listagem, ``rank`` e os
+    campos ``title_html``/``snippet_html`` já destacados.
+    """
+    terms = q.split()
+    if not terms:
+        return [], False
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and _has_fts(db):
+        rank = func.bm25(literal_column("contracts_fts"), *FTS_WEIGHTS).label("rank")
+        query = (
+            db.query(
+                *RESULT_COLUMNS,
+                rank,
+                func.highlight(
+                    literal_column("contracts_fts"), 0, _MARK_START, _MARK_END
+                ).label("title_hl"),
+                func.snippet(
+                    literal_column("contracts_fts"), 1, _MARK_START, _MARK_END, "…", 16
+                ).label("snippet_hl"),
+            )
+            .select_from(contracts_fts)
+            .join(Contract, Contract.id == contracts_fts.c.rowid)
+            .filter(
+                literal_column("contracts_fts").op("MATCH")(_fts5_query(terms, user_id))
+            )
+            .filter(Contract.user_id == user_id)
+            .order_by(rank)
+        )
+    elif dialect == "postgresql":
+        tsquery = func.plainto_tsquery("portuguese", q)
+        rank = func.ts_rank(literal_column(PG_DOCUMENT), tsquery).label("rank")
+        options = f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords=20, MinWords=8"
+        query = (
+            db.query(
+                *RESULT_COLUMNS,
+                rank,
+                func.ts_headline("portuguese", Contract.title, tsquery, options).label(
+                    "title_hl"
+                ),
+                func.ts_headline(
+                    "portuguese", Contract.service_description, tsquery, options
+                ).label("snippet_hl"),
+            )
+            .filter(Contract.user_id == user_id)
+            .filter(literal_column(PG_DOCUMENT).op("@@")(tsquery))
+            .order_by(rank.desc())
+        )
+    else:
+        conditions = [
+            or_(
+                *(
+                    column.ilike(_like_pattern(term), escape="\\")
+                    for column in (
+                        Contract.title,
+                        Contract.service_description,
+                        Contract.client_name,
+                        Contract.provider_name,
+                    )
+                )
+            )
+            for term in terms
+        ]
+        query = (
+            db.query(
+                *RESULT_COLUMNS,
+                literal_column("0", Float).label("rank"),
+                Contract.title.label("title_hl"),
+                func.substr(Contract.service_description, 1, 160).label("snippet_hl"),
+            )
+            .filter(Contract.user_id == user_id, *conditions)
+            .order_by(Contract.updated_at.desc(), Contract.id.desc())
+        )
+
+    if filter_fn is not None:
+        query = filter_fn(query)
+
+    page = max(page, 1)
+    rows = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+    results = []
+    for row in rows[:per_page]:
+        item = row._asdict()
+        item["title_html"] = highlight(item.pop("title_hl"))
+        item["snippet_html"] = highlight(item.pop("snippet_hl"))
+        results.append(item)
+    return results, len(rows) > per_page
@@ -0,0 +1,143 @@
+"""Dados sintéticos para desenvolvimento e benchmarks.
+
+Gera usuários com contratos realistas (textos em português, valores
+``Decimal``, vencimentos espalhados em torno de hoje) com inserts em lote.
+A mesma semente gera os mesmos dados, então benchmarks são comparáveis
+entre execuções.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, insert, select
+
+from app import contract_events, passwords, stats
+from app.models.contract import Contract
+from app.models.user import User
+from app.settings import IMPORT_BATCH_SIZE
+
+DEFAULT_PASSWORD = "senha123"
+
+FIRST_NAMES = (
+    "Ana", "Bruno", "Camila", "Diego", "Eduarda", "Felipe", "Gabriela", "Henrique",
+    "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Patrícia", "Rafael",
+)
+LAST_NAMES = (
+    "Almeida", "Barbosa", "Cardoso", "Costa", "Ferreira", "Gomes", "Lima", "Martins",
+    "Oliveira", "Pereira", "Ribeiro", "Rocha", "Santos", "Silva", "Souza", "Teixeira",
+)
+COMPANY_WORDS = (
+    "Alfa", "Aurora", "Boa Vista", "Horizonte", "Ipê", "Jequitibá", "Litoral", "Nova Era",
+    "Pantanal", "Planalto", "Serra Azul", "Sol Nascente", "Tropical", "Vale Verde",
+)
+COMPANY_SUFFIXES = ("Ltda.", "S.A.", "ME", "EIRELI", "Comércio e Serviços Ltda.")
+SERVICES = (
+    ("Manutenção preventiva de ar-condicionado", "visitas mensais, limpeza de filtros e relatório técnico"),
+    ("Desenvolvimento de site institucional", "layout responsivo, hospedagem por 12 meses e treinamento da equipe"),
+    ("Consultoria contábil", "escrituração fiscal, folha de pagamento e apuração de impostos"),
+    ("Limpeza de escritório", "limpeza diária de áreas comuns e higienização semanal de banheiros"),
+    ("Reforma de fachada", "pintura, troca de revestimento cerâmico e impermeabilização"),
+    ("Suporte de TI", "atendimento remoto em horário comercial e visitas técnicas sob demanda"),
+    ("Fotografia de evento", "cobertura de 6 horas, 300 fotos editadas e álbum digital"),
+    ("Gestão de redes sociais", "12 publicações por mês, relatório de métricas e atendimento a comentários"),
+    ("Transporte de mercadorias", "coleta no depósito e entrega em até 48 horas na região metropolitana"),
+    ("Aulas de inglês corporativo", "duas aulas semanais de 1 hora para turmas de até 8 pessoas"),
+)
+PAYMENT_TERMS = (
+    "À vista via PIX",
+    "30 dias após a emissão da nota fiscal",
+    "50% na assinatura e 50% na entrega",
+    "Parcelado em 3x no boleto",
+    "Mensal, todo dia 10",
+    "Cartão de crédito em até 6x",
+)
+CITIES = (
+    "São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Porto Alegre",
+    "Salvador", "Recife", "Fortaleza", "Goiânia", "Florianópolis", "Campinas", "Manaus",
+)
+STATUSES = (("rascunho", 5), ("assinado", 4), ("cancelado", 1))
+
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _company(rng: random.Random) -> str:
+    return f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}"
+
+
+def fake_contract(rng: random.Random, today: date) -> dict:
+    service, scope = rng.choice(SERVICES)
+    client = _company(rng) if rng.random() < 0.7 else _person(rng)
+    status = rng.choices([name for name, _ in STATUSES], [weight for _, weight in STATUSES])[0]
+    due_date = today + timedelta(days=rng.randint(-180, 365)) if rng.random() < 0.8 else None
+    return {
+        "title": f"{service} - {client}",
+        "provider_name": _company(rng),
+        "client_name": client,
+        "service_description": (
+            f"{service} para {client}, incluindo {scope}. "
+            f"Vigência de {rng.choice((3, 6, 12, 24))} meses."
+        ),
+        "value": Decimal(rng.randint(15_000, 5_000_000)) / 100,
+        "payment_terms": rng.choice(PAYMENT_TERMS),
+        "city": rng.choice(CITIES),
+        "status": status,
+        "due_date": due_date,
+    }
+
+
+def populate(
+    db,
+    users: int,
+    contracts_per_user: int,
+    seed: int = 42,
+    password: str = DEFAULT_PASSWORD,
+    history: bool = True,
+) -> list[str]:
+    """Cria ``users`` usuários com ``contracts_per_user`` contratos cada.
+
+    Todos recebem a mesma senha (o hash é calculado uma vez). Os emails
+    continuam a numeração existente (``usuarioN@exemplo.com.br``), então
+    rodar de novo acrescenta dados. Devolve os emails criados.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    now = datetime.utcnow()
+    password_hash = passwords.hash_password(password)
+    first = (db.execute(select(func.max(User.id))).scalar() or 0) + 1
+    emails = []
+    contracts_table = Contract.__table__
+
+    for number in range(first, first + users):
+        email = f"usuario{number}@exemplo.com.br"
+        user_id = db.execute(
+            insert(User.__table__).returning(User.__table__.c.id),
+            {
+                "name": _person(rng),
+                "email": email,
+                "password_hash": password_hash,
+                "created_at": now,
+            },
+        ).scalar_one()
+        for start in range(0, contracts_per_user, IMPORT_BATCH_SIZE):
+            count = min(IMPORT_BATCH_SIZE, contracts_per_user - start)
+            rows = []
+            for _ in range(count):
+                row = fake_contract(rng, today)
+                created = now - timedelta(minutes=rng.randint(0, 525_600))
+                row.update(user_id=user_id, created_at=created, updated_at=created)
+                rows.append(row)
+            ids = db.execute(
+                insert(contracts_table).returning(
+                    contracts_table.c.id, sort_by_parameter_order=True
+                ),
+                rows,
+            ).scalars().all()
+            if history:
+                contract_events.record_created_many(db, user_id, zip(ids, rows))
+        stats.rebuild(db, user_id)
+        db.commit()
+        emails.append(email)
+    return emails
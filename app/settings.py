@@ -20,6 +20,117 @@ def resolve_instance_dir() -> Path:
 INSTANCE_DIR = resolve_instance_dir()
 DEFAULT_DB_PATH = INSTANCE_DIR / "app.db"
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH}")
+# Réplica de leitura opcional; rotas marcadas com @read_only consultam aqui
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL") or None
+# Após uma escrita, o usuário lê do primário por este tempo (atraso da réplica)
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+# Marcas de escrita recente por usuário; compartilhe entre servidores se houver vários
+REPLICA_STICKY_DIR = Path(os.getenv("REPLICA_STICKY_DIR") or INSTANCE_DIR / "primary_until")
+
+# Partida a frio (serverless): pula o create_all quando schema_migrations já
+# está na última versão e carrega templates do cache de bytecode do Jinja
+SCHEMA_FAST_STARTUP = os.getenv("SCHEMA_FAST_STARTUP", "1") == "1"
+JINJA_BYTECODE_CACHE = os.getenv("JINJA_BYTECODE_CACHE", "1") == "1"
+# Dentro do pacote para que o cache gerado no build (flask precompile-templates)
+# vá junto no deploy; em disco somente leitura o cache só é lido
+JINJA_CACHE_DIR = Path(os.getenv("JINJA_CACHE_DIR") or BASE_DIR / "app" / "views" / ".jinja_cache")
 
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-me")
 ECHO_SQL = os.getenv("ECHO_SQL", "0") == "1"
+
+# Compressão e ETag fraco para HTML/JSON; estáticos com URL versionada
+HTTP_CACHE = os.getenv("HTTP_CACHE", "1") == "1"
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", str(365 * 24 * 3600)))
+
+# Instrumentação por requisição: Server-Timing, /metrics e perfis de requisições lentas
+PROFILING = os.getenv("PROFILING", "0") == "1"
+# Sem token o /metrics não é registrado
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "500"))
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR") or INSTANCE_DIR / "profiles")
+
+PDF_CACHE_DIR = Path(os.getenv("PDF_CACHE_DIR") or INSTANCE_DIR / "pdf_cache")
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Cache de linhas renderizadas (listagem/dashboard): memory, file, redis ou off
+FRAGMENT_CACHE = os.getenv("FRAGMENT_CACHE", "memory")
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", "20000"))
+# Backend file: além do número de entradas, limite de bytes em disco
+FRAGMENT_CACHE_MAX_BYTES = int(os.getenv("FRAGMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+FRAGMENT_CACHE_DIR = Path(os.getenv("FRAGMENT_CACHE_DIR") or INSTANCE_DIR / "fragments")
+FRAGMENT_CACHE_REDIS_URL = os.getenv("FRAGMENT_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+CONTRACTS_PAGE_SIZE = int(os.getenv("CONTRACTS_PAGE_SIZE", "50"))
+# Histórico append-only de alterações (tabela contract_events)
+CONTRACT_HISTORY = os.getenv("CONTRACT_HISTORY", "1") == "1"
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "100"))
+CONTRACT_STATS_CACHE = os.getenv("CONTRACT_STATS_CACHE", "1") == "1"
+DASHBOARD_UPCOMING_DAYS = int(os.getenv("DASHBOARD_UPCOMING_DAYS", "30"))
+
+# Lembretes de vencimento (flask due-reminders, uma passada por noite)
+DUE_REMINDER_DAYS_AHEAD = int(os.getenv("DUE_REMINDER_DAYS_AHEAD", "7"))
+# Primeira execução: também avisa vencidos até N dias atrás
+DUE_REMINDER_BACKFILL_DAYS = int(os.getenv("DUE_REMINDER_BACKFILL_DAYS", "30"))
+DUE_REMINDER_BATCH_SIZE = int(os.getenv("DUE_REMINDER_BATCH_SIZE", "5000"))
+DUE_REMINDER_HOUR = int(os.getenv("DUE_REMINDER_HOUR", "2"))
+# Feed iCalendar/JSON: vencimentos de N dias atrás até M dias à frente
+DUE_FEED_DAYS_BEHIND = int(os.getenv("DUE_FEED_DAYS_BEHIND", "30"))
+DUE_FEED_DAYS_AHEAD = int(os.getenv("DUE_FEED_DAYS_AHEAD", "365"))
+DUE_FEED_MAX_EVENTS = int(os.getenv("DUE_FEED_MAX_EVENTS", "2000"))
+
+# 0 desativa o pool de processos e renderiza no próprio worker
+PDF_EXPORT_WORKERS = int(os.getenv("PDF_EXPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_EXPORT_MAX_CONTRACTS = int(os.getenv("PDF_EXPORT_MAX_CONTRACTS", "1000"))
+# Ids aceitos por exclusão/alteração de status em lote
+BULK_MAX_CONTRACTS = int(os.getenv("BULK_MAX_CONTRACTS", "1000"))
+# Renderiza o PDF avulso no pool de processos (libera o GIL em servidores com threads)
+PDF_RENDER_OFFLOAD = os.getenv("PDF_RENDER_OFFLOAD", "0") == "1"
+# Requisições simultâneas atendidas pela entrada ASGI (uma thread cada)
+ASGI_MAX_THREADS = int(os.getenv("ASGI_MAX_THREADS", "32"))
+
+# Renderização assíncrona: a rota enfileira e um worker (flask pdf-worker) gera o PDF
+PDF_ASYNC = os.getenv("PDF_ASYNC", "0") == "1"
+PDF_JOB_MAX_ATTEMPTS = int(os.getenv("PDF_JOB_MAX_ATTEMPTS", "3"))
+PDF_JOB_STALE_SECONDS = int(os.getenv("PDF_JOB_STALE_SECONDS", "300"))
+PDF_JOB_RETENTION_HOURS = int(os.getenv("PDF_JOB_RETENTION_HOURS", "24"))
+PDF_WORKER_POLL_SECONDS = float(os.getenv("PDF_WORKER_POLL_SECONDS", "1.0"))
+# Nova tentativa após falha: PDF_JOB_RETRY_SECONDS * 2^(tentativas - 1)
+PDF_JOB_RETRY_SECONDS = float(os.getenv("PDF_JOB_RETRY_SECONDS", "10"))
+# Intervalo entre as rodadas de requeue_stale/purge_finished nos workers
+PDF_WORKER_MAINTENANCE_SECONDS = float(os.getenv("PDF_WORKER_MAINTENANCE_SECONDS", "60"))
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+
+# Hash de senhas (formato do werkzeug); hashes em outro formato são refeitos no login
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+# Hashes simultâneos por processo e quantos podem esperar antes de responder 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "8"))
+# Tentativas de login/cadastro por minuto (token bucket em memória, por processo)
+LOGIN_RATE_LIMIT = os.getenv("LOGIN_RATE_LIMIT", "1") == "1"
+LOGIN_LIMIT_PER_IP = int(os.getenv("LOGIN_LIMIT_PER_IP", "30"))
+LOGIN_LIMIT_PER_EMAIL = int(os.getenv("LOGIN_LIMIT_PER_EMAIL", "10"))
+LOGIN_LIMIT_MAX_KEYS = int(os.getenv("LOGIN_LIMIT_MAX_KEYS", "100000"))
+
+# Cache de identidade (nome/email) do usuário logado, por processo
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+# Pool para bancos cliente/servidor (Postgres etc.)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+# Ajustes do SQLite aplicados a cada conexão
+SQLITE_WAL = os.getenv("SQLITE_WAL", "1") == "1"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+# O SQLite só aplica chaves estrangeiras (e ON DELETE CASCADE) com este pragma
+SQLITE_FOREIGN_KEYS = os.getenv("SQLITE_FOREIGN_KEYS", "1") == "1"
@@ -0,0 +1,168 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import and_, case, delete, func, update
+
+from app.models.contract import Contract
+from app.models.contract_stats import ContractStats
+from app.settings import CONTRACT_STATS_CACHE, DASHBOARD_UPCOMING_DAYS
+
+
+def _upcoming_window() -> tuple[date, date]:
+    today = date.today()
+    return today, today + timedelta(days=DASHBOARD_UPCOMING_DAYS)
+
+
+def _aggregate(db, user_id: int, with_upcoming: bool = False):
+    columns = [
+        Contract.status,
+        func.count(Contract.id),
+        func.coalesce(func.sum(Contract.value), 0),
+    ]
+    if with_upcoming:
+        start, end = _upcoming_window()
+        columns.append(
+            func.sum(
+                case((and_(Contract.due_date >= start, Contract.due_date <= end), 1), else_=0)
+            )
+        )
+    return (
+        db.query(*columns)
+        .filter(Contract.user_id == user_id)
+        .group_by(Contract.status)
+        .all()
+    )
+
+
+def _count_upcoming(db, user_id: int) -> int:
+    start, end = _upcoming_window()
+    return (
+        db.query(func.count(Contract.id))
+        .filter(
+            Contract.user_id == user_id,
+            Contract.due_date >= start,
+            Contract.due_date <= end,
+        )
+        .scalar()
+    )
+
+
+def rebuild(db, user_id: int) -> None:
+    if not CONTRACT_STATS_CACHE:
+        return
+    db.execute(delete(ContractStats).where(ContractStats.user_id == user_id))
+    for status, count, total in _aggregate(db, user_id):
+        db.add(
+            ContractStats(
+                user_id=user_id,
+                status=status,
+                contracts_count=count,
+                value_total=Decimal(str(total)),
+            )
+        )
+
+
+def _has_cache(db, user_id: int) -> bool:
+    return (
+        db.query(ContractStats.user_id)
+        .filter(ContractStats.user_id == user_id)
+        .first()
+        is not None
+    )
+
+
+def _bump(db, user_id: int, status: str, count: int, value: Decimal) -> None:
+    """Soma ao contador numa única instrução (upsert).
+
+    UPDATE seguido de INSERT quando nada casou dá IntegrityError se duas
+    escritas criam o mesmo ``(user_id, status)`` ao mesmo tempo.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        _bump_without_upsert(db, user_id, status, count, value)
+        return
+
+    statement = insert(ContractStats).values(
+        user_id=user_id, status=status, contracts_count=count, value_total=value
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ContractStats.user_id, ContractStats.status],
+            set_={
+                "contracts_count": ContractStats.contracts_count
+                + statement.excluded.contracts_count,
+                "value_total": ContractStats.value_total + statement.excluded.value_total,
+            },
+        )
+    )
+
+
+def _bump_without_upsert(db, user_id: int, status: str, count: int, value: Decimal) -> None:
+    result = db.execute(
+        update(ContractStats)
+        .where(ContractStats.user_id == user_id, ContractStats.status == status)
+        .values(
+            contracts_count=ContractStats.contracts_count + count,
+            value_total=ContractStats.value_total + value,
+        )
+    )
+    if result.rowcount == 0:
+        db.add(
+            ContractStats(
+                user_id=user_id, status=status, contracts_count=count, value_total=value
+            )
+        )
+        db.flush()
+
+
+def record_change(db, user_id: int, before=None, after=None) -> None:
+    """Atualiza os contadores na mesma transação da escrita.
+
+    ``before``/``after`` são tuplas ``(status, value)`` do contrato antes e
+    depois da alteração (``None`` para criação/exclusão).
+    """
+    if not CONTRACT_STATS_CACHE or before == after:
+        return
+    if not _has_cache(db, user_id):
+        db.flush()
+        rebuild(db, user_id)
+        return
+    if before is not None:
+        _bump(db, user_id, before[0], -1, -(before[1] or Decimal("0")))
+    if after is not None:
+        _bump(db, user_id, after[0], 1, after[1] or Decimal("0"))
+
+
+def dashboard_stats(db, user_id: int) -> dict:
+    """Só leitura: sem contadores para o usuário, agrega direto em ``contracts``.
+
+    Os contadores vêm da migração 10 ou da próxima escrita (``record_change``).
+    """
+    if CONTRACT_STATS_CACHE and _has_cache(db, user_id):
+        rows = (
+            db.query(
+                ContractStats.status,
+                ContractStats.contracts_count,
+                ContractStats.value_total,
+            )
+            .filter(ContractStats.user_id == user_id)
+            .all()
+        )
+        upcoming = _count_upcoming(db, user_id)
+    else:
+        aggregated = _aggregate(db, user_id, with_upcoming=True)
+        rows = [(status, count, total) for status, count, total, _ in aggregated]
+        upcoming = sum(row[3] or 0 for row in aggregated)
+
+    status_counts = {status: count for status, count, _ in rows if count}
+    return {
+        "status_counts": status_counts,
+        "total_contracts": sum(status_counts.values()),
+        "value_total": sum((Decimal(str(total)) for _, _, total in rows), Decimal("0")),
+        "upcoming_due": upcoming,
+        "upcoming_days": DASHBOARD_UPCOMING_DAYS,
+    }
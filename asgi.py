@@ -0,0 +1,115 @@
+"""Entrada ASGI opcional: ``uvicorn asgi:app --workers 2``.
+
+Requer um servidor ASGI e o adaptador WSGI ``a2wsgi``
+(``pip install uvicorn a2wsgi``). O Flask continua síncrono: cada requisição
+roda em um pool de até ``ASGI_MAX_THREADS`` threads por worker, enquanto o
+loop do servidor cuida das conexões lentas e keep-alive. Com mais de um
+núcleo o PDF avulso é gerado no pool de processos para não segurar o GIL
+dessas threads.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+
+from a2wsgi import WSGIMiddleware
+
+if (os.cpu_count() or 1) > 1:
+    # Com um único núcleo o pool de processos só acrescenta troca de contexto
+    os.environ.setdefault("PDF_RENDER_OFFLOAD", "1")
+
+from app import create_app, pdf_export  # noqa: E402
+from app.db import engine, replica_engine  # noqa: E402
+from app.settings import ASGI_MAX_THREADS  # noqa: E402
+
+# Sinalizado quando o cliente desconecta; o a2wsgi copia o contexto para a
+# thread que roda o Flask
+_disconnected = contextvars.ContextVar("disconnected")
+
+
+def _stop_on_disconnect(wsgi_app):
+    """Interrompe respostas em streaming (ZIP, NDJSON) quando o cliente sai."""
+
+    def app(environ, start_response):
+        result = wsgi_app(environ, start_response)
+        disconnected = _disconnected.get(None)
+        if disconnected is None:
+            return result
+        return _until(disconnected, result)
+
+    return app
+
+
+def _until(disconnected: threading.Event, result):
+    try:
+        for chunk in result:
+            if disconnected.is_set():
+                break
+            yield chunk
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+
+
+class AsgiApp:
+    """App WSGI servido por ASGI, com lifespan e aviso de desconexão."""
+
+    def __init__(self, wsgi_app, max_threads: int):
+        self._wsgi = WSGIMiddleware(_stop_on_disconnect(wsgi_app), workers=max_threads)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            await self._wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._wsgi.executor.shutdown(wait=True)
+                pdf_export.shutdown()
+                engine.dispose()
+                if replica_engine is not None:
+                    replica_engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        disconnected = threading.Event()
+        watcher = None
+
+        async def watch():
+            # Depois que a resposta começa o Flask não lê mais o corpo: o
+            # próximo evento só pode ser a desconexão
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        async def receive_request():
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            return message
+
+        async def send_response(message):
+            nonlocal watcher
+            if message["type"] == "http.response.start":
+                watcher = asyncio.ensure_future(watch())
+            await send(message)
+
+        token = _disconnected.set(disconnected)
+        try:
+            await self._wsgi(scope, receive_request, send_response)
+        finally:
+            _disconnected.reset(token)
+            if watcher is not None:
+                watcher.cancel()
+
+
+app = AsgiApp(create_app(), ASGI_MAX_THREADS)
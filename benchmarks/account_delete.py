@@ -0,0 +1,160 @@
+"""Exclusão de conta e exclusão em lote: ORM linha a linha vs set-based.
+
+Uso: python benchmarks/account_delete.py [--contratos 100000] [--lote 1000]
+
+Cria três contas com N contratos (e um evento de criação por contrato) e mede:
+- ``conta ORM``: ``db.delete(user)`` com a coleção carregada, como o cascade
+  do ORM fazia (um DELETE por contrato);
+- ``conta set-based``: ``account_service.delete_account`` (um DELETE por tabela);
+- ``lote ORM`` / ``lote set-based``: ``--lote`` contratos da terceira conta via
+  ``delete_contract`` um a um e via ``contract_service.bulk_delete``.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-delete-")
+os.environ.pop("DATABASE_URL", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, func, insert, select  # noqa: E402
+
+from app import account_service, contract_events, contract_service  # noqa: E402
+from app.db import SessionLocal, engine, init_db  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+USERS = 3
+
+
+def seed(contratos: int) -> None:
+    init_db()
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {
+                    "name": f"U{n}",
+                    "email": f"u{n}@bench.local",
+                    "password_hash": "x",
+                    "created_at": now,
+                }
+                for n in range(1, USERS + 1)
+            ],
+        )
+    for user_id in range(1, USERS + 1):
+        for start in range(0, contratos, 20_000):
+            db = SessionLocal()
+            values = {
+                "provider_name": "Prestador",
+                "client_name": "Cliente",
+                "service_description": "Serviço",
+                "value": Decimal("1000.00"),
+                "payment_terms": "30 dias",
+                "city": "Curitiba",
+                "status": "rascunho",
+            }
+            rows = [
+                {**values, "title": f"Contrato {n}", "user_id": user_id}
+                for n in range(start, min(start + 20_000, contratos))
+            ]
+            ids = db.execute(
+                insert(Contract.__table__).returning(
+                    Contract.__table__.c.id, sort_by_parameter_order=True
+                ),
+                [{**row, "created_at": now, "updated_at": now} for row in rows],
+            ).scalars()
+            contract_events.record_created_many(db, user_id, zip(ids, rows))
+            db.commit()
+            db.close()
+            SessionLocal.remove()
+
+
+class Counter:
+    def __init__(self):
+        self.statements = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # executemany conta uma vez por linha: é o trabalho que o banco faz
+        self.statements += len(parameters) if executemany else 1
+
+    def stop(self) -> int:
+        event.remove(engine, "before_cursor_execute", self._on_execute)
+        return self.statements
+
+
+def run(nome: str, operacao) -> None:
+    db = SessionLocal()
+    counter = Counter()
+    inicio = time.perf_counter()
+    total = operacao(db)
+    elapsed = time.perf_counter() - inicio
+    statements = counter.stop()
+    db.close()
+    SessionLocal.remove()
+    print(f"{nome:16s} {total:7d} contratos {elapsed:8.2f} s {statements:8d} execuções SQL")
+
+
+def conta_orm(db) -> int:
+    user = db.get(User, 1)
+    total = len(user.contracts)  # carrega a coleção: o ORM apaga um a um
+    db.delete(user)
+    db.commit()
+    return total
+
+
+def conta_set_based(db) -> int:
+    return account_service.delete_account(db, 2)
+
+
+def lote_ids(db, tamanho: int) -> list[int]:
+    return list(
+        db.execute(
+            select(Contract.id).where(Contract.user_id == 3).order_by(Contract.id).limit(tamanho)
+        ).scalars()
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contratos", type=int, default=100_000)
+    parser.add_argument("--lote", type=int, default=1000)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    seed(args.contratos)
+    print(
+        f"{USERS} contas x {args.contratos} contratos inseridos em "
+        f"{time.perf_counter() - inicio:.1f} s"
+    )
+
+    run("conta ORM", conta_orm)
+    run("conta set-based", conta_set_based)
+
+    def lote_orm(db):
+        ids = lote_ids(db, args.lote)
+        for contract_id in ids:
+            contract_service.delete_contract(db, db.get(Contract, contract_id))
+        return len(ids)
+
+    def lote_set_based(db):
+        return contract_service.bulk_delete(db, 3, lote_ids(db, args.lote))
+
+    run("lote ORM", lote_orm)
+    run("lote set-based", lote_set_based)
+
+    with engine.connect() as conn:
+        restantes = conn.execute(select(func.count(Contract.id))).scalar()
+    print(f"contratos restantes: {restantes}")
+
+
+if __name__ == "__main__":
+    main()
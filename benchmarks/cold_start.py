@@ -0,0 +1,149 @@
+"""Partida a frio: tempo de import/create_app e da primeira requisição.
+
+Uso: python benchmarks/cold_start.py [--repeticoes 10] [--modulos 15]
+
+Cada medida roda em um processo Python novo, como uma instância serverless
+recém-criada, contra um banco já migrado. Compara:
+- ``antes``: ``SCHEMA_FAST_STARTUP=0``, ``JINJA_BYTECODE_CACHE=0`` e o fpdf
+  importado junto com o app (como era antes do import tardio);
+- ``rápido``: configuração padrão, com o cache gerado por
+  ``flask precompile-templates``.
+
+Mostra a mediana de ``import main`` (inclui ``create_app``), quantas
+consultas SQL a partida faz, o tempo do primeiro ``GET /login`` e da
+primeira listagem de contratos, e os módulos mais caros segundo
+``python -X importtime``.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+INSTANCE_DIR = tempfile.mkdtemp(prefix="bench-cold-")
+
+# Roda no processo filho; imprime os tempos em JSON na última linha
+CHILD = """
+import json, os, time
+inicio = time.perf_counter()
+if os.environ.get("BENCH_EAGER_FPDF"):
+    import fpdf
+from sqlalchemy import event
+from app.db import engine
+consultas = [0]
+def contar(*args):
+    consultas[0] += 1
+event.listen(engine, "before_cursor_execute", contar)
+import main
+tempos = {"import_main": time.perf_counter() - inicio, "consultas": consultas[0]}
+client = main.app.test_client()
+inicio = time.perf_counter()
+assert client.get("/login").status_code == 200
+tempos["primeiro_get"] = time.perf_counter() - inicio
+client.post("/login", data={"email": "bench@exemplo.com.br", "password": "senha123"})
+inicio = time.perf_counter()
+assert client.get("/contratos/").status_code == 200
+tempos["primeira_listagem"] = time.perf_counter() - inicio
+import sys
+tempos["fpdf_carregado"] = "fpdf" in sys.modules
+print(json.dumps(tempos))
+"""
+
+MODOS = {
+    "antes": {"SCHEMA_FAST_STARTUP": "0", "JINJA_BYTECODE_CACHE": "0", "BENCH_EAGER_FPDF": "1"},
+    "rápido": {},
+}
+
+
+def environment(extra: dict) -> dict:
+    env = {**os.environ, "INSTANCE_DIR": INSTANCE_DIR, "JINJA_CACHE_DIR": f"{INSTANCE_DIR}/jinja"}
+    env.pop("DATABASE_URL", None)
+    env.update(extra)
+    return env
+
+
+def setup() -> None:
+    """Cria e migra o banco, um usuário com contratos e o cache de templates."""
+    code = (
+        "from app import create_app\n"
+        "from app.db import SessionLocal\n"
+        "from app.jinja_cache import precompile\n"
+        "from app.seed import populate\n"
+        "app = create_app()\n"
+        "db = SessionLocal()\n"
+        "populate(db, 1, 200)\n"
+        "db.execute(__import__('sqlalchemy').text("
+        "\"UPDATE users SET email = 'bench@exemplo.com.br'\"))\n"
+        "db.commit()\n"
+        "precompile(app)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=environment({}), check=True)
+
+
+def run_child(extra: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=environment(extra),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_times(extra: dict, limite: int) -> list[tuple[int, str]]:
+    """(microssegundos acumulados, módulo) de ``-X importtime``, maiores primeiro."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=ROOT,
+        env=environment(extra),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    linhas = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Só módulos de primeiro nível da árvore (menos indentação)
+        if len(name) - len(name.lstrip()) <= 3:
+            linhas.append((int(cumulative), name.strip()))
+    return sorted(linhas, reverse=True)[:limite]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    parser.add_argument("--modulos", type=int, default=15)
+    args = parser.parse_args()
+
+    setup()
+    for nome, extra in MODOS.items():
+        amostras = [run_child(extra) for _ in range(args.repeticoes)]
+        mediana = {
+            chave: statistics.median(amostra[chave] for amostra in amostras) * 1000
+            for chave in ("import_main", "primeiro_get", "primeira_listagem")
+        }
+        print(
+            f"{nome:7s} import main {mediana['import_main']:7.1f} ms "
+            f"({amostras[0]['consultas']} consultas)  "
+            f"primeiro GET {mediana['primeiro_get']:6.1f} ms  "
+            f"primeira listagem {mediana['primeira_listagem']:6.1f} ms  "
+            f"fpdf carregado: {'sim' if amostras[0]['fpdf_carregado'] else 'não'}"
+        )
+
+    for nome, extra in MODOS.items():
+        print(f"\n-X importtime ({nome}), acumulado:")
+        for micros, modulo in import_times(extra, args.modulos):
+            print(f"  {micros / 1000:8.1f} ms  {modulo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Custo do histórico de contratos na escrita e na leitura.
+
+Uso: python benchmarks/contract_events.py [--eventos 1000000] [--contratos 10000]
+     [--edicoes 3000]
+
+Preenche ``contract_events`` com N eventos, mede edições por segundo via
+``contract_service.update_contract`` com e sem histórico e a latência de
+uma página do histórico de um contrato.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-events-")
+os.environ.pop("DATABASE_URL", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import contract_events, contract_service  # noqa: E402
+from app.db import SessionLocal, engine, init_db  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.contract_event import ContractEvent  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+STATUS = ("rascunho", "assinado", "cancelado")
+
+
+def seed(contratos: int, eventos: int) -> None:
+    init_db()
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [{"name": "U", "email": "u@bench.local", "password_hash": "x", "created_at": now}],
+        )
+        conn.execute(
+            insert(Contract.__table__),
+            [
+                {
+                    "title": f"Contrato {n}",
+                    "provider_name": "Prestador",
+                    "client_name": "Cliente",
+                    "service_description": "Serviço",
+                    "value": Decimal("1000.00"),
+                    "payment_terms": "30 dias",
+                    "city": "Curitiba",
+                    "status": "rascunho",
+                    "user_id": 1,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for n in range(contratos)
+            ],
+        )
+    rng = random.Random(3)
+    changes = '{"status":["rascunho","assinado"]}'
+    for start in range(0, eventos, 50_000):
+        with engine.begin() as conn:
+            conn.execute(
+                insert(ContractEvent.__table__),
+                [
+                    {
+                        "contract_id": rng.randrange(1, contratos + 1),
+                        "user_id": 1,
+                        "kind": "status",
+                        "changes": changes,
+                        "created_at": now,
+                    }
+                    for _ in range(min(50_000, eventos - start))
+                ],
+            )
+
+
+def editar(contratos: int, edicoes: int) -> float:
+    rng = random.Random(5)
+    inicio = time.perf_counter()
+    for n in range(edicoes):
+        db = SessionLocal()
+        contract = db.get(Contract, rng.randrange(1, contratos + 1))
+        contract_service.update_contract(
+            db, contract, {"status": STATUS[(STATUS.index(contract.status) + 1) % 3]}
+        )
+        db.close()
+        SessionLocal.remove()
+    return edicoes / (time.perf_counter() - inicio)
+
+
+def ler_paginas(contratos: int, repeticoes: int = 200) -> float:
+    rng = random.Random(9)
+    db = SessionLocal()
+    amostras = []
+    for _ in range(repeticoes):
+        contract_id = rng.randrange(1, contratos + 1)
+        inicio = time.perf_counter()
+        db.query(ContractEvent.id, ContractEvent.kind, ContractEvent.changes).filter(
+            ContractEvent.contract_id == contract_id, ContractEvent.id > 0
+        ).order_by(ContractEvent.id).limit(101).all()
+        amostras.append((time.perf_counter() - inicio) * 1000)
+    db.close()
+    return statistics.median(amostras)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--eventos", type=int, default=1_000_000)
+    parser.add_argument("--contratos", type=int, default=10_000)
+    parser.add_argument("--edicoes", type=int, default=3000)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    seed(args.contratos, args.eventos)
+    print(f"{args.eventos} eventos inseridos em {time.perf_counter() - inicio:.1f} s")
+
+    # Alterna as rodadas para que aquecimento de cache não favoreça nenhum lado
+    taxas = {False: [], True: []}
+    for historico in (False, True, False, True):
+        contract_events.CONTRACT_HISTORY = historico
+        taxas[historico].append(editar(args.contratos, args.edicoes // 2))
+    sem, com = statistics.mean(taxas[False]), statistics.mean(taxas[True])
+    print(f"edições/s sem histórico {sem:8.0f} | com histórico {com:8.0f}")
+    print(f"página de 100 eventos: {ler_paginas(args.contratos):.2f} ms (mediana)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Amplificação de escrita ao salvar um contrato.
+
+Uso: python benchmarks/contract_update.py [--contratos 2000] [--descricao 16000]
+
+Compara, para uma edição que muda só o status:
+- ``linha inteira``: UPDATE regravando todas as colunas do formulário;
+- ``service``: ``contract_service.update_contract`` (só colunas alteradas);
+- ``sem mudança``: o mesmo formulário salvo de novo sem alterações.
+
+Mede bytes de parâmetros enviados ao banco e bytes acrescentados ao WAL do
+SQLite por salvamento.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-update-")
+os.environ.pop("DATABASE_URL", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, insert, text, update  # noqa: E402
+
+from app import contract_service  # noqa: E402
+from app.db import SessionLocal, engine, init_db  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.settings import INSTANCE_DIR  # noqa: E402
+
+STATUS = ("rascunho", "assinado", "cancelado")
+FORM_FIELDS = (
+    "title",
+    "provider_name",
+    "client_name",
+    "service_description",
+    "value",
+    "payment_terms",
+    "city",
+    "status",
+    "due_date",
+)
+
+
+def seed(contratos: int, descricao: int) -> None:
+    init_db()
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [{"name": "U", "email": "u@bench.local", "password_hash": "x", "created_at": now}],
+        )
+        conn.execute(
+            insert(Contract.__table__),
+            [
+                {
+                    "title": f"Contrato {n}",
+                    "provider_name": "Prestador",
+                    "client_name": "Cliente",
+                    "service_description": ("Escopo detalhado. " * descricao)[:descricao],
+                    "value": Decimal("1000.00"),
+                    "payment_terms": "30 dias",
+                    "city": "Curitiba",
+                    "status": "rascunho",
+                    "user_id": 1,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for n in range(contratos)
+            ],
+        )
+
+
+class Meter:
+    def __init__(self):
+        self.statements = 0
+        self.param_bytes = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE CONTRACTS"):
+            self.statements += 1
+            self.param_bytes += sum(len(str(value)) for value in parameters or ())
+
+
+def wal_size() -> int:
+    wal = Path(INSTANCE_DIR) / "app.db-wal"
+    return wal.stat().st_size if wal.exists() else 0
+
+
+def form_values(contract: Contract, status: str) -> dict:
+    values = {name: getattr(contract, name) for name in FORM_FIELDS}
+    values["status"] = status
+    return values
+
+
+def run(nome: str, contratos: int, salvar) -> None:
+    meter = Meter()
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    wal_antes = wal_size()
+    inicio = time.perf_counter()
+    for contract_id in range(1, contratos + 1):
+        db = SessionLocal()
+        salvar(db, db.get(Contract, contract_id), contract_id)
+        db.close()
+        SessionLocal.remove()
+    elapsed = time.perf_counter() - inicio
+    event.remove(engine, "before_cursor_execute", meter._on_execute)
+    print(
+        f"{nome:14s} {meter.statements / contratos:4.1f} UPDATE/salvar   "
+        f"{meter.param_bytes / contratos:8.0f} B parâmetros   "
+        f"{(wal_size() - wal_antes) / contratos:8.0f} B WAL   "
+        f"{elapsed / contratos * 1000:6.2f} ms"
+    )
+
+
+def linha_inteira(db, contract, contract_id):
+    values = form_values(contract, STATUS[contract_id % 3])
+    db.execute(
+        update(Contract)
+        .where(Contract.id == contract_id)
+        .values(**values, updated_at=datetime.utcnow(), version=Contract.version + 1)
+    )
+    db.commit()
+
+
+def service(db, contract, contract_id):
+    values = form_values(contract, STATUS[(contract_id + 1) % 3])
+    contract_service.update_contract(db, contract, values, contract.version)
+
+
+def sem_mudanca(db, contract, contract_id):
+    values = form_values(contract, contract.status)
+    contract_service.update_contract(db, contract, values, contract.version)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contratos", type=int, default=2000)
+    parser.add_argument("--descricao", type=int, default=16000)
+    args = parser.parse_args()
+
+    seed(args.contratos, args.descricao)
+    # Sem checkpoint automático o WAL só cresce: o tamanho mede o que foi escrito
+    engine.dispose()
+    event.listen(
+        engine,
+        "connect",
+        lambda dbapi_connection, record: dbapi_connection.execute(
+            "PRAGMA wal_autocheckpoint=0"
+        ),
+    )
+    print(f"{args.contratos} contratos, descrição de {args.descricao} caracteres")
+    run("linha inteira", args.contratos, linha_inteira)
+    run("service", args.contratos, service)
+    run("sem mudança", args.contratos, sem_mudanca)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Leituras e escritas concorrentes no SQLite: engine padrão versus ``make_engine``.
+
+Uso: python benchmarks/db_concurrency.py [--processos 8] [--segundos 5] [--escritas 0.2]
+
+Cada modo usa um arquivo SQLite temporário próprio (o ``journal_mode`` fica
+gravado no arquivo). Cada processo alterna consultas da listagem com
+atualizações de valor e conta as operações concluídas e os erros
+"database is locked".
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-db-")
+os.environ.pop("DATABASE_URL", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, select, update  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.db import Base, make_engine  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+USUARIOS = 20
+CONTRATOS_POR_USUARIO = 500
+
+
+def _engine(modo: str, url: str):
+    return make_engine(url) if modo == "ajustado" else create_engine(url)
+
+
+def seed(modo: str, url: str) -> None:
+    engine = _engine(modo, url)
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {
+                    "name": f"Usuário {n}",
+                    "email": f"u{n}@bench.local",
+                    "password_hash": "x",
+                    "created_at": now,
+                }
+                for n in range(1, USUARIOS + 1)
+            ],
+        )
+        conn.execute(
+            insert(Contract.__table__),
+            [
+                {
+                    "title": f"Contrato {n}",
+                    "provider_name": "Prestador",
+                    "client_name": "Cliente",
+                    "city": "Curitiba",
+                    "value": Decimal("1000.00"),
+                    "payment_terms": "À vista",
+                    "service_description": "Serviço",
+                    "status": "rascunho",
+                    "user_id": n % USUARIOS + 1,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for n in range(USUARIOS * CONTRATOS_POR_USUARIO)
+            ],
+        )
+    engine.dispose()
+
+
+def worker(modo: str, url: str, segundos: float, escritas: float, seed_: int, results):
+    rng = random.Random(seed_)
+    engine = _engine(modo, url)
+    total = USUARIOS * CONTRATOS_POR_USUARIO
+    ops = erros = 0
+    latencias = []
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        try:
+            if rng.random() < escritas:
+                with engine.begin() as conn:
+                    conn.execute(
+                        update(Contract.__table__)
+                        .where(Contract.id == rng.randrange(1, total + 1))
+                        .values(
+                            value=Decimal(rng.randrange(100, 100000)),
+                            updated_at=datetime.utcnow(),
+                        )
+                    )
+            else:
+                with engine.connect() as conn:
+                    conn.execute(
+                        select(Contract.id, Contract.title, Contract.value)
+                        .where(Contract.user_id == rng.randrange(1, USUARIOS + 1))
+                        .order_by(Contract.updated_at.desc(), Contract.id.desc())
+                        .limit(50)
+                    ).all()
+            ops += 1
+            latencias.append(time.perf_counter() - inicio)
+        except OperationalError:
+            erros += 1
+    engine.dispose()
+    results.put((ops, erros, latencias))
+
+
+def run(modo: str, processos: int, segundos: float, escritas: float) -> None:
+    path = Path(os.environ["INSTANCE_DIR"]) / f"{modo}.db"
+    url = f"sqlite:///{path}"
+    seed(modo, url)
+
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(
+            target=worker, args=(modo, url, segundos, escritas, n, results)
+        )
+        for n in range(processos)
+    ]
+    for proc in procs:
+        proc.start()
+    coletados = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+
+    ops = sum(item[0] for item in coletados)
+    erros = sum(item[1] for item in coletados)
+    latencias = sorted(lat for item in coletados for lat in item[2])
+    p95 = latencias[int(len(latencias) * 0.95)] * 1000 if latencias else 0.0
+    print(
+        f"{modo:9s} {ops / segundos:10.0f} ops/s   p95 {p95:7.2f} ms   "
+        f"erros de lock: {erros}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processos", type=int, default=8)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--escritas", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(
+        f"{args.processos} processos, {args.segundos:.0f}s, "
+        f"{args.escritas:.0%} escritas"
+    )
+    for modo in ("padrao", "ajustado"):
+        run(modo, args.processos, args.segundos, args.escritas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Passada noturna de lembretes de vencimento com milhões de contratos.
+
+Uso: python benchmarks/due_reminders.py [--contratos 1000000] [--usuarios 1000]
+     [--noites 7]
+
+Vencimentos espalhados de 180 dias atrás a 365 à frente (20% sem
+vencimento, 10% cancelados). Mede tempo e quanto o pico de RSS subiu em:
+- ``primeira noite``: ``due_dates.run`` sem marca d'água (com backfill);
+- ``mesma noite``: rodar de novo no mesmo dia (nada novo);
+- ``noites seguintes``: ``--noites`` dias consecutivos, média por noite;
+- ``varredura completa``: lê todos os contratos com vencimento e decide em
+  Python quais avisar, o que uma tarefa sem marca d'água faria toda noite.
+  Roda por último: a memória liberada não volta ao sistema e inflaria as
+  medidas seguintes.
+"""
+
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-due-")
+os.environ.pop("DATABASE_URL", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app import due_dates  # noqa: E402
+from app.db import SessionLocal, engine, init_db  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.due_reminder import DueReminder  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.settings import DUE_REMINDER_DAYS_AHEAD  # noqa: E402
+
+
+def seed(contratos: int, usuarios: int, today: date) -> None:
+    init_db()
+    rng = random.Random(11)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {
+                    "name": f"U{n}",
+                    "email": f"u{n}@bench.local",
+                    "password_hash": "x",
+                    "created_at": now,
+                }
+                for n in range(1, usuarios + 1)
+            ],
+        )
+    lote = []
+    for n in range(contratos):
+        due = today + timedelta(days=rng.randint(-180, 365)) if rng.random() < 0.8 else None
+        lote.append(
+            {
+                "title": f"Contrato {n}",
+                "provider_name": "Prestador",
+                "client_name": f"Cliente {n % 5000}",
+                "service_description": "Serviço",
+                "value": Decimal("1000.00"),
+                "payment_terms": "30 dias",
+                "city": "Curitiba",
+                "status": "cancelado" if rng.random() < 0.1 else "assinado",
+                "due_date": due,
+                "user_id": rng.randrange(1, usuarios + 1),
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        if len(lote) == 20_000:
+            with engine.begin() as conn:
+                conn.execute(insert(Contract.__table__), lote)
+            lote.clear()
+    if lote:
+        with engine.begin() as conn:
+            conn.execute(insert(Contract.__table__), lote)
+
+
+def current_rss_mb() -> float:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def reset_peak_rss() -> None:
+    try:
+        # "5" zera o VmHWM (Linux 4.0+)
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def measure(nome: str, operacao) -> float:
+    db = SessionLocal()
+    reset_peak_rss()
+    base = current_rss_mb()
+    inicio = time.perf_counter()
+    resultado = operacao(db)
+    elapsed = time.perf_counter() - inicio
+    print(
+        f"{nome:20s} {elapsed:8.2f} s  pico RSS +{peak_rss_mb() - base:7.1f} MB  {resultado}"
+    )
+    db.close()
+    SessionLocal.remove()
+    return elapsed
+
+
+def varredura_completa(today: date):
+    def operacao(db) -> str:
+        rows = db.execute(
+            select(Contract.id, Contract.user_id, Contract.due_date, Contract.status).where(
+                Contract.due_date.is_not(None)
+            )
+        ).all()
+        limite = today + timedelta(days=DUE_REMINDER_DAYS_AHEAD)
+        avisos = [
+            row
+            for row in rows
+            if row.status not in due_dates.INACTIVE_STATUSES and row.due_date <= limite
+        ]
+        return f"{len(rows)} lidos, {len(avisos)} candidatos"
+
+    return operacao
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contratos", type=int, default=1_000_000)
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--noites", type=int, default=7)
+    args = parser.parse_args()
+
+    today = date.today()
+    inicio = time.perf_counter()
+    seed(args.contratos, args.usuarios, today)
+    print(f"{args.contratos} contratos inseridos em {time.perf_counter() - inicio:.1f} s")
+
+    measure("primeira noite", lambda db: due_dates.run(db, today))
+    measure("mesma noite", lambda db: due_dates.run(db, today))
+    total = 0.0
+    for noite in range(1, args.noites + 1):
+        total += measure(
+            f"noite +{noite}", lambda db: due_dates.run(db, today + timedelta(days=noite))
+        )
+    print(f"média das noites seguintes: {total / max(args.noites, 1):.2f} s")
+    measure("varredura completa", varredura_completa(today))
+
+    with engine.connect() as conn:
+        print(f"lembretes: {conn.execute(select(func.count(DueReminder.id))).scalar()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Microbenchmark de valores por extenso.
+
+Uso: python benchmarks/extenso.py [--quantidade 100000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import extenso  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quantidade", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    # Valores de contratos se repetem bastante (mensalidades, pacotes fixos)
+    distintos = [Decimal(rng.randrange(0, 10**11)) / 100 for _ in range(2_000)]
+    valores = [rng.choice(distintos) for _ in range(args.quantidade)]
+
+    extenso._centavos_por_extenso.cache_clear()
+    start = time.perf_counter()
+    for valor in valores:
+        extenso.valor_por_extenso(valor)
+    um_a_um = time.perf_counter() - start
+
+    extenso._centavos_por_extenso.cache_clear()
+    start = time.perf_counter()
+    extenso.valores_por_extenso(valores)
+    lote = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for valor in distintos:
+        extenso.numero_por_extenso(int(valor))
+    inteiros = time.perf_counter() - start
+
+    print(f"valores: {args.quantidade} ({len(distintos)} distintos)")
+    print(f"valor_por_extenso: {um_a_um / args.quantidade * 1e6:.2f} µs/valor")
+    print(f"valores_por_extenso: {lote / args.quantidade * 1e6:.2f} µs/valor")
+    print(f"numero_por_extenso: {inteiros / len(distintos) * 1e6:.2f} µs/número")
+
+
+if __name__ == "__main__":
+    main()
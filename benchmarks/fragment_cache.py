@@ -0,0 +1,94 @@
+"""Renderização da listagem com e sem cache de fragmentos.
+
+Uso: python benchmarks/fragment_cache.py [--linhas 5000] [--repeticoes 10]
+
+Renderiza ``contratos/lista.html`` com N linhas sintéticas para cada backend
+(sem cache, memória e arquivo), medindo a primeira renderização (cache frio)
+e a mediana das seguintes (cache quente).
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-fragment-")
+os.environ.pop("DATABASE_URL", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask import render_template  # noqa: E402
+
+from app import create_app, fragment_cache  # noqa: E402
+from app.settings import FRAGMENT_CACHE_DIR, FRAGMENT_CACHE_MAX_BYTES  # noqa: E402
+
+
+def linhas(total: int):
+    base = datetime(2024, 1, 1)
+    return [
+        SimpleNamespace(
+            id=n,
+            title=f"Contrato de manutenção {n}",
+            client_name=f"Cliente {n % 300}",
+            provider_name=f"Prestador {n % 50}",
+            value=Decimal(n % 9000) + Decimal("0.50"),
+            status=("rascunho", "assinado", "cancelado")[n % 3],
+            updated_at=base + timedelta(minutes=n),
+        )
+        for n in range(1, total + 1)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=5000)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    app = create_app()
+    contracts = linhas(args.linhas)
+
+    def render():
+        with app.test_request_context("/contratos/"):
+            return render_template(
+                "contratos/lista.html",
+                contracts=contracts,
+                next_url=None,
+                filter_args={},
+                is_first_page=True,
+            )
+
+    backends = {
+        "sem cache": None,
+        "memória": fragment_cache.MemoryBackend(args.linhas * 2),
+        "arquivo": fragment_cache.FileBackend(
+            FRAGMENT_CACHE_DIR, args.linhas * 2, FRAGMENT_CACHE_MAX_BYTES
+        ),
+    }
+    referencia = None
+    print(f"{args.linhas} linhas")
+    for nome, backend in backends.items():
+        fragment_cache.backend = backend
+        inicio = time.perf_counter()
+        html = render()
+        frio = (time.perf_counter() - inicio) * 1000
+        amostras = []
+        for _ in range(args.repeticoes):
+            inicio = time.perf_counter()
+            render()
+            amostras.append((time.perf_counter() - inicio) * 1000)
+        referencia = referencia or html
+        igual = "ok" if html == referencia else "DIFERENTE"
+        print(
+            f"{nome:10s} frio {frio:8.1f} ms   quente {statistics.median(amostras):8.1f} ms"
+            f"   html {igual}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Teste de carga HTTP: gunicorn síncrono versus uvicorn com ``asgi.py``.
+
+Uso: python benchmarks/load_test.py [--modos gunicorn,uvicorn] [--workers 2]
+     [--conexoes 32] [--segundos 10] [--pdf 0.1]
+
+Sobe cada servidor em uma porta local com um INSTANCE_DIR temporário,
+autentica um usuário de teste e dispara requisições à listagem, ao
+dashboard, à API e (na fração ``--pdf``) ao PDF sem cache. Requer
+gunicorn e/ou ``a2wsgi`` + ``uvicorn`` instalados.
+"""
+
+import argparse
+import http.client
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from urllib.parse import urlencode
+
+ROOT = Path(__file__).resolve().parent.parent
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-load-")
+os.environ.pop("DATABASE_URL", None)
+# Sem cache de PDF: cada pedido de PDF é uma renderização real
+os.environ["PDF_CACHE_MAX_BYTES"] = "0"
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.db import SessionLocal, engine, init_db  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+EMAIL = "carga@bench.local"
+SENHA = "carga123"
+CONTRATOS = 2000
+ROTAS = ("/contratos/", "/dashboard", "/api/contratos")
+
+
+def seed() -> None:
+    init_db()
+    db = SessionLocal()
+    user = User(name="Carga", email=EMAIL)
+    user.set_password(SENHA)
+    db.add(user)
+    db.commit()
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Contract.__table__),
+            [
+                {
+                    "title": f"Contrato {n}",
+                    "provider_name": f"Prestador {n % 50}",
+                    "client_name": f"Cliente {n % 300}",
+                    "service_description": "Manutenção preventiva mensal",
+                    "value": Decimal(n % 9000 + 100),
+                    "payment_terms": "30 dias",
+                    "city": "São Paulo",
+                    "status": "rascunho",
+                    "user_id": user.id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for n in range(CONTRATOS)
+            ],
+        )
+    db.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(modo: str, port: int, workers: int) -> subprocess.Popen:
+    if modo == "gunicorn":
+        cmd = ["gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}", "main:app"]
+    else:
+        cmd = [
+            sys.executable, "-m", "uvicorn", "asgi:app",
+            "--workers", str(workers), "--port", str(port), "--log-level", "warning",
+        ]
+    proc = subprocess.Popen(
+        cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit(f"{modo} não subiu na porta {port}")
+
+
+def login(port: int) -> str:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request(
+        "POST",
+        "/login",
+        body=urlencode({"email": EMAIL, "password": SENHA}),
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    response = conn.getresponse()
+    response.read()
+    cookie = response.getheader("Set-Cookie", "").split(";", 1)[0]
+    conn.close()
+    if not cookie:
+        raise SystemExit("login falhou")
+    return cookie
+
+
+def client(port, cookie, fim, fracao_pdf, seed_, latencias, erros):
+    rng = random.Random(seed_)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    while time.perf_counter() < fim:
+        if rng.random() < fracao_pdf:
+            path = f"/contratos/{rng.randrange(1, CONTRATOS + 1)}/pdf"
+        else:
+            path = rng.choice(ROTAS)
+        inicio = time.perf_counter()
+        try:
+            conn.request("GET", path, headers={"Cookie": cookie})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                erros.append(response.status)
+            latencias.append(time.perf_counter() - inicio)
+        except (OSError, http.client.HTTPException):
+            erros.append("conexão")
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.close()
+
+
+def run(modo: str, workers: int, conexoes: int, segundos: float, fracao_pdf: float):
+    port = _free_port()
+    proc = start_server(modo, port, workers)
+    try:
+        cookie = login(port)
+        latencias, erros = [], []
+        fim = time.perf_counter() + segundos
+        threads = [
+            threading.Thread(
+                target=client,
+                args=(port, cookie, fim, fracao_pdf, n, latencias, erros),
+            )
+            for n in range(conexoes)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    latencias.sort()
+    p50 = statistics.median(latencias) * 1000 if latencias else 0.0
+    p99 = latencias[int(len(latencias) * 0.99)] * 1000 if latencias else 0.0
+    print(
+        f"{modo:9s} {len(latencias) / segundos:8.1f} req/s   "
+        f"p50 {p50:7.1f} ms   p99 {p99:7.1f} ms   erros: {dict(Counter(erros)) or 0}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modos", default="gunicorn,uvicorn")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--conexoes", type=int, default=32)
+    parser.add_argument("--segundos", type=float, default=10.0)
+    parser.add_argument("--pdf", type=float, default=0.1)
+    args = parser.parse_args()
+
+    seed()
+    print(
+        f"{args.workers} workers, {args.conexoes} conexões, {args.segundos:.0f}s, "
+        f"{args.pdf:.0%} PDFs"
+    )
+    for modo in args.modos.split(","):
+        run(modo, args.workers, args.conexoes, args.segundos, args.pdf)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Logins legítimos durante um ataque de credential stuffing.
+
+Uso: python benchmarks/login.py [--segundos 10] [--atacantes 16] [--taxa 200]
+     [--ips 4] [--usuarios 4] [--vitimas 1000]
+
+Threads atacantes tentam senhas erradas em contas existentes (vítimas) a
+partir de poucos IPs, somando até ``--taxa`` tentativas por segundo; cada
+usuário legítimo faz login (de um IP próprio) a cada segundo. Roda duas vezes:
+- ``sem proteção``: hash inline, sem limite de tentativas (comportamento antigo);
+- ``com proteção``: pool limitado de hash (``app.passwords``) e token bucket
+  por IP/email (``app.rate_limit``).
+
+Mostra logins legítimos por segundo, latência p50/p95 deles e quantas
+tentativas do ataque chegaram a calcular hash.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-login-")
+os.environ.pop("DATABASE_URL", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datetime import datetime  # noqa: E402
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import create_app, passwords, rate_limit  # noqa: E402
+from app.db import engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+PASSWORD = "senha-correta"
+
+
+def seed(usuarios: int, vitimas: int) -> None:
+    # Um hash só, copiado para todas as contas: o seed não mede nada
+    password_hash = passwords.hash_password(PASSWORD)
+    now = datetime.utcnow()
+    emails = [f"u{n}@bench.local" for n in range(usuarios)]
+    emails += [f"vitima{n}@bench.local" for n in range(vitimas)]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {"name": email, "email": email, "password_hash": password_hash, "created_at": now}
+                for email in emails
+            ],
+        )
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(app, nome: str, args) -> None:
+    rate_limit.by_ip.clear()
+    rate_limit.by_email.clear()
+    hashes = {"total": 0}
+    lock = threading.Lock()
+    original = passwords.check_password_hash
+
+    def counted(password_hash, password):
+        with lock:
+            hashes["total"] += 1
+        return original(password_hash, password)
+
+    passwords.check_password_hash = counted
+    stop = time.monotonic() + args.segundos
+    legit_latencies: list[float] = []
+    legit_failures = [0]
+    attack_status: dict[int, int] = {}
+
+    def attacker(n: int) -> None:
+        rng = random.Random(n)
+        client = app.test_client()
+        ip = f"203.0.113.{n % args.ips + 1}"
+        interval = args.atacantes / args.taxa
+        proxima = time.monotonic()
+        while time.monotonic() < stop:
+            proxima += interval
+            time.sleep(max(0.0, proxima - time.monotonic()))
+            response = client.post(
+                "/login",
+                data={
+                    "email": f"vitima{rng.randrange(args.vitimas)}@bench.local",
+                    "password": "123456",
+                },
+                environ_base={"REMOTE_ADDR": ip},
+            )
+            with lock:
+                attack_status[response.status_code] = attack_status.get(response.status_code, 0) + 1
+
+    def legit(n: int) -> None:
+        ip = f"198.51.100.{n + 1}"
+        while time.monotonic() < stop:
+            client = app.test_client()
+            inicio = time.perf_counter()
+            response = client.post(
+                "/login",
+                data={"email": f"u{n}@bench.local", "password": PASSWORD},
+                environ_base={"REMOTE_ADDR": ip},
+            )
+            elapsed = (time.perf_counter() - inicio) * 1000
+            with lock:
+                if response.status_code == 302:
+                    legit_latencies.append(elapsed)
+                else:
+                    legit_failures[0] += 1
+            time.sleep(1.0)
+
+    threads = [threading.Thread(target=attacker, args=(n,)) for n in range(args.atacantes)]
+    threads += [threading.Thread(target=legit, args=(n,)) for n in range(args.usuarios)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    passwords.check_password_hash = original
+
+    ataque = sum(attack_status.values())
+    recusadas = attack_status.get(429, 0) + attack_status.get(503, 0)
+    print(
+        f"{nome:13s} legítimos {len(legit_latencies) / args.segundos:6.1f}/s "
+        f"(falhas {legit_failures[0]})  p50 {statistics.median(legit_latencies or [0]):7.0f} ms "
+        f"p95 {percentile(legit_latencies, 95):7.0f} ms | ataque {ataque / args.segundos:7.1f} req/s, "
+        f"{recusadas / max(ataque, 1):4.0%} recusadas, {hashes['total']} hashes"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segundos", type=float, default=10)
+    parser.add_argument("--atacantes", type=int, default=16)
+    parser.add_argument("--taxa", type=float, default=200)
+    parser.add_argument("--ips", type=int, default=4)
+    parser.add_argument("--usuarios", type=int, default=4)
+    parser.add_argument("--vitimas", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = create_app()
+    seed(args.usuarios, args.vitimas)
+    print(f"hash: {os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')}, {os.cpu_count()} CPU(s)")
+
+    # Comportamento antigo: hash na thread da requisição e nenhum limite
+    run_hash = passwords._run
+    passwords._run = lambda func, *func_args: func(*func_args)
+    rate_limit.LOGIN_RATE_LIMIT = False
+    run(app, "sem proteção", args)
+
+    passwords._run = run_hash
+    rate_limit.LOGIN_RATE_LIMIT = True
+    run(app, "com proteção", args)
+
+
+if __name__ == "__main__":
+    main()
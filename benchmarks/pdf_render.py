@@ -0,0 +1,91 @@
+"""Tempo médio de geração de um PDF de contrato: antes e depois do layout pré-calculado.
+
+Uso: python benchmarks/pdf_render.py [--iteracoes 200]
+
+- ``multi_cell``: caminho anterior, em que cada cláusula e a declaração
+  passam pela quebra justificada do ``multi_cell`` a cada PDF;
+- ``pdf.text``: layout das cláusulas calculado uma vez por processo
+  (``_static_layout``) e reemitido palavra a palavra.
+
+Os dois caminhos usam o mesmo ``render_contract_pdf``; o anterior troca só
+``_static_layout``/``_write_lines`` pelo texto cru e pelo ``multi_cell``.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import pdf  # noqa: E402
+
+FIELDS = {
+    "id": 1,
+    "title": "Contrato de desenvolvimento de software",
+    "client_name": "ACME Comércio Ltda",
+    "provider_name": "Fulano de Tal ME",
+    "city": "São Paulo",
+    "value": "12345.67",
+    "payment_terms": "30% na assinatura e 70% na entrega",
+    "due_date": "2026-12-01",
+    "service_description": "Desenvolvimento e manutenção de sistema web. " * 8,
+}
+
+
+@contextmanager
+def multi_cell_path():
+    """Renderiza as cláusulas como antes: ``multi_cell`` com o texto completo."""
+    with mock.patch.object(
+        pdf, "_static_layout", lambda: (pdf.CLAUSES, pdf.DECLARATION)
+    ), mock.patch.object(
+        pdf, "_write_lines", lambda document, text, h: document.multi_cell(0, h, text)
+    ):
+        yield
+
+
+def measure(iteracoes: int) -> list[float]:
+    pdf.render_contract_pdf(FIELDS)
+    samples = []
+    for _ in range(iteracoes):
+        start = time.perf_counter()
+        pdf.render_contract_pdf(FIELDS)
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+
+def report(nome: str, samples: list[float]) -> None:
+    print(
+        f"{nome:11s} média {statistics.mean(samples):7.2f} ms  "
+        f"p50 {samples[len(samples) // 2]:7.2f} ms  "
+        f"p95 {samples[int(len(samples) * 0.95)]:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iteracoes", type=int, default=200)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    with multi_cell_path():
+        antes = measure(args.iteracoes)
+
+    start = time.perf_counter()
+    pdf._static_layout()
+    layout_ms = (time.perf_counter() - start) * 1000
+    depois = measure(args.iteracoes)
+
+    print(f"PDFs gerados por caminho: {args.iteracoes}")
+    print(f"layout estático (uma vez por processo): {layout_ms:.2f} ms")
+    report("multi_cell", antes)
+    report("pdf.text", depois)
+    print(f"ganho na média: {statistics.mean(antes) / statistics.mean(depois):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Busca textual (FTS5) versus LIKE em uma base sintética.
+
+Uso: python benchmarks/search.py [--linhas 1000000] [--usuarios 10]
+
+Cria um SQLite temporário; o INSTANCE_DIR real não é tocado.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-search-")
+os.environ.pop("DATABASE_URL", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import search  # noqa: E402
+from app.db import SessionLocal, engine, init_db  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+PALAVRAS = (
+    "manutenção predial elétrica hidráulica desenvolvimento site aplicativo "
+    "consultoria tributária contábil limpeza jardinagem segurança portaria "
+    "transporte logística marketing digital design gráfico tradução jurídica "
+    "treinamento equipe suporte técnico servidores nuvem reforma pintura"
+).split()
+CONSULTAS = ("manutenção", "site institucional", "Cliente 4242", "Prestador 17 pintura")
+
+
+def seed(linhas: int, usuarios: int) -> None:
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {
+                    "name": f"Usuário {n}",
+                    "email": f"u{n}@bench.local",
+                    "password_hash": "x",
+                    "created_at": now,
+                }
+                for n in range(1, usuarios + 1)
+            ],
+        )
+    lote = []
+    for n in range(linhas):
+        lote.append(
+            {
+                "title": " ".join(rng.sample(PALAVRAS, 3)).capitalize(),
+                "provider_name": f"Prestador {rng.randrange(5000)}",
+                "client_name": f"Cliente {rng.randrange(5000)}",
+                "service_description": " ".join(rng.choices(PALAVRAS, k=25)),
+                "value": Decimal(rng.randrange(10000, 10000000)) / 100,
+                "payment_terms": "30 dias",
+                "city": "São Paulo",
+                "status": "rascunho",
+                "user_id": rng.randrange(1, usuarios + 1),
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        if len(lote) == 10_000:
+            with engine.begin() as conn:
+                conn.execute(insert(Contract.__table__), lote)
+            lote.clear()
+    if lote:
+        with engine.begin() as conn:
+            conn.execute(insert(Contract.__table__), lote)
+
+
+def medir(func, repeticoes: int = 20) -> float:
+    amostras = []
+    for _ in range(repeticoes):
+        start = time.perf_counter()
+        func()
+        amostras.append((time.perf_counter() - start) * 1000)
+    return statistics.median(amostras)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--usuarios", type=int, default=10)
+    args = parser.parse_args()
+
+    init_db()
+    start = time.perf_counter()
+    seed(args.linhas, args.usuarios)
+    elapsed = time.perf_counter() - start
+    print(f"{args.linhas} contratos inseridos (com índice FTS) em {elapsed:.1f} s")
+
+    db = SessionLocal()
+    for consulta in CONSULTAS:
+        fts_ms = medir(lambda: search.search_contracts(db, 1, consulta, per_page=50))
+        search._fts_ready[str(engine.url)] = False
+        like_ms = medir(lambda: search.search_contracts(db, 1, consulta, per_page=50), 3)
+        search._fts_ready[str(engine.url)] = True
+        print(f"{consulta!r}: FTS5 {fts_ms:.1f} ms | LIKE {like_ms:.1f} ms (mediana)")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
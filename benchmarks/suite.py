@@ -0,0 +1,343 @@
+"""Suíte de benchmarks ponta a ponta das rotas principais.
+
+Uso: python benchmarks/suite.py [--usuarios 4] [--contratos 2000]
+     [--requisicoes 200] [--aquecimento 10] [--conexoes 1]
+     [--servidor test-client|gunicorn] [--workers 2] [--rotas lista,pdf,...]
+     [--saida resultados.json] [--comparar anterior.json]
+
+Popula um banco temporário com ``app.seed`` (semente fixa: mesmos dados a
+cada execução), autentica um cliente por usuário e mede cada rota em
+sequência, pelo test client do Flask ou por um gunicorn local. Para cada
+rota: requisições por segundo, latência p50/p95/p99 e pico de RSS (do
+próprio processo ou da soma dos processos do gunicorn). O resultado vai
+para JSON; ``--comparar`` mostra a variação em relação a uma execução
+anterior.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+from urllib.parse import quote, urlencode
+
+ROOT = Path(__file__).resolve().parent.parent
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="bench-suite-")
+os.environ.pop("DATABASE_URL", None)
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import select  # noqa: E402
+
+from app.db import SessionLocal, init_db  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.seed import DEFAULT_PASSWORD, populate  # noqa: E402
+
+# nome -> caminho; {id} percorre os contratos do usuário (PDFs sem cache)
+ROTAS = {
+    "lista": "/contratos/",
+    "lista_filtrada": "/contratos/?status=assinado&vencimento_de={hoje}",
+    "busca": "/contratos/?q=" + quote("manutenção"),
+    "dashboard": "/dashboard",
+    "editar": "/contratos/{id}/editar",
+    "pdf": "/contratos/{id}/pdf",
+    "api_lista": "/api/contratos",
+    "api_contrato": "/api/contratos/{id}",
+    "api_historico": "/api/contratos/{id}/historico",
+    "api_export": "/api/contratos/export.ndjson",
+}
+
+
+def seed(usuarios: int, contratos: int) -> dict[str, list[int]]:
+    """Popula o banco e devolve ``{email: [ids dos contratos]}``."""
+    init_db()
+    db = SessionLocal()
+    try:
+        emails = populate(db, usuarios, contratos)
+        ids = {}
+        for email in emails:
+            user_id = db.execute(select(User.id).where(User.email == email)).scalar_one()
+            ids[email] = list(
+                db.execute(
+                    select(Contract.id).where(Contract.user_id == user_id).order_by(Contract.id)
+                ).scalars()
+            )
+        return ids
+    finally:
+        db.close()
+        SessionLocal.remove()
+
+
+class TestClientDriver:
+    """Chama o app no próprio processo, sem rede."""
+
+    def __init__(self):
+        from app import create_app
+
+        self.app = create_app()
+        self.pids = [os.getpid()]
+
+    def session(self, email: str):
+        client = self.app.test_client()
+        response = client.post("/login", data={"email": email, "password": DEFAULT_PASSWORD})
+        if response.status_code != 302:
+            raise SystemExit(f"login de {email} falhou ({response.status_code})")
+
+        def get(path: str) -> int:
+            response = client.get(path)
+            response.close()
+            return response.status_code
+
+        return get
+
+    def close(self) -> None:
+        pass
+
+
+class GunicornDriver:
+    """Sobe ``gunicorn main:app`` numa porta local com o mesmo banco."""
+
+    def __init__(self, workers: int):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.proc = subprocess.Popen(
+            ["gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{self.port}", "main:app"],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.time() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.2).close()
+                break
+            except OSError:
+                if time.time() > deadline:
+                    self.proc.kill()
+                    raise SystemExit("gunicorn não subiu")
+                time.sleep(0.2)
+        # Workers sobem depois do socket; dá tempo para todos aparecerem
+        time.sleep(1)
+        children = Path(f"/proc/{self.proc.pid}/task/{self.proc.pid}/children")
+        extra = children.read_text().split() if children.exists() else []
+        self.pids = [self.proc.pid, *map(int, extra)]
+
+    def session(self, email: str):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        conn.request(
+            "POST",
+            "/login",
+            body=urlencode({"email": email, "password": DEFAULT_PASSWORD}),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        response = conn.getresponse()
+        response.read()
+        cookie = response.getheader("Set-Cookie", "").split(";", 1)[0]
+        if not cookie:
+            raise SystemExit(f"login de {email} falhou ({response.status})")
+
+        def get(path: str) -> int:
+            nonlocal conn
+            try:
+                conn.request("GET", path, headers={"Cookie": cookie})
+                response = conn.getresponse()
+                response.read()
+                return response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+                return 0
+
+        return get
+
+    def close(self) -> None:
+        self.proc.terminate()
+        self.proc.wait(timeout=30)
+
+
+def reset_peak_rss(pids: list[int]) -> None:
+    for pid in pids:
+        try:
+            # "5" zera o VmHWM (Linux 4.0+)
+            Path(f"/proc/{pid}/clear_refs").write_text("5")
+        except OSError:
+            pass
+
+
+def peak_rss_mb(pids: list[int]) -> float | None:
+    total = 0
+    for pid in pids:
+        try:
+            status = Path(f"/proc/{pid}/status").read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith("VmHWM:"):
+                total += int(line.split()[1])
+    if not total and pids == [os.getpid()]:
+        # Sem /proc (macOS etc.): pico desde o início do processo
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return total / 1024 if total else None
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def measure(driver, sessions, ids, path: str, args) -> dict:
+    hoje = date.today().isoformat()
+    por_conexao = max(1, args.requisicoes // args.conexoes)
+
+    def paths(worker: int, total: int, offset: int):
+        email_ids = ids[worker % len(ids)]
+        for n in range(total):
+            contract_id = email_ids[(offset + n) % len(email_ids)]
+            yield path.format(id=contract_id, hoje=hoje)
+
+    # Aquecimento: caches de template, fragmentos e conexões; ids diferentes
+    # dos medidos para que PDFs medidos não estejam em cache
+    for worker, get in enumerate(sessions):
+        for item in paths(worker, args.aquecimento, len(ids[worker % len(ids)]) // 2):
+            get(item)
+
+    latencias: list[float] = []
+    status: Counter = Counter()
+    lock = threading.Lock()
+
+    def worker_loop(worker: int) -> None:
+        get = sessions[worker]
+        local, local_status = [], Counter()
+        for item in paths(worker, por_conexao, worker * por_conexao):
+            inicio = time.perf_counter()
+            local_status[get(item)] += 1
+            local.append((time.perf_counter() - inicio) * 1000)
+        with lock:
+            latencias.extend(local)
+            status.update(local_status)
+
+    reset_peak_rss(driver.pids)
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=worker_loop, args=(n,)) for n in range(args.conexoes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "caminho": path,
+        "requisicoes": len(latencias),
+        "req_s": round(len(latencias) / elapsed, 2),
+        "p50_ms": round(percentile(latencias, 50), 2),
+        "p95_ms": round(percentile(latencias, 95), 2),
+        "p99_ms": round(percentile(latencias, 99), 2),
+        "max_ms": round(latencias[-1], 2) if latencias else 0.0,
+        "status": {str(code): count for code, count in sorted(status.items())},
+        "rss_pico_mb": round(peak_rss_mb(driver.pids) or 0.0, 1),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(atual: dict, anterior_path: str) -> None:
+    anterior = json.loads(Path(anterior_path).read_text())
+    print(f"\ncomparação com {anterior_path} (commit {anterior.get('commit')}):")
+    diferentes = [
+        chave
+        for chave, valor in atual["parametros"].items()
+        if chave not in ("saida", "comparar") and anterior["parametros"].get(chave) != valor
+    ]
+    if diferentes:
+        print(f"  atenção: parâmetros diferentes ({', '.join(diferentes)})")
+    for nome, rota in atual["rotas"].items():
+        base = anterior.get("rotas", {}).get(nome)
+        if not base:
+            continue
+        variacoes = []
+        for chave in ("req_s", "p50_ms", "p95_ms", "p99_ms", "rss_pico_mb"):
+            if base.get(chave):
+                variacoes.append(f"{chave} {(rota[chave] / base[chave] - 1) * 100:+6.1f}%")
+        print(f"  {nome:15s} " + "  ".join(variacoes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--usuarios", type=int, default=4)
+    parser.add_argument("--contratos", type=int, default=2000)
+    parser.add_argument("--requisicoes", type=int, default=200)
+    parser.add_argument("--aquecimento", type=int, default=10)
+    parser.add_argument("--conexoes", type=int, default=1)
+    parser.add_argument("--servidor", choices=("test-client", "gunicorn"), default="test-client")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--rotas", default=",".join(ROTAS))
+    parser.add_argument("--saida", default=f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    parser.add_argument("--comparar")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    ids = list(seed(args.usuarios, args.contratos).values())
+    print(
+        f"{args.usuarios} usuários x {args.contratos} contratos em "
+        f"{time.perf_counter() - inicio:.1f} s; servidor: {args.servidor}, "
+        f"{args.conexoes} conexão(ões)"
+    )
+
+    driver = (
+        GunicornDriver(args.workers) if args.servidor == "gunicorn" else TestClientDriver()
+    )
+    resultado = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "parametros": vars(args),
+        "rotas": {},
+    }
+    try:
+        emails = [f"usuario{n}@exemplo.com.br" for n in range(1, args.usuarios + 1)]
+        sessions = [driver.session(emails[n % len(emails)]) for n in range(args.conexoes)]
+        for nome in args.rotas.split(","):
+            rota = measure(driver, sessions, ids, ROTAS[nome], args)
+            resultado["rotas"][nome] = rota
+            print(
+                f"{nome:15s} {rota['req_s']:8.1f} req/s  p50 {rota['p50_ms']:7.1f}  "
+                f"p95 {rota['p95_ms']:7.1f}  p99 {rota['p99_ms']:7.1f} ms  "
+                f"RSS {rota['rss_pico_mb']:6.1f} MB  {rota['status']}"
+            )
+    finally:
+        driver.close()
+
+    Path(args.saida).write_text(json.dumps(resultado, indent=2, ensure_ascii=False))
+    print(f"resultado em {args.saida}")
+    if args.comparar:
+        compare(resultado, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
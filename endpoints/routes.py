@@ -1,8 +1,208 @@
-from flask import Blueprint, jsonify
+import hashlib
+import json
+import math
+from datetime import date
+from functools import wraps
+
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    g,
+    jsonify,
+    request,
+    session,
+    url_for,
+)
+from sqlalchemy import func, select
+
+from app import (
+    account_service,
+    contract_import,
+    contract_service,
+    due_dates,
+    rate_limit,
+    search,
+)
+from app.controllers import read_only, route_reads_for
+from app.db import SessionLocal
+from app.models.contract import Contract
+from app.models.contract_event import ContractEvent
+from app.models.user import User
+from app.pagination import decode_cursor, keyset_page
+from app.passwords import HashingBusy
+from app.settings import BULK_MAX_CONTRACTS, CONTRACTS_PAGE_SIZE, HISTORY_PAGE_SIZE
 
 
 api_bp = Blueprint("api", __name__)
 
+EXPORT_BATCH_SIZE = 500
+API_COLUMNS = (
+    Contract.id,
+    Contract.title,
+    Contract.provider_name,
+    Contract.client_name,
+    Contract.service_description,
+    Contract.value,
+    Contract.payment_terms,
+    Contract.city,
+    Contract.status,
+    Contract.due_date,
+    Contract.created_at,
+    Contract.updated_at,
+    Contract.version,
+)
+
+
+def api_login_required(view):
+    """Aceita a sessão do navegador ou HTTP Basic (email/senha) para integrações."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = session.get("user_id")
+        auth = request.authorization
+        if not user_id and auth and auth.type == "basic":
+            email = (auth.username or "").strip().lower()
+            wait = rate_limit.take(request.remote_addr, email)
+            if wait:
+                return _retry_later("Muitas tentativas de autenticação.", 429, wait)
+            user = account_service.authenticate(g.db, email, auth.password or "")
+            if user:
+                rate_limit.give_back(request.remote_addr, email)
+                user_id = user.id
+        if not user_id:
+            response = jsonify({"error": "Autenticação necessária."})
+            response.status_code = 401
+            response.headers["WWW-Authenticate"] = 'Basic realm="api"'
+            return response
+        g.api_user_id = user_id
+        route_reads_for(user_id)
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def feed_login_required(view):
+    """``api_login_required`` que também aceita o ``?token=`` do feed de vencimentos.
+
+    Apps de calendário assinam uma URL e não enviam cookie nem senha.
+    """
+    protected = api_login_required(view)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = due_dates.user_from_token(g.db, request.args.get("token"))
+        if user_id is None:
+            return protected(*args, **kwargs)
+        g.api_user_id = user_id
+        route_reads_for(user_id)
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def _retry_later(message: str, status: int, seconds: float):
+    response = jsonify({"error": message})
+    response.status_code = status
+    response.headers["Retry-After"] = str(max(1, math.ceil(seconds)))
+    return response
+
+
+@api_bp.errorhandler(HashingBusy)
+def hashing_busy(error):
+    return _retry_later("Servidor ocupado. Tente novamente em instantes.", 503, 1)
+
+
+def contract_to_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "provider_name": row.provider_name,
+        "client_name": row.client_name,
+        "service_description": row.service_description,
+        "value": str(row.value),
+        "payment_terms": row.payment_terms,
+        "city": row.city,
+        "status": row.status,
+        "due_date": row.due_date.isoformat() if row.due_date else None,
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
+        "version": row.version,
+    }
+
+
+def _etag(*parts) -> str:
+    return hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:32]
+
+
+def _contract_etag(contract) -> str:
+    return _etag(contract.id, contract.version)
+
+
+def _collection_etag(user_id: int, *extra) -> str:
+    count, last_update, last_id = (
+        g.db.query(
+            func.count(Contract.id), func.max(Contract.updated_at), func.max(Contract.id)
+        )
+        .filter(Contract.user_id == user_id)
+        .one()
+    )
+    return _etag(user_id, count, last_update, last_id, *extra)
+
+
+def _conditional_json(payload, etag: str):
+    response = jsonify(payload)
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def _get_owned_contract(contract_id: int) -> Contract:
+    contract = (
+        g.db.query(Contract)
+        .filter(Contract.id == contract_id, Contract.user_id == g.api_user_id)
+        .first()
+    )
+    if not contract:
+        abort(404)
+    return contract
+
+
+def _json_body() -> dict:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        abort(400, description="Corpo JSON inválido.")
+    return data
+
+
+def _validation_error(errors):
+    response = jsonify({"errors": errors})
+    response.status_code = 422
+    return response
+
+
+def _bulk_ids(data) -> tuple[list[int], list[str]]:
+    ids = data.get("ids")
+    if (
+        not isinstance(ids, list)
+        or not ids
+        or not all(isinstance(item, int) and not isinstance(item, bool) for item in ids)
+    ):
+        return [], ['Informe "ids" como uma lista de inteiros.']
+    if len(ids) > BULK_MAX_CONTRACTS:
+        return [], [f"Limite de {BULK_MAX_CONTRACTS} contratos por operação."]
+    return ids, []
+
+
+def _conflict(contract, status: int = 409):
+    response = jsonify(
+        {"error": contract_service.CONFLICT_MESSAGE, "current": contract_to_dict(contract)}
+    )
+    response.status_code = status
+    response.set_etag(_contract_etag(contract))
+    return response
+
 
 @api_bp.get("/api/data")
 def get_sample_data():
@@ -31,3 +231,316 @@ def get_item(item_id: int):
             "timestamp": "2024-01-01T00:00:00Z",
         }
     )
+
+
+@api_bp.get("/api/contratos")
+@api_login_required
+@read_only
+def list_contracts():
+    etag = _collection_etag(g.api_user_id, request.query_string.decode())
+    if request.if_none_match.contains(etag):
+        return _conditional_json({}, etag)
+
+    query = contract_service.filter_contracts(
+        g.db.query(*API_COLUMNS).filter(Contract.user_id == g.api_user_id),
+        contract_service.list_filters(request.args),
+    )
+    rows, next_cursor = keyset_page(
+        query,
+        Contract.updated_at,
+        Contract.id,
+        decode_cursor(request.args.get("cursor")),
+        CONTRACTS_PAGE_SIZE,
+    )
+    return _conditional_json(
+        {"data": [contract_to_dict(row) for row in rows], "next_cursor": next_cursor},
+        etag,
+    )
+
+
+@api_bp.get("/api/contratos/busca")
+@api_login_required
+@read_only
+def search_contracts():
+    q = (request.args.get("q") or "").strip()
+    page = max(request.args.get("pagina", 1, type=int), 1)
+    filters = contract_service.list_filters(request.args)
+    results, has_next = search.search_contracts(
+        g.db,
+        g.api_user_id,
+        q,
+        lambda query: contract_service.filter_contracts(query, filters),
+        page,
+        CONTRACTS_PAGE_SIZE,
+    )
+    return jsonify(
+        {
+            "data": [
+                {
+                    "id": item["id"],
+                    "title": item["title"],
+                    "client_name": item["client_name"],
+                    "provider_name": item["provider_name"],
+                    "value": str(item["value"]),
+                    "status": item["status"],
+                    "updated_at": item["updated_at"].isoformat(),
+                    "rank": item["rank"],
+                    "title_html": str(item["title_html"]),
+                    "snippet_html": str(item["snippet_html"]),
+                }
+                for item in results
+            ],
+            "pagina": page,
+            "next_pagina": page + 1 if has_next else None,
+        }
+    )
+
+
+@api_bp.get("/api/contratos/export.ndjson")
+@api_login_required
+@read_only
+def export_contracts():
+    user_id = g.api_user_id
+    use_replica = g.read_only
+    etag = _collection_etag(user_id, "ndjson")
+    if request.if_none_match.contains(etag):
+        return _conditional_json({}, etag)
+
+    statement = (
+        select(*API_COLUMNS)
+        .where(Contract.user_id == user_id)
+        .order_by(Contract.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    def generate():
+        # A sessão da requisição é fechada no teardown, antes do fim do stream
+        db = SessionLocal.session_factory(info={"read_only": use_replica})
+        try:
+            # yield_per usa cursor no servidor: memória constante para qualquer volume
+            for row in db.execute(statement):
+                yield json.dumps(contract_to_dict(row), ensure_ascii=False) + "\n"
+        finally:
+            db.close()
+
+    response = Response(generate(), mimetype="application/x-ndjson")
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@api_bp.get("/api/contratos/<int:contract_id>")
+@api_login_required
+@read_only
+def get_contract(contract_id: int):
+    contract = _get_owned_contract(contract_id)
+    return _conditional_json(
+        contract_to_dict(contract), _contract_etag(contract)
+    )
+
+
+@api_bp.post("/api/contratos")
+@api_login_required
+def create_contract():
+    values, errors = contract_service.validate_contract_data(_json_body())
+    if errors:
+        return _validation_error(errors)
+    contract = contract_service.create_contract(g.db, g.api_user_id, values)
+    response = jsonify(contract_to_dict(contract))
+    response.status_code = 201
+    response.headers["Location"] = url_for("api.get_contract", contract_id=contract.id)
+    response.set_etag(_contract_etag(contract))
+    return response
+
+
+@api_bp.route("/api/contratos/<int:contract_id>", methods=["PUT", "PATCH"])
+@api_login_required
+def update_contract(contract_id: int):
+    contract = _get_owned_contract(contract_id)
+    # If-Match com o ETag lido (ou "version" no corpo) evita sobrescrever
+    # alterações feitas por outro cliente
+    if request.if_match and not request.if_match.contains(_contract_etag(contract)):
+        return _conflict(contract, 412)
+    data = _json_body()
+    values, errors = contract_service.validate_contract_data(
+        data, partial=request.method == "PATCH"
+    )
+    if errors:
+        return _validation_error(errors)
+    expected_version = data.get("version")
+    if not isinstance(expected_version, int):
+        expected_version = None
+    try:
+        contract_service.update_contract(g.db, contract, values, expected_version)
+    except contract_service.VersionConflict:
+        return _conflict(_get_owned_contract(contract_id))
+    response = jsonify(contract_to_dict(contract))
+    response.set_etag(_contract_etag(contract))
+    return response
+
+
+@api_bp.delete("/api/contratos/<int:contract_id>")
+@api_login_required
+def delete_contract(contract_id: int):
+    contract_service.delete_contract(g.db, _get_owned_contract(contract_id))
+    return "", 204
+
+
+@api_bp.post("/api/contratos/excluir")
+@api_login_required
+def bulk_delete_contracts():
+    ids, errors = _bulk_ids(_json_body())
+    if errors:
+        return _validation_error(errors)
+    return jsonify({"deleted": contract_service.bulk_delete(g.db, g.api_user_id, ids)})
+
+
+@api_bp.post("/api/contratos/status")
+@api_login_required
+def bulk_status_contracts():
+    data = _json_body()
+    ids, errors = _bulk_ids(data)
+    status = str(data.get("status") or "").strip()
+    if not status:
+        errors.append("Status é obrigatório.")
+    if errors:
+        return _validation_error(errors)
+    changed = contract_service.bulk_set_status(g.db, g.api_user_id, ids, status)
+    return jsonify({"updated": changed})
+
+
+@api_bp.delete("/api/conta")
+@api_login_required
+def delete_account():
+    # O cookie de sessão sozinho não basta: exige a senha atual, como /conta/excluir
+    password = _json_body().get("password")
+    if not isinstance(password, str) or not password:
+        return _validation_error(['Informe "password" com a senha atual.'])
+    user = g.db.get(User, g.api_user_id)
+    wait = rate_limit.take(request.remote_addr, user.email if user else None)
+    if wait:
+        return _retry_later("Muitas tentativas. Tente novamente em instantes.", 429, wait)
+    if user is None or not user.check_password(password):
+        response = jsonify({"error": "Senha incorreta."})
+        response.status_code = 403
+        return response
+    account_service.delete_account(g.db, user.id)
+    session.clear()
+    return "", 204
+
+
+@api_bp.get("/api/contratos/<int:contract_id>/historico")
+@api_login_required
+@read_only
+def contract_history(contract_id: int):
+    """Histórico em ordem cronológica; ``cursor`` é o id do último evento lido.
+
+    Continua disponível depois que o contrato é excluído.
+    """
+    after = max(request.args.get("cursor", 0, type=int), 0)
+    limit = min(max(request.args.get("limite", HISTORY_PAGE_SIZE, type=int), 1), 1000)
+    rows = (
+        g.db.query(
+            ContractEvent.id,
+            ContractEvent.kind,
+            ContractEvent.changes,
+            ContractEvent.created_at,
+        )
+        .filter(
+            ContractEvent.contract_id == contract_id,
+            ContractEvent.user_id == g.api_user_id,
+            ContractEvent.id > after,
+        )
+        .order_by(ContractEvent.id)
+        .limit(limit + 1)
+        .all()
+    )
+    if not rows and not after:
+        # Sem eventos: 404 só se o contrato também não existir para o usuário
+        _get_owned_contract(contract_id)
+
+    page = rows[:limit]
+    return jsonify(
+        {
+            "data": [
+                {
+                    "id": row.id,
+                    "kind": row.kind,
+                    "changes": json.loads(row.changes),
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row in page
+            ],
+            "next_cursor": page[-1].id if len(rows) > limit else None,
+        }
+    )
+
+
+@api_bp.get("/api/vencimentos.<any(ics, json):formato>")
+@feed_login_required
+@read_only
+def due_feed(formato: str):
+    """Vencimentos da janela do feed; JSON inclui os últimos lembretes gerados."""
+    rows = due_dates.feed_contracts(g.db, g.api_user_id)
+
+    def contract_url(contract_id: int) -> str:
+        return url_for("contracts.edit_contract", contract_id=contract_id, _external=True)
+
+    if formato == "ics":
+        return Response(
+            due_dates.to_ical(rows, contract_url), mimetype="text/calendar"
+        )
+    today = date.today()
+    reminders = due_dates.recent_reminders(
+        g.db, g.api_user_id, min(max(request.args.get("lembretes", 100, type=int), 0), 1000)
+    )
+    return jsonify(
+        {
+            "data": [
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "client_name": row.client_name,
+                    "value": str(row.value),
+                    "status": row.status,
+                    "due_date": row.due_date.isoformat(),
+                    "overdue": row.due_date < today,
+                    "url": contract_url(row.id),
+                }
+                for row in rows
+            ],
+            "reminders": [
+                {
+                    "id": row.id,
+                    "contract_id": row.contract_id,
+                    "kind": row.kind,
+                    "due_date": row.due_date.isoformat(),
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row in reminders
+            ],
+        }
+    )
+
+
+@api_bp.post("/api/contratos/import")
+@api_login_required
+def import_contracts():
+    upload = request.files.get("arquivo")
+    if upload:
+        stream = upload.stream
+        fmt = contract_import.detect_format(upload.filename, upload.mimetype)
+    else:
+        stream = request.stream
+        fmt = contract_import.detect_format(None, request.mimetype)
+    fmt = request.args.get("formato") or fmt
+    if fmt not in contract_import.FORMATS:
+        response = jsonify({"error": "Formato não reconhecido. Use CSV ou NDJSON."})
+        response.status_code = 415
+        return response
+
+    report = contract_import.import_contracts(
+        g.db, g.api_user_id, contract_import.iter_records(stream, fmt)
+    )
+    return jsonify(report)
@@ -0,0 +1,76 @@
+"""Configuração comum: banco SQLite isolado num diretório temporário.
+
+As variáveis de ambiente precisam estar definidas antes do primeiro
+``import app``, porque ``app.settings`` as lê na importação.
+"""
+
+import itertools
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ["INSTANCE_DIR"] = tempfile.mkdtemp(prefix="tests-")
+os.environ.pop("DATABASE_URL", None)
+os.environ.pop("DATABASE_REPLICA_URL", None)
+os.environ.setdefault("LOGIN_RATE_LIMIT", "0")
+os.environ.setdefault("PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+os.environ.setdefault("JINJA_BYTECODE_CACHE", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+from app import create_app  # noqa: E402
+
+_emails = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def app():
+    application = create_app()
+    application.config["TESTING"] = True
+    return application
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def register(app):
+    """Cadastra um usuário novo (já logado no client) e devolve ``(email, senha)``."""
+
+    def _register(client, password: str = "senha123"):
+        email = f"usuario{next(_emails)}@exemplo.com.br"
+        response = client.post(
+            "/register", data={"name": "Teste", "email": email, "password": password}
+        )
+        assert response.status_code == 302
+        return email, password
+
+    return _register
+
+
+CONTRACT = {
+    "title": "Desenvolvimento de site",
+    "provider_name": "Estúdio Alfa",
+    "client_name": "Padaria Beta",
+    "service_description": "Criação e publicação do site institucional.",
+    "value": "1500.00",
+    "payment_terms": "50% na assinatura e 50% na entrega",
+    "city": "Curitiba",
+    "status": "rascunho",
+}
+
+
+@pytest.fixture
+def new_contract():
+    """Cria um contrato pela API com a sessão do client e devolve o JSON."""
+
+    def _new_contract(client, **fields):
+        response = client.post("/api/contratos", json={**CONTRACT, **fields})
+        assert response.status_code == 201
+        return response.get_json()
+
+    return _new_contract
@@ -0,0 +1,55 @@
+"""Exclusão de conta: sessões antigas caem e a API exige a senha atual."""
+
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models.user import User
+
+
+def _user_id(email: str) -> int:
+    db = SessionLocal()
+    try:
+        return db.execute(select(User.id).where(User.email == email)).scalar_one()
+    finally:
+        db.close()
+        SessionLocal.remove()
+
+
+def test_outra_sessao_cai_ao_excluir_a_conta(app, client, register):
+    email, password = register(client)
+    other = app.test_client()
+    other.post("/login", data={"email": email, "password": password})
+    assert other.get("/api/contratos").status_code == 200
+
+    response = client.post("/conta/excluir", data={"password": password})
+    assert response.status_code == 302
+
+    assert other.get("/api/contratos").status_code == 401
+    assert other.get("/contratos/").status_code == 302
+
+
+def test_sessao_antiga_nao_vale_para_conta_nova(app, client, register):
+    email, password = register(client)
+    old_id = _user_id(email)
+    cookie = client.get_cookie("session").value
+    assert client.post("/conta/excluir", data={"password": password}).status_code == 302
+
+    new_email, _ = register(app.test_client())
+    assert _user_id(new_email) > old_id
+
+    stolen = app.test_client()
+    stolen.set_cookie("session", cookie)
+    assert stolen.get("/api/contratos").status_code == 401
+
+
+def test_api_exige_senha_para_excluir_conta(client, register, new_contract):
+    email, password = register(client)
+    new_contract(client)
+
+    assert client.delete("/api/conta").status_code == 400
+    assert client.delete("/api/conta", json={}).status_code == 422
+    assert client.delete("/api/conta", json={"password": "errada"}).status_code == 403
+    assert client.get("/api/contratos").status_code == 200
+
+    assert client.delete("/api/conta", json={"password": password}).status_code == 204
+    assert client.get("/api/contratos").status_code == 401
@@ -0,0 +1,137 @@
+"""Entrada ASGI (``asgi.py``): requisições, streaming, desconexão e lifespan."""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("a2wsgi")
+
+from asgi import AsgiApp  # noqa: E402
+
+
+def _scope(method: str = "GET", path: str = "/", headers=()) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+def _call(asgi_app, scope: dict, incoming: list, on_send=None) -> list:
+    sent = []
+
+    async def run():
+        queue = asyncio.Queue()
+        for message in incoming:
+            queue.put_nowait(message)
+
+        async def receive():
+            return await queue.get()
+
+        async def send(message):
+            sent.append(message)
+            if on_send:
+                on_send(message, queue)
+
+        await asyncio.wait_for(asgi_app(scope, receive, send), timeout=10)
+
+    asyncio.run(run())
+    return sent
+
+
+def _body(sent: list) -> bytes:
+    return b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+
+
+def test_get_e_post_com_corpo_em_partes(app):
+    asgi_app = AsgiApp(app, 4)
+    sent = _call(asgi_app, _scope(path="/login"), [{"type": "http.request", "body": b""}])
+    assert sent[0]["type"] == "http.response.start"
+    assert sent[0]["status"] == 200
+    assert b"<form" in _body(sent)
+
+    form = b"name=Teste&email=asgi%40exemplo.com.br&password=senha123"
+    sent = _call(
+        asgi_app,
+        _scope(
+            "POST",
+            "/register",
+            headers=[
+                ("content-type", "application/x-www-form-urlencoded"),
+                ("content-length", str(len(form))),
+            ],
+        ),
+        [
+            {"type": "http.request", "body": form[:10], "more_body": True},
+            {"type": "http.request", "body": form[10:]},
+        ],
+    )
+    assert sent[0]["status"] == 302
+    assert any(name == b"set-cookie" for name, _ in sent[0]["headers"])
+
+
+def test_write_de_start_response():
+    def wsgi_app(environ, start_response):
+        write = start_response("200 OK", [("Content-Type", "text/plain")])
+        write(b"ab")
+        return [b"c"]
+
+    sent = _call(AsgiApp(wsgi_app, 2), _scope(), [{"type": "http.request", "body": b""}])
+    assert sent[0]["status"] == 200
+    assert _body(sent) == b"abc"
+
+
+def test_desconexao_interrompe_o_streaming():
+    state = {"produced": 0, "closed": False}
+
+    def chunks():
+        try:
+            for _ in range(10_000):
+                state["produced"] += 1
+                time.sleep(0.001)
+                yield b"x" * 100
+        finally:
+            state["closed"] = True
+
+    def wsgi_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "application/octet-stream")])
+        return chunks()
+
+    def on_send(message, queue):
+        if message["type"] == "http.response.body" and message.get("body"):
+            queue.put_nowait({"type": "http.disconnect"})
+
+    _call(
+        AsgiApp(wsgi_app, 2),
+        _scope(),
+        [{"type": "http.request", "body": b""}],
+        on_send=on_send,
+    )
+    assert state["closed"]
+    assert state["produced"] < 100
+
+
+def test_lifespan():
+    asgi_app = AsgiApp(lambda environ, start_response: [], 2)
+    sent = _call(
+        asgi_app,
+        {"type": "lifespan", "asgi": {"version": "3.0"}},
+        [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}],
+    )
+    assert [m["type"] for m in sent] == [
+        "lifespan.startup.complete",
+        "lifespan.shutdown.complete",
+    ]
+    # Pool de threads do worker encerrado no shutdown
+    with pytest.raises(RuntimeError):
+        asgi_app._wsgi.executor.submit(print)
@@ -0,0 +1,78 @@
+"""Concorrência otimista: duas sessões editando o mesmo contrato."""
+
+import re
+
+import pytest
+
+
+@pytest.fixture
+def two_sessions(app, client, register, new_contract):
+    """Duas sessões logadas na mesma conta e um contrato criado pela primeira."""
+    email, password = register(client)
+    other = app.test_client()
+    assert other.post("/login", data={"email": email, "password": password}).status_code == 302
+    return client, other, new_contract(client)
+
+
+def _form(contract: dict, **changes) -> dict:
+    fields = (
+        "title",
+        "provider_name",
+        "client_name",
+        "service_description",
+        "value",
+        "payment_terms",
+        "city",
+        "status",
+    )
+    return {name: contract[name] for name in fields} | {"due_date": ""} | changes
+
+
+def _form_version(client, contract_id: int) -> str:
+    html = client.get(f"/contratos/{contract_id}/editar").get_data(as_text=True)
+    return re.search(r'name="version" value="(\d+)"', html).group(1)
+
+
+def test_formulario_web_recusa_versao_antiga(two_sessions):
+    first, second, contract = two_sessions
+    url = f"/contratos/{contract['id']}/editar"
+    first_version = _form_version(first, contract["id"])
+    second_version = _form_version(second, contract["id"])
+
+    saved = first.post(url, data=_form(contract, title="Primeira", version=first_version))
+    assert saved.status_code == 302
+
+    stale = second.post(url, data=_form(contract, title="Segunda", version=second_version))
+    assert stale.status_code == 409
+    # O formulário volta com a versão atual, sem sobrescrever a primeira edição
+    assert "Primeira" in stale.get_data(as_text=True)
+    assert second.get(f"/api/contratos/{contract['id']}").get_json()["title"] == "Primeira"
+
+
+def test_api_if_match_antigo_recebe_412(two_sessions):
+    first, second, contract = two_sessions
+    url = f"/api/contratos/{contract['id']}"
+    etag = first.get(url).headers["ETag"]
+    stale_etag = second.get(url).headers["ETag"]
+    assert etag == stale_etag
+
+    assert first.patch(url, json={"title": "Primeira"}, headers={"If-Match": etag}).status_code == 200
+
+    response = second.patch(url, json={"title": "Segunda"}, headers={"If-Match": stale_etag})
+    assert response.status_code == 412
+    assert response.get_json()["current"]["title"] == "Primeira"
+    assert response.headers["ETag"] != stale_etag
+
+
+def test_api_version_antiga_recebe_409(two_sessions):
+    first, second, contract = two_sessions
+    url = f"/api/contratos/{contract['id']}"
+    version = second.get(url).get_json()["version"]
+
+    assert first.patch(url, json={"title": "Primeira", "version": version}).status_code == 200
+
+    response = second.patch(url, json={"title": "Segunda", "version": version})
+    assert response.status_code == 409
+    current = response.get_json()["current"]
+    assert current["title"] == "Primeira"
+    assert current["version"] == version + 1
@@ -0,0 +1,120 @@
+"""Ids de contratos excluídos não são reaproveitados (migração 7)."""
+
+from datetime import datetime
+
+from sqlalchemy import insert, text
+
+from app.db import Base, make_engine
+from app.migrations import (
+    _contracts_autoincrement,
+    _contracts_fulltext,
+    _sqlite_autoincrement,
+)
+from app.models.contract import Contract
+from app.models.contract_event import ContractEvent
+from app.models.user import User
+
+
+def test_contrato_novo_nao_herda_historico_do_excluido(client, register, new_contract):
+    register(client)
+    new_contract(client, title="Primeiro")
+    deleted = new_contract(client, title="Excluído")
+    assert client.delete(f"/api/contratos/{deleted['id']}").status_code == 204
+
+    created = new_contract(client, title="Novo")
+    assert created["id"] > deleted["id"]
+    history = client.get(f"/api/contratos/{created['id']}/historico").get_json()["data"]
+    assert [event["kind"] for event in history] == ["created"]
+
+
+def _legacy_database(tmp_path, monkeypatch):
+    """Banco criado antes da migração 7; devolve ``(engine, linha de contrato)``."""
+    engine = make_engine(f"sqlite:///{tmp_path / 'legado.db'}")
+    # contracts sem AUTOINCREMENT
+    monkeypatch.setitem(Contract.__table__.dialect_options["sqlite"], "autoincrement", False)
+    Base.metadata.create_all(engine)
+    monkeypatch.undo()
+
+    now = datetime.utcnow()
+    row = {
+        "provider_name": "P",
+        "client_name": "C",
+        "service_description": "S",
+        "value": 10,
+        "payment_terms": "À vista",
+        "city": "Curitiba",
+        "status": "rascunho",
+        "user_id": 1,
+        "created_at": now,
+        "updated_at": now,
+    }
+    with engine.begin() as conn:
+        _contracts_fulltext(conn)
+        conn.execute(
+            insert(User.__table__),
+            {"name": "U", "email": "u@x.com", "password_hash": "x", "created_at": now},
+        )
+        conn.execute(insert(Contract.__table__), [row | {"title": "Um"}, row | {"title": "Dois"}])
+        # Contrato 3 já foi excluído, mas o histórico dele continua
+        conn.execute(
+            insert(ContractEvent.__table__),
+            {"contract_id": 3, "user_id": 1, "kind": "deleted", "changes": "{}", "created_at": now},
+        )
+    return engine, row
+
+
+def test_migracao_recria_tabela_legada(tmp_path, monkeypatch):
+    engine, row = _legacy_database(tmp_path, monkeypatch)
+
+    with engine.begin() as conn:
+        legacy = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'contracts'")
+        ).scalar()
+        assert "AUTOINCREMENT" not in legacy
+        _contracts_autoincrement(conn)
+
+    with engine.begin() as conn:
+        sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'contracts'")
+        ).scalar()
+        assert "AUTOINCREMENT" in sql
+        indexes = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'contracts'")
+        ).scalars()
+        assert {index.name for index in Contract.__table__.indexes} <= set(indexes)
+        assert conn.execute(text("PRAGMA foreign_key_check")).all() == []
+
+        new_id = conn.execute(
+            insert(Contract.__table__).returning(Contract.__table__.c.id), row | {"title": "Três"}
+        ).scalar()
+        assert new_id == 4
+        # Gatilhos da busca textual recriados
+        found = conn.execute(
+            text("SELECT rowid FROM contracts_fts WHERE contracts_fts MATCH 'Três'")
+        ).scalars()
+        assert list(found) == [4]
+        titles = conn.execute(text("SELECT title FROM contracts ORDER BY id")).scalars()
+        assert list(titles) == ["Um", "Dois", "Três"]
+    engine.dispose()
+
+
+def test_gatilhos_recriados_se_a_migracao_caiu_depois_da_reconstrucao(tmp_path, monkeypatch):
+    engine, row = _legacy_database(tmp_path, monkeypatch)
+    with engine.begin() as conn:
+        # A reconstrução faz o próprio COMMIT; o processo cai antes de registrar
+        # a versão, e a migração roda de novo sobre a tabela já refeita
+        _sqlite_autoincrement(conn, Contract.__table__, ())
+    with engine.begin() as conn:
+        triggers = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'contracts'")
+        ).scalars()
+        assert list(triggers) == []
+        _contracts_autoincrement(conn)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Contract.__table__), row | {"title": "Depois da queda"})
+        found = conn.execute(
+            text("SELECT count(*) FROM contracts_fts WHERE contracts_fts MATCH 'queda'")
+        ).scalar()
+        assert found == 1
+    engine.dispose()
@@ -0,0 +1,81 @@
+"""Importação de contratos: arquivos fora do UTF-8, CSV malformado e falhas no meio."""
+
+import io
+
+import pytest
+from sqlalchemy import func, select
+
+from app import contract_import
+from app.db import SessionLocal
+from app.models.contract import Contract
+from app.models.contract_stats import ContractStats
+from app.models.user import User
+
+HEADER = "title,provider_name,client_name,service_description,value,payment_terms,city\n"
+
+
+def _row(title: str) -> str:
+    return f"{title},Estúdio Alfa,Padaria Beta,Site,100.00,À vista,Curitiba\n"
+
+
+def _upload(client, data: bytes, filename: str = "contratos.csv"):
+    return client.post(
+        "/api/contratos/import",
+        data={"arquivo": (io.BytesIO(data), filename)},
+        content_type="multipart/form-data",
+    )
+
+
+def test_csv_latin1_vira_erro_de_linha(client, register):
+    register(client)
+    # Só a última linha veio em Latin-1 (ex.: colada de uma planilha do Excel)
+    data = (HEADER + _row("Primeiro")).encode("utf-8") + _row("Manutenção").encode("latin-1")
+
+    response = _upload(client, data)
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report["imported"] == 1
+    assert report["error_count"] == 1
+    assert report["errors"][0]["line"] == 3
+    assert "UTF-8" in report["errors"][0]["errors"][0]
+
+
+def test_csv_malformado_nao_interrompe(client, register):
+    register(client)
+    data = (HEADER + _row("Primeiro") + "x" * 200_000 + "\n" + _row("Terceiro")).encode()
+
+    report = _upload(client, data).get_json()
+    assert report["imported"] == 2
+    assert report["errors"] == [{"line": 3, "errors": [report["errors"][0]["errors"][0]]}]
+    assert report["errors"][0]["errors"][0].startswith("CSV inválido")
+
+
+def test_falha_no_meio_reconstroi_estatisticas(client, register, monkeypatch):
+    email, _ = register(client)
+    monkeypatch.setattr(contract_import, "IMPORT_BATCH_SIZE", 2)
+
+    def records():
+        yield from contract_import.iter_records(
+            io.BytesIO((HEADER + _row("A") + _row("B") + _row("C")).encode()), "csv"
+        )
+        raise OSError("conexão encerrada")
+
+    db = SessionLocal()
+    try:
+        user_id = db.execute(select(User.id).where(User.email == email)).scalar_one()
+        with pytest.raises(OSError):
+            contract_import.import_contracts(db, user_id, records())
+        # Só o primeiro lote (A, B) foi gravado; o contador reflete isso
+        imported = db.execute(
+            select(func.count(Contract.id)).where(Contract.user_id == user_id)
+        ).scalar()
+        counted = db.execute(
+            select(func.sum(ContractStats.contracts_count)).where(
+                ContractStats.user_id == user_id
+            )
+        ).scalar()
+    finally:
+        db.close()
+        SessionLocal.remove()
+    assert imported == 2
+    assert counted == 2
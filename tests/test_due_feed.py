@@ -0,0 +1,62 @@
+"""Link do feed de vencimentos: por conta, revogável."""
+
+import re
+from datetime import date, timedelta
+
+from itsdangerous import URLSafeSerializer
+from sqlalchemy import select
+
+from app.db import engine
+from app.models.user import User
+from app.settings import SECRET_KEY
+
+
+def _feed_url(client) -> str:
+    html = client.get("/dashboard").get_data(as_text=True)
+    url = re.search(r'href="(http://localhost/api/vencimentos\.ics\?token=[^"]+)"', html).group(1)
+    return url.replace("http://localhost", "")
+
+
+def test_link_funciona_sem_sessao(app, client, register, new_contract):
+    register(client)
+    due = (date.today() + timedelta(days=10)).isoformat()
+    new_contract(client, title="Com vencimento", due_date=due)
+    url = _feed_url(client)
+
+    calendar = app.test_client().get(url)
+    assert calendar.status_code == 200
+    assert calendar.mimetype == "text/calendar"
+    assert "SUMMARY:Vencimento: Com vencimento" in calendar.get_data(as_text=True)
+
+
+def test_novo_link_revoga_o_anterior(app, client, register):
+    register(client)
+    old_url = _feed_url(client)
+
+    response = client.post("/dashboard/calendario/renovar")
+    assert response.status_code == 302
+    new_url = _feed_url(client)
+    assert new_url != old_url
+
+    anonymous = app.test_client()
+    assert anonymous.get(old_url).status_code == 401
+    assert anonymous.get(new_url).status_code == 200
+
+
+def test_link_de_conta_excluida_nao_vale(app, client, register):
+    _, password = register(client)
+    url = _feed_url(client)
+    assert client.post("/conta/excluir", data={"password": password}).status_code == 302
+
+    # Uma conta nova não herda o link
+    register(app.test_client())
+    assert app.test_client().get(url).status_code == 401
+
+
+def test_token_antigo_so_com_id_nao_vale(app, client, register):
+    email, _ = register(client)
+    with engine.connect() as conn:
+        user_id = conn.execute(select(User.id).where(User.email == email)).scalar_one()
+    # Formato anterior: só o id assinado, sem o segredo da conta
+    token = URLSafeSerializer(SECRET_KEY, salt="due-feed").dumps(user_id)
+    assert app.test_client().get(f"/api/vencimentos.json?token={token}").status_code == 401
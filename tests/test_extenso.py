@@ -0,0 +1,156 @@
+"""``app.extenso`` contra a implementação anterior (antiga ``app/pdf.py``).
+
+A referência abaixo é a versão de antes da extração, copiada sem mudanças,
+exceto pelos nomes das tabelas, que vêm de ``app.extenso``. Ela trata
+valores até 999.999.999.999,99.
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from app.extenso import (
+    HUNDREDS,
+    SCALES,
+    TEENS,
+    TENS,
+    UNITS,
+    numero_por_extenso,
+    valor_por_extenso,
+    valores_por_extenso,
+)
+
+
+def _tres_digitos_por_extenso(n: int) -> str:
+    if n == 0:
+        return ""
+    if n == 100:
+        return "cem"
+
+    centenas = n // 100
+    dezenas_unidades = n % 100
+    partes = []
+
+    if centenas:
+        partes.append(HUNDREDS[centenas])
+
+    if dezenas_unidades:
+        if dezenas_unidades < 10:
+            partes.append(UNITS[dezenas_unidades])
+        elif dezenas_unidades < 20:
+            partes.append(TEENS[dezenas_unidades])
+        else:
+            dezenas = (dezenas_unidades // 10) * 10
+            unidades = dezenas_unidades % 10
+            if dezenas:
+                partes.append(TENS[dezenas])
+            if unidades:
+                partes.append(UNITS[unidades])
+
+    return " e ".join(partes)
+
+
+def _numero_por_extenso(n: int) -> str:
+    if n == 0:
+        return "zero"
+
+    grupos = []
+    while n > 0:
+        grupos.append(n % 1000)
+        n //= 1000
+
+    partes = []
+    for idx, grupo in enumerate(grupos):
+        if grupo == 0:
+            continue
+        grupo_texto = _tres_digitos_por_extenso(grupo)
+        if idx == 0:
+            partes.append(grupo_texto)
+            continue
+
+        escala = SCALES[idx - 1]
+        singular, plural = escala[1], escala[2]
+
+        if idx == 1 and grupo == 1:
+            partes.append("mil")
+        else:
+            sufixo = singular if grupo == 1 else plural
+            partes.append(f"{grupo_texto} {sufixo}")
+
+    partes = partes[::-1]
+    texto = ""
+    for i, parte in enumerate(partes):
+        if i > 0:
+            sep = " e " if i == len(partes) - 1 else ", "
+            texto += sep
+        texto += parte
+    return texto
+
+
+def _valor_por_extenso(valor: Decimal | None) -> str:
+    quantized = (valor or Decimal("0")).quantize(Decimal("0.01"))
+    inteiro = int(quantized)
+    centavos = int((quantized * 100) % 100)
+
+    inteiro_ext = _numero_por_extenso(inteiro)
+    moeda = "real" if inteiro == 1 else "reais"
+
+    if centavos:
+        centavos_ext = _numero_por_extenso(centavos)
+        centavo_label = "centavo" if centavos == 1 else "centavos"
+        return f"{inteiro_ext} {moeda} e {centavos_ext} {centavo_label}"
+
+    return f"{inteiro_ext} {moeda}"
+
+
+MAXIMO = 10**12 - 1
+
+
+def _fronteiras() -> list[int]:
+    """Potências de 1000 e vizinhos; 1, 2, 100 e 101 de cada ordem de grandeza."""
+    valores = set()
+    for grupos in range(4):
+        potencia = 1000**grupos
+        valores.update({potencia - 1, potencia, potencia + 1})
+    for ordem in range(12):
+        base = 10**ordem
+        valores.update(base * fator for fator in (1, 2, 100, 101))
+    valores.update({0, MAXIMO})
+    return sorted(valor for valor in valores if 0 <= valor <= MAXIMO)
+
+
+@pytest.mark.parametrize("inteiro", _fronteiras())
+def test_fronteiras_inteiras(inteiro):
+    assert numero_por_extenso(inteiro) == _numero_por_extenso(inteiro)
+    assert valor_por_extenso(Decimal(inteiro)) == _valor_por_extenso(Decimal(inteiro))
+
+
+@pytest.mark.parametrize("centavos", range(100))
+def test_todos_os_centavos(centavos):
+    for inteiro in (0, 1, 2, 100, 1000, 1_000_000, MAXIMO):
+        valor = Decimal(inteiro) + Decimal(centavos) / 100
+        assert valor_por_extenso(valor) == _valor_por_extenso(valor)
+
+
+def test_amostra_densa():
+    for inteiro in range(0, 20_000):
+        assert numero_por_extenso(inteiro) == _numero_por_extenso(inteiro)
+    rng = random.Random(8)
+    for _ in range(20_000):
+        valor = Decimal(rng.randrange(0, (MAXIMO + 1) * 100)) / 100
+        assert valor_por_extenso(valor) == _valor_por_extenso(valor)
+
+
+def test_arredondamento_e_vazio():
+    for valor in (None, Decimal("0"), Decimal("0.004"), Decimal("0.005"), Decimal("1.999")):
+        assert valor_por_extenso(valor) == _valor_por_extenso(valor)
+
+
+def test_lote_igual_ao_avulso():
+    valores = [Decimal("1500.00"), None, Decimal("1500.00"), Decimal("0.01"), Decimal("2.5")]
+    assert valores_por_extenso(valores) == [valor_por_extenso(valor) for valor in valores]
+
+
+def test_negativos():
+    assert valor_por_extenso(Decimal("-1.50")) == "menos um real e cinquenta centavos"
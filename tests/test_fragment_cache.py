@@ -0,0 +1,41 @@
+"""Limites do backend ``file`` do cache de fragmentos."""
+
+import os
+
+from app.fragment_cache import FileBackend
+
+
+def _files(directory):
+    return sorted(directory.glob("*/*.html"))
+
+
+def test_limite_de_entradas(tmp_path):
+    cache = FileBackend(tmp_path, max_entries=10, max_bytes=10**9)
+    for contract_id in range(50):
+        cache.set(contract_id, "lista:v1", f"<tr>{contract_id}</tr>")
+    assert len(_files(tmp_path)) <= 10
+    # Diretórios de contratos que ficaram vazios também saem
+    assert len(list(tmp_path.iterdir())) == len(_files(tmp_path))
+
+
+def test_limite_de_bytes(tmp_path):
+    cache = FileBackend(tmp_path, max_entries=1000, max_bytes=3000)
+    for contract_id in range(200):
+        cache.set(contract_id, "lista:v1", "x" * 300)
+    # Entre duas varreduras a estimativa do processo também dispara a limpeza
+    assert sum(path.stat().st_size for path in _files(tmp_path)) <= 3000 + 300
+
+
+def test_menos_usados_saem_primeiro(tmp_path):
+    cache = FileBackend(tmp_path, max_entries=10, max_bytes=10**9)
+    for contract_id in range(10):
+        cache.set(contract_id, "lista:v1", "<tr></tr>")
+    for offset, path in enumerate(_files(tmp_path)):
+        os.utime(path, (1_000_000 + offset, 1_000_000 + offset))
+    # Lido agora: passa a ser o mais recente
+    assert cache.get(0, "lista:v1") == "<tr></tr>"
+
+    cache.set(10, "lista:v1", "<tr></tr>")
+    assert cache.get(0, "lista:v1") is not None
+    assert cache.get(10, "lista:v1") is not None
+    assert len(_files(tmp_path)) <= 10
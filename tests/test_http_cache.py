@@ -0,0 +1,100 @@
+"""Cache HTTP e compressão: ETag fraco, 304, gzip/brotli e Vary."""
+
+import gzip
+
+import pytest
+
+from app import http_cache
+
+
+class FakeBrotli:
+    @staticmethod
+    def compress(data: bytes, quality: int) -> bytes:
+        return b"br:" + data
+
+
+def test_etag_fraco_e_revalidacao(client):
+    response = client.get("/login")
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+    assert etag.startswith('W/"')
+    assert response.cache_control.private
+    assert response.cache_control.no_cache
+
+    cached = client.get("/login", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert cached.headers["ETag"] == etag
+    assert "Accept-Encoding" in cached.headers["Vary"]
+
+    changed = client.get("/login", headers={"If-None-Match": 'W/"outra-versao"'})
+    assert changed.status_code == 200
+    assert changed.data == response.data
+
+
+def test_mesmo_etag_para_qualquer_codificacao(client):
+    plain = client.get("/login")
+    compressed = client.get("/login", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["ETag"] == plain.headers["ETag"]
+    assert client.get(
+        "/login",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]},
+    ).status_code == 304
+
+
+def test_gzip(client, monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    plain = client.get("/login")
+    response = client.get("/login", headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data) == plain.data
+    assert int(response.headers["Content-Length"]) == len(response.data) < len(plain.data)
+
+
+def test_brotli_preferido_quando_instalado(client, monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", FakeBrotli)
+    plain = client.get("/login")
+
+    response = client.get("/login", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.data == b"br:" + plain.data
+
+    # Cliente que não aceita br continua recebendo gzip
+    response = client.get("/login", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+
+
+def test_brotli_de_verdade(client):
+    brotli = pytest.importorskip("brotli")
+    plain = client.get("/login")
+    response = client.get("/login", headers={"Accept-Encoding": "br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data) == plain.data
+
+
+def test_sem_accept_encoding_ou_corpo_pequeno_sai_sem_compressao(client, monkeypatch):
+    response = client.get("/login")
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+    monkeypatch.setattr(http_cache, "COMPRESS_MIN_BYTES", 10**6)
+    response = client.get("/login", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+def test_pdf_e_streaming_passam_intactos(client, register, new_contract):
+    register(client)
+    contract = new_contract(client)
+
+    pdf = client.get(f"/contratos/{contract['id']}/pdf", headers={"Accept-Encoding": "gzip"})
+    assert pdf.status_code == 200
+    assert "Content-Encoding" not in pdf.headers
+    assert not pdf.headers["ETag"].startswith("W/")
+
+    export = client.get("/api/contratos/export.ndjson", headers={"Accept-Encoding": "gzip"})
+    assert export.status_code == 200
+    assert "Content-Encoding" not in export.headers
+    assert export.get_data(as_text=True).count("\n") == 1
@@ -0,0 +1,93 @@
+"""Cache de identidade: expiração por TTL e invalidação pelos eventos de User."""
+
+import pytest
+
+from app import identity
+from app.db import SessionLocal
+from app.models.user import User
+
+
+class FakeClock:
+    now = 1000.0
+
+    @classmethod
+    def monotonic(cls) -> float:
+        return cls.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(identity, "time", FakeClock)
+    FakeClock.now = 1000.0
+    return FakeClock
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal.session_factory()
+    yield session
+    session.close()
+
+
+def _user(db, client, register) -> User:
+    email, _ = register(client)
+    return db.query(User).filter(User.email == email).one()
+
+
+def test_expira_depois_do_ttl(db, client, register, clock):
+    user = _user(db, client, register)
+    assert identity.get_identity(db, user.id).name == "Teste"
+
+    # Mudança fora do ORM (outro processo): nenhum evento chega aqui
+    db.query(User).filter(User.id == user.id).update(
+        {"name": "Renomeado"}, synchronize_session=False
+    )
+    db.commit()
+    clock.now += identity.USER_CACHE_TTL_SECONDS - 1
+    assert identity.get_identity(db, user.id).name == "Teste"
+
+    clock.now += 2
+    assert identity.get_identity(db, user.id).name == "Renomeado"
+
+
+def test_troca_de_senha_e_nonce_invalida_na_hora(db, client, register, clock):
+    user = _user(db, client, register)
+    assert client.get("/dashboard").status_code == 200
+    old_nonce = identity.get_identity(db, user.id).session_nonce
+
+    user.set_password("outra-senha")
+    user.session_nonce = "0" * 32
+    db.commit()
+
+    # Sem avançar o relógio: o after_update já tirou a identidade do cache
+    assert identity.get_identity(db, user.id).session_nonce == "0" * 32 != old_nonce
+    response = client.get("/dashboard")
+    assert response.status_code == 302
+    assert "/login" in response.headers["Location"]
+
+
+def test_exclusao_pelo_orm_invalida_na_hora(db, client, register, clock):
+    user = _user(db, client, register)
+    assert client.get("/dashboard").status_code == 200
+
+    db.delete(user)
+    db.commit()
+
+    assert identity.get_identity(db, user.id) is None
+    assert client.get("/dashboard").status_code == 302
+
+
+def test_leitura_entre_flush_e_commit_nao_fica_no_cache(db, client, register, clock):
+    user = _user(db, client, register)
+    user.name = "Novo nome"
+    db.flush()
+
+    # Outra requisição lê antes do commit e vê (e guardaria) o valor antigo
+    other = SessionLocal.session_factory()
+    try:
+        assert identity.get_identity(other, user.id).name == "Teste"
+    finally:
+        other.close()
+
+    db.commit()
+    assert identity.get_identity(db, user.id).name == "Novo nome"
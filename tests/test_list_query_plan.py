@@ -0,0 +1,79 @@
+"""A listagem de contratos lê a página só pelo índice ``ix_contracts_user_updated``."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event, insert, select
+
+from app.db import engine
+from app.models.contract import Contract
+from app.models.user import User
+
+
+def _seed(user_email: str, count: int) -> None:
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        user_id = conn.execute(select(User.id).where(User.email == user_email)).scalar_one()
+        conn.execute(
+            insert(Contract.__table__),
+            [
+                {
+                    "title": f"Contrato {n}",
+                    "provider_name": "Prestador",
+                    "client_name": f"Cliente {n}",
+                    "service_description": "Serviço",
+                    "value": Decimal("100.00"),
+                    "payment_terms": "30 dias",
+                    "city": "Curitiba",
+                    "status": "assinado",
+                    "user_id": user_id,
+                    "created_at": now,
+                    "updated_at": now - timedelta(minutes=n),
+                }
+                for n in range(60)
+            ],
+        )
+
+
+def _list_statements(client, url: str) -> list[tuple[str, tuple]]:
+    """Consultas da listagem executadas durante ``GET url``."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "ORDER BY contracts.updated_at DESC" in statement:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert client.get(url).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return captured
+
+
+def _plan(statement: str, parameters) -> str:
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_listagem_usa_indice_covering(client, register):
+    email, _ = register(client)
+    _seed(email, 60)
+
+    statements = _list_statements(client, "/contratos/")
+    assert statements
+    for statement, parameters in statements:
+        assert "USING COVERING INDEX ix_contracts_user_updated" in _plan(statement, parameters)
+
+
+def test_proxima_pagina_usa_indice_covering(client, register):
+    email, _ = register(client)
+    _seed(email, 60)
+
+    first = client.get("/contratos/")
+    cursor = first.get_data(as_text=True).split("cursor=", 1)[1].split('"', 1)[0]
+    statements = _list_statements(client, f"/contratos/?cursor={cursor}")
+    assert statements
+    for statement, parameters in statements:
+        assert "USING COVERING INDEX ix_contracts_user_updated" in _plan(statement, parameters)
@@ -0,0 +1,47 @@
+"""Hash de senhas: tudo no pool, inclusive o prefixo usado para refazer hashes."""
+
+import threading
+
+from sqlalchemy import text
+from werkzeug.security import generate_password_hash
+
+from app import passwords
+from app.db import engine
+
+
+def test_prefixo_calculado_no_pool(monkeypatch):
+    threads = []
+
+    def recording(password, method):
+        threads.append(threading.current_thread().name)
+        return generate_password_hash(password, method)
+
+    monkeypatch.setattr(passwords, "generate_password_hash", recording)
+    monkeypatch.setattr(passwords, "_prefix", None)
+
+    current = generate_password_hash("x", passwords.PASSWORD_HASH_METHOD)
+    assert passwords.needs_rehash(current) is False
+    assert passwords.needs_rehash("pbkdf2:sha1:1$salt$hash") is True
+    assert len(threads) == 1
+    assert threads[0].startswith("password-hash")
+
+
+def test_pool_cheio_adia_a_comparacao(monkeypatch):
+    monkeypatch.setattr(passwords, "_prefix", None)
+    monkeypatch.setattr(passwords, "_slots", threading.BoundedSemaphore(1))
+    passwords._slots.acquire()
+
+    assert passwords.needs_rehash("pbkdf2:sha1:1$salt$hash") is False
+    assert passwords._prefix is None
+
+
+def test_excluir_conta_ja_removida_nao_quebra(client, register):
+    email, password = register(client)
+    client.get("/conta/excluir")  # identidade em cache
+    # Removida por fora (outro servidor): o cache deste processo ainda a conhece
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE email = :email"), {"email": email})
+
+    response = client.post("/conta/excluir", data={"password": password})
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/login")
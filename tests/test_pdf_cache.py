@@ -0,0 +1,122 @@
+"""Cache de PDFs em disco: acerto, troca de LAYOUT_VERSION e remoção LRU."""
+
+import os
+
+import pytest
+
+from app import pdf_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "pdf_cache"
+    monkeypatch.setattr(pdf_cache, "PDF_CACHE_DIR", directory)
+    monkeypatch.setattr(pdf_cache, "_total_bytes", None)
+    return directory
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    from app.controllers import contracts
+
+    calls = []
+    original = contracts.render_one
+
+    def counting(fields):
+        calls.append(fields["id"])
+        return original(fields)
+
+    monkeypatch.setattr(contracts, "render_one", counting)
+    return calls
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    calls = []
+    original = pdf_cache._evict
+
+    def counting(directory):
+        calls.append(directory)
+        original(directory)
+
+    monkeypatch.setattr(pdf_cache, "_evict", counting)
+    return calls
+
+
+def _age(path, seconds: float) -> None:
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime - seconds))
+
+
+def test_segundo_download_sai_do_cache(client, register, new_contract, cache_dir, renders):
+    register(client)
+    contract = new_contract(client)
+    url = f"/contratos/{contract['id']}/pdf"
+
+    first = client.get(url)
+    second = client.get(url)
+    assert first.status_code == second.status_code == 200
+    assert second.data == first.data
+    assert renders == [contract["id"]]
+    assert len(list(cache_dir.glob("*/*.pdf"))) == 1
+
+
+def test_nova_layout_version_nao_reaproveita_o_pdf(client, register, new_contract, cache_dir, renders, monkeypatch):
+    register(client)
+    contract = new_contract(client)
+    url = f"/contratos/{contract['id']}/pdf"
+    old_etag = client.get(url).headers["ETag"]
+
+    monkeypatch.setattr(pdf_cache, "LAYOUT_VERSION", "teste")
+    response = client.get(url, headers={"If-None-Match": old_etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != old_etag
+    assert renders == [contract["id"], contract["id"]]
+    # A versão anterior do mesmo contrato sai do disco
+    assert len(list(cache_dir.glob("*/*.pdf"))) == 1
+
+
+def test_remove_os_menos_usados_ao_passar_do_limite(cache_dir, monkeypatch):
+    monkeypatch.setattr(pdf_cache, "PDF_CACHE_MAX_BYTES", 1000)
+    for contract_id in (1, 2, 3):
+        pdf_cache.put(contract_id, "d", b"x" * 300)
+    _age(pdf_cache._entry_path(1, "d"), 30)
+    _age(pdf_cache._entry_path(2, "d"), 20)
+    _age(pdf_cache._entry_path(3, "d"), 10)
+    # Uso recente protege o contrato 1
+    assert pdf_cache.get(1, "d") == b"x" * 300
+
+    pdf_cache.put(4, "d", b"x" * 300)
+
+    # 1200 > 1000: remove até 90% do limite, começando pelo 2 (o mais antigo)
+    assert pdf_cache.get(2, "d") is None
+    assert not (cache_dir / "2").exists()
+    assert all(pdf_cache.get(contract_id, "d") for contract_id in (1, 3, 4))
+
+
+def test_so_varre_o_diretorio_na_primeira_gravacao_ou_acima_do_limite(cache_dir, scans, monkeypatch):
+    monkeypatch.setattr(pdf_cache, "PDF_CACHE_MAX_BYTES", 1000)
+    for contract_id in range(1, 4):
+        pdf_cache.put(contract_id, "d", b"x" * 300)
+    assert len(scans) == 1
+
+    # Regravar e descartar atualizam a estimativa sem listar o diretório
+    pdf_cache.put(1, "novo", b"x" * 300)
+    pdf_cache.discard_many([2, 3])
+    pdf_cache.put(2, "d", b"x" * 300)
+    pdf_cache.put(3, "d", b"x" * 300)
+    assert len(scans) == 1
+
+    pdf_cache.put(4, "d", b"x" * 300)
+    assert len(scans) == 2
+    assert pdf_cache._total_bytes <= 900
+
+
+def test_primeira_varredura_apaga_arquivos_do_formato_antigo(cache_dir):
+    cache_dir.mkdir()
+    legacy = cache_dir / "1-abc.pdf"
+    legacy.write_bytes(b"%PDF antigo")
+
+    pdf_cache.put(2, "d", b"%PDF novo")
+    assert not legacy.exists()
+    assert pdf_cache.get(2, "d") == b"%PDF novo"
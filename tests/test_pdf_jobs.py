@@ -0,0 +1,125 @@
+"""Fila de PDFs (PDF_ASYNC): conclusão sem cache e espera entre tentativas."""
+
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from app import pdf_cache, pdf_jobs
+from app.db import SessionLocal
+from app.models.pdf_job import PdfJob
+
+
+@pytest.fixture
+def pdf_async(monkeypatch):
+    monkeypatch.setattr("app.controllers.contracts.PDF_ASYNC", True)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+    SessionLocal.remove()
+
+
+def test_job_concluido_sem_cache_renderiza_na_rota(client, register, new_contract, pdf_async):
+    register(client)
+    contract = new_contract(client)
+    url = f"/contratos/{contract['id']}/pdf"
+
+    response = client.get(url)
+    assert response.status_code == 302
+    assert "/pdf/tarefas/" in response.headers["Location"]
+    pdf_jobs.work(threading.Event(), drain=True)
+
+    # Arquivo fora do cache (LRU, limite de tamanho ou outro servidor)
+    pdf_cache.discard(contract["id"])
+    job_page = client.get(response.headers["Location"])
+    assert job_page.status_code == 302
+    pdf = client.get(job_page.headers["Location"])
+    assert pdf.status_code == 200
+    assert pdf.mimetype == "application/pdf"
+    assert pdf.data.startswith(b"%PDF")
+
+
+def test_falha_espera_antes_da_nova_tentativa(db, monkeypatch):
+    def failing_render(fields):
+        raise RuntimeError("falha de teste")
+
+    pdf_jobs.work(threading.Event(), drain=True)
+    monkeypatch.setattr(pdf_jobs, "render_contract_pdf", failing_render)
+    job = PdfJob(
+        contract_id=10**6,
+        user_id=10**6,
+        digest="x" * 64,
+        payload=json.dumps({"id": 10**6}),
+        status="queued",
+    )
+    db.add(job)
+    db.commit()
+
+    claimed = pdf_jobs.claim_next(db)
+    assert claimed.id == job.id
+    pdf_jobs.run_job(db, claimed)
+    assert claimed.status == "queued"
+    assert claimed.not_before > datetime.utcnow()
+    # Ainda na espera: não é pego de novo imediatamente
+    assert pdf_jobs.claim_next(db) is None
+
+    claimed.not_before = datetime.utcnow()
+    db.commit()
+    assert pdf_jobs.claim_next(db).id == job.id
+    db.delete(db.get(PdfJob, job.id))
+    db.commit()
+
+
+def test_manutencao_roda_periodicamente(db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(pdf_jobs, "requeue_stale", lambda session: calls.append("requeue"))
+    monkeypatch.setattr(pdf_jobs, "purge_finished", lambda session: calls.append("purge"))
+    monkeypatch.setattr(pdf_jobs, "_next_maintenance", 0.0)
+
+    assert pdf_jobs.maintain(db) is True
+    assert pdf_jobs.maintain(db) is False
+    assert calls == ["requeue", "purge"]
+
+    monkeypatch.setattr(pdf_jobs, "_next_maintenance", 0.0)
+    assert pdf_jobs.maintain(db) is True
+    assert calls == ["requeue", "purge"] * 2
+
+
+def test_job_que_derruba_o_worker_falha_no_limite_de_tentativas(db):
+    pdf_jobs.work(threading.Event(), drain=True)
+    job = PdfJob(
+        contract_id=10**6 + 1,
+        user_id=10**6,
+        digest="y" * 64,
+        payload=json.dumps({"id": 10**6 + 1}),
+        status="queued",
+    )
+    db.add(job)
+    db.commit()
+
+    statuses = []
+    for _ in range(pdf_jobs.PDF_JOB_MAX_ATTEMPTS + 1):
+        claimed = pdf_jobs.claim_next(db)
+        if claimed is None:
+            break
+        # O worker morre no meio da renderização: o job fica em running até
+        # passar de PDF_JOB_STALE_SECONDS
+        db.query(PdfJob).filter(PdfJob.id == job.id).update(
+            {"started_at": datetime(2000, 1, 1)}
+        )
+        db.commit()
+        pdf_jobs.requeue_stale(db)
+        db.query(PdfJob).filter(PdfJob.id == job.id).update({"not_before": None})
+        db.commit()
+        db.refresh(job)
+        statuses.append(job.status)
+
+    assert statuses == ["queued"] * (pdf_jobs.PDF_JOB_MAX_ATTEMPTS - 1) + ["failed"]
+    assert job.attempts == pdf_jobs.PDF_JOB_MAX_ATTEMPTS
+    assert job.error == pdf_jobs.INTERRUPTED
+    assert job.finished_at is not None
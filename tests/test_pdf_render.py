@@ -0,0 +1,16 @@
+"""PDF avulso com texto fora do latin-1 das fontes padrão do FPDF."""
+
+
+def test_pdf_sem_vencimento_e_com_pontuacao_tipografica(client, register, new_contract):
+    register(client)
+    contract = new_contract(
+        client,
+        title="Site “novo” — fase 1",
+        service_description="Layout… e ajustes ✓",
+    )
+    assert contract["due_date"] is None
+
+    response = client.get(f"/contratos/{contract['id']}/pdf")
+    assert response.status_code == 200
+    assert response.mimetype == "application/pdf"
+    assert response.data.startswith(b"%PDF")
@@ -0,0 +1,87 @@
+"""Instrumentação (``PROFILING=1``): consultas com erro, perfis simultâneos e /metrics."""
+
+import threading
+
+import pytest
+from flask import g
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, profiling
+
+LISTENERS = (
+    ("before_cursor_execute", profiling._before_cursor_execute),
+    ("after_cursor_execute", profiling._after_cursor_execute),
+    ("handle_error", profiling._handle_error),
+)
+
+
+@pytest.fixture
+def profiled_app(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING", True)
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiling, "PROFILE_SLOW_MS", 10**9)
+    monkeypatch.setattr(profiling, "METRICS_TOKEN", "segredo")
+    application = create_app()
+
+    @application.route("/_externa")
+    def externa():
+        # Outra requisição, em outra thread, enquanto esta está sob cProfile
+        inner = []
+        thread = threading.Thread(
+            target=lambda: inner.append(
+                application.test_client().get("/_interna").get_data(as_text=True)
+            )
+        )
+        thread.start()
+        thread.join()
+        return f"{'_profiler' in g} {inner[0]}"
+
+    @application.route("/_interna")
+    def interna():
+        return str("_profiler" in g)
+
+    yield application
+    for name, listener in LISTENERS:
+        if event.contains(Engine, name, listener):
+            event.remove(Engine, name, listener)
+
+
+def test_consulta_com_erro_nao_deixa_inicio_pendente():
+    engine = create_engine("sqlite://")
+    for name, listener in LISTENERS:
+        event.listen(engine, name, listener)
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql("SELECT * FROM tabela_inexistente")
+        assert conn.info["query_start"] == []
+        conn.exec_driver_sql("SELECT 1")
+        assert conn.info["query_start"] == []
+
+
+def test_perfis_simultaneos_usam_um_cprofile(profiled_app):
+    response = profiled_app.test_client().get("/_externa")
+    assert response.get_data(as_text=True) == "True False"
+    # O lock foi liberado ao fim da requisição
+    assert profiling._profiler_lock.acquire(blocking=False)
+    profiling._profiler_lock.release()
+
+
+def test_metrics_exige_token(profiled_app):
+    client = profiled_app.test_client()
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer errado"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer ção"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer segredo"})
+    assert response.status_code == 200
+    assert "http_request_duration_seconds" in response.get_data(as_text=True)
+
+
+def test_metrics_sem_token_nao_existe(profiled_app, monkeypatch):
+    monkeypatch.setattr(profiling, "METRICS_TOKEN", None)
+    application = create_app()
+    client = application.test_client()
+    assert client.get("/metrics").status_code == 404
+    # O resto da instrumentação continua ativo
+    assert "Server-Timing" in client.get("/login").headers
@@ -0,0 +1,122 @@
+"""Réplica de leitura com dois arquivos SQLite: roteamento e read-your-writes."""
+
+import os
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import func, select
+
+from app import db as database
+from app.db import engine, make_engine
+from app.models.contract_stats import ContractStats
+from app.models.user import User
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """Liga a réplica; ``replica.sync()`` copia o primário (réplica em dia)."""
+    path = tmp_path / "replica.db"
+
+    class Replica:
+        engine = make_engine(f"sqlite:///{path}")
+
+        @staticmethod
+        def sync():
+            Replica.engine.dispose()
+            source = sqlite3.connect(engine.url.database)
+            target = sqlite3.connect(path)
+            try:
+                source.backup(target)
+            finally:
+                source.close()
+                target.close()
+
+    monkeypatch.setattr(database, "replica_engine", Replica.engine)
+    monkeypatch.setattr(database, "REPLICA_STICKY_DIR", tmp_path / "primary_until")
+    yield Replica
+    Replica.engine.dispose()
+
+
+def _expire_sticky(tmp_path, email: str) -> None:
+    with engine.connect() as conn:
+        user_id = conn.execute(select(User.id).where(User.email == email)).scalar_one()
+    past = time.time() - 1
+    os.utime(tmp_path / "primary_until" / str(user_id), (past, past))
+
+
+def _titles(response) -> set[str]:
+    assert response.status_code == 200
+    return {item["title"] for item in response.get_json()["data"]}
+
+
+def test_basic_auth_le_o_que_acabou_de_gravar(app, client, register, new_contract, replica, tmp_path):
+    email, password = register(client)
+    new_contract(client, title="Antes da cópia")
+    replica.sync()
+
+    # Integração sem cookie: grava e lê logo em seguida só com HTTP Basic
+    api = app.test_client()
+    created = api.post(
+        "/api/contratos",
+        json={
+            "title": "Recém-criado",
+            "provider_name": "Estúdio Alfa",
+            "client_name": "Padaria Beta",
+            "service_description": "Site institucional.",
+            "value": "900.00",
+            "payment_terms": "À vista",
+            "city": "Curitiba",
+        },
+        auth=(email, password),
+    )
+    assert created.status_code == 201
+    assert "Recém-criado" in _titles(api.get("/api/contratos", auth=(email, password)))
+
+    # Fim da janela: a leitura vai para a réplica, que ainda não tem o contrato
+    _expire_sticky(tmp_path, email)
+    assert _titles(api.get("/api/contratos", auth=(email, password))) == {"Antes da cópia"}
+
+    replica.sync()
+    assert "Recém-criado" in _titles(api.get("/api/contratos", auth=(email, password)))
+
+
+def test_sessao_do_navegador_le_do_primario_depois_de_gravar(client, register, new_contract, replica, tmp_path):
+    email, _ = register(client)
+    replica.sync()
+
+    new_contract(client, title="Só no primário")
+    assert "Só no primário" in client.get("/contratos/").get_data(as_text=True)
+
+    _expire_sticky(tmp_path, email)
+    assert "Só no primário" not in client.get("/contratos/").get_data(as_text=True)
+
+
+def test_dashboard_na_replica_atrasada_nao_grava(client, register, new_contract, replica, tmp_path):
+    email, _ = register(client)
+    replica.sync()
+    new_contract(client, status="assinado")
+    _expire_sticky(tmp_path, email)
+
+    def stats_rows(target):
+        with target.connect() as conn:
+            return conn.execute(select(func.count()).select_from(ContractStats)).scalar()
+
+    primary_before = stats_rows(engine)
+    replica_before = stats_rows(replica.engine)
+    response = client.get("/dashboard")
+    assert response.status_code == 200
+    assert stats_rows(engine) == primary_before
+    assert stats_rows(replica.engine) == replica_before
+
+
+def test_pdf_le_do_primario(client, register, new_contract, replica, tmp_path):
+    email, _ = register(client)
+    replica.sync()
+    contract = new_contract(client)
+    _expire_sticky(tmp_path, email)
+
+    # O contrato ainda não chegou à réplica; a rota do PDF não é @read_only
+    response = client.get(f"/contratos/{contract['id']}/pdf")
+    assert response.status_code == 200
+    assert response.mimetype == "application/pdf"
@@ -0,0 +1,98 @@
+"""Busca de contratos: ranking bm25, destaque, escopo por usuário e fallback LIKE."""
+
+import pytest
+
+from app import search
+
+PUNCTUATION = ["!!!", "-", '"', "*", "()", "^", "?", "'", ":", "user_id:1", "NEAR", "% _"]
+
+
+def _search(client, q: str) -> list[dict]:
+    response = client.get("/api/contratos/busca", query_string={"q": q})
+    assert response.status_code == 200
+    return response.get_json()["data"]
+
+
+@pytest.fixture
+def like_fallback(monkeypatch):
+    """SQLite sem FTS5 (ou sem a tabela contracts_fts): busca com LIKE."""
+    monkeypatch.setattr(search, "_has_fts", lambda db: False)
+
+
+def test_resultados_ordenados_por_relevancia(client, register, new_contract):
+    register(client)
+    no_titulo = new_contract(client, title="Manutenção de jardim")
+    na_descricao = new_contract(
+        client,
+        title="Serviços gerais",
+        service_description="Inclui poda e limpeza do jardim uma vez por mês.",
+    )
+    new_contract(client, title="Pintura da fachada")
+
+    results = _search(client, "jardim")
+    assert [item["id"] for item in results] == [no_titulo["id"], na_descricao["id"]]
+    # bm25: menor é mais relevante
+    assert results[0]["rank"] < results[1]["rank"]
+
+    # Prefixo no último termo
+    assert [item["id"] for item in _search(client, "jard")][:1] == [no_titulo["id"]]
+
+
+def test_destaque_no_titulo_e_no_trecho_com_html_escapado(client, register, new_contract):
+    register(client)
+    new_contract(
+        client,
+        title="Jardim <b>vertical</b>",
+        service_description="Projeto de jardim vertical para a recepção.",
+    )
+
+    [item] = _search(client, "jardim")
+    assert item["title_html"] == "<mark>Jardim</mark> &lt;b&gt;vertical&lt;/b&gt;"
+    assert "<mark>jardim</mark>" in item["snippet_html"]
+
+
+def test_contratos_de_outro_usuario_nunca_aparecem(app, client, register, new_contract):
+    register(client)
+    new_contract(client, title="Orquídea exclusiva do dono")
+
+    outro = app.test_client()
+    register(outro)
+    new_contract(outro, title="Orquídea do vizinho")
+
+    titles = [item["title"] for item in _search(client, "orquídea")]
+    assert titles == ["Orquídea exclusiva do dono"]
+    # Nem forçando a coluna user_id na sintaxe do FTS5
+    assert _search(outro, "user_id:1 orquídea") == []
+    assert "Orquídea exclusiva" not in outro.get("/contratos/?q=orquídea").get_data(as_text=True)
+
+
+@pytest.mark.parametrize("q", PUNCTUATION)
+def test_consulta_so_com_pontuacao_nao_da_erro(client, register, new_contract, q):
+    register(client)
+    new_contract(client, title="Consultoria tributária")
+
+    assert _search(client, q) == []
+    assert client.get("/contratos/", query_string={"q": q}).status_code == 200
+
+
+def test_fallback_like(client, register, new_contract, app, like_fallback):
+    register(client)
+    new_contract(client, title="Auditoria contábil", client_name="Mercado Sol")
+    new_contract(client, title="Auditoria fiscal", client_name="Farmácia Lua")
+
+    assert [item["title"] for item in _search(client, "AUDITORIA sol")] == [
+        "Auditoria contábil"
+    ]
+    assert len(_search(client, "auditoria")) == 2
+
+    outro = app.test_client()
+    register(outro)
+    assert _search(outro, "auditoria") == []
+
+
+@pytest.mark.parametrize("q", PUNCTUATION)
+def test_fallback_like_trata_curingas_como_texto(client, register, new_contract, like_fallback, q):
+    register(client)
+    new_contract(client, title="Consultoria tributária")
+
+    assert _search(client, q) == []
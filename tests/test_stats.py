@@ -0,0 +1,109 @@
+"""Contadores do dashboard (``contract_stats``): upsert, leitura sem escrita e migração."""
+
+from decimal import Decimal
+
+from sqlalchemy import delete, event, select
+
+from app import stats
+from app.db import SessionLocal, engine
+from app.migrations import _contract_stats_backfill
+from app.models.contract_stats import ContractStats
+from app.models.user import User
+
+
+def _user_id(email: str) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(User.id).where(User.email == email)).scalar_one()
+
+
+def _stats_rows(user_id: int) -> dict:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(ContractStats.status, ContractStats.contracts_count).where(
+                ContractStats.user_id == user_id
+            )
+        ).all()
+    return dict(rows)
+
+
+def _drop_stats(user_id: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(delete(ContractStats).where(ContractStats.user_id == user_id))
+
+
+def test_bump_de_status_novo_duas_vezes_na_mesma_transacao(client, register, new_contract):
+    email, _ = register(client)
+    new_contract(client)
+    user_id = _user_id(email)
+
+    db = SessionLocal.session_factory()
+    try:
+        # Duas primeiras escritas do mesmo (usuário, status) antes do commit
+        stats._bump(db, user_id, "em_revisao", 1, Decimal("10.00"))
+        stats._bump(db, user_id, "em_revisao", 1, Decimal("5.00"))
+        db.commit()
+    finally:
+        db.close()
+
+    with engine.connect() as conn:
+        row = conn.execute(
+            select(ContractStats.contracts_count, ContractStats.value_total).where(
+                ContractStats.user_id == user_id, ContractStats.status == "em_revisao"
+            )
+        ).one()
+    assert row.contracts_count == 2
+    assert row.value_total == Decimal("15.00")
+
+
+def test_dashboard_sem_contadores_agrega_sem_gravar(client, register, new_contract):
+    email, _ = register(client)
+    new_contract(client, status="assinado")
+    new_contract(client, status="assinado")
+    new_contract(client, status="rascunho")
+    user_id = _user_id(email)
+    _drop_stats(user_id)
+
+    events = []
+
+    def record(conn, cursor, statement, *args):
+        events.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/dashboard")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert not [sql for sql in events if "contract_stats" in sql and "SELECT" not in sql]
+    assert _stats_rows(user_id) == {}
+    db = SessionLocal.session_factory()
+    try:
+        assert stats.dashboard_stats(db, user_id)["status_counts"] == {
+            "assinado": 2,
+            "rascunho": 1,
+        }
+    finally:
+        db.close()
+
+    # A próxima escrita reconstrói os contadores
+    new_contract(client, status="rascunho")
+    assert _stats_rows(user_id) == {"assinado": 2, "rascunho": 2}
+
+
+def test_migracao_preenche_contadores_ausentes(client, register, new_contract):
+    email, _ = register(client)
+    new_contract(client, status="assinado", value="100.00")
+    new_contract(client, status="assinado", value="50.50")
+    user_id = _user_id(email)
+    _drop_stats(user_id)
+
+    with engine.begin() as conn:
+        # Usuários que já têm contadores não são tocados (senão a chave primária repetiria)
+        _contract_stats_backfill(conn)
+        total = conn.execute(
+            select(ContractStats.value_total).where(ContractStats.user_id == user_id)
+        ).scalar_one()
+
+    assert _stats_rows(user_id) == {"assinado": 2}
+    assert Decimal(str(total)) == Decimal("150.50")